@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmark - times search, search_stack, search_all, audit_page and
+generate_design_system over a fixed query corpus and reports machine-readable JSON.
+
+Usage:
+    python benchmark.py                                # shipped data, every mode
+    python benchmark.py --scale 10 -o bench-10x.json   # synthetic data, 10x every CSV
+    python benchmark.py --mode warm --repeat 5         # one mode, more samples
+    python benchmark.py --synthesize /tmp/data-100x --scale 100   # only write scaled data
+    python benchmark.py --eval                         # plus golden-query quality and parity per mode
+    python benchmark.py --startup                      # only search.py import time and cold latency per subcommand
+    python benchmark.py --memory                       # only loaded-row memory per domain
+
+Reported:
+    cold_start   fresh interpreter answering one query, with and without prebuilt indexes
+    startup      `python -X importtime search.py ...` per subcommand vs STARTUP_BUDGET_MS, and its
+                 latency past a bare interpreter vs COLD_LATENCY_BUDGET_MS (both from the baseline)
+    index_build  snapshot compile + building every domain and stack index from the CSVs
+    modes        p50/p95/p99/mean/max latency (ms) per op, for each performance mode
+    row_memory   KB held by each domain's loaded rows, as csv.DictReader dicts vs core.ColumnRows
+    peak_rss_mb  peak resident set size of this process (and of the cold-start children)
+    quality      with --eval: recall@k / MRR / nDCG and ranking parity per mode (see evaluate.py)
+
+The benchmark always runs on a copy of the data (or the synthetic data), so the
+shipped data/.index is never touched.
+"""
+
+import argparse
+import contextlib
+import csv
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import core
+import design_system
+from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# ============ QUERY CORPUS ============
+DOMAIN_QUERIES = {
+    "style": ["glassmorphism dark", "minimal clean professional", "brutalism bold typography"],
+    "color": ["saas dashboard", "healthcare calm trust", "luxury fashion"],
+    "chart": ["trend over time", "real-time streaming data", "comparison categories"],
+    "landing": ["hero social proof", "pricing conversion", "product demo video"],
+    "product": ["fintech crypto", "beauty spa wellness", "e-commerce marketplace"],
+    "ux": ["touch target mobile", "loading feedback", "form validation errors"],
+    "typography": ["elegant luxury serif", "modern tech sans", "playful friendly"],
+    "icons": ["navigation arrows", "social media", "settings gear"],
+    "react": ["rerender memo", "bundle size dynamic import", "suspense waterfall"],
+    "web": ["focus outline", "autocomplete input type", "semantic html aria"],
+    "animation": ["hover transition", "skeleton loading", "page transition easing"],
+    "component": ["modal dialog", "toast notification", "data table pagination"],
+    "responsive": ["container query", "fluid typography clamp", "mobile-first breakpoints"],
+    "darkmode": ["dark theme toggle", "oled surface color", "prefers-color-scheme"],
+    "tokens": ["spacing scale", "shadow elevation", "border radius"],
+    "a11y": ["color contrast", "screen reader labels", "keyboard focus order"],
+    "page-standards": ["landing required sections", "checkout page structure", "blog post"],
+    "navigation": ["breadcrumb", "mega menu", "bottom nav mobile"],
+    "seo": ["title tag meta description", "open graph", "structured data schema"],
+    "layout": ["max-width container", "sticky footer", "section spacing grid"],
+    "auth": ["sign in oauth", "forgot password", "two factor verification"],
+    "empty-states": ["no results", "404 error page", "first run onboarding"],
+    "audit-rules": ["missing section", "navigation check", "seo violation"],
+}
+
+STACK_QUERIES = ["state management", "form validation", "image optimization", "accessibility", "performance list rendering"]
+
+AUDIT_PAGES = ["landing", "dashboard", "pricing", "checkout", "blog post", "sign in", "404", "settings"]
+
+DESIGN_QUERIES = ["SaaS dashboard", "fintech crypto", "beauty spa wellness service", "e-commerce luxury", "gaming"]
+
+FEDERATED_QUERIES = ["dark mode toggle", "button loading state", "accessible form errors"]
+
+
+def _workload():
+    """(op, callable) pairs covering every domain, stack, audit page and design query"""
+    work = []
+    for domain, queries in DOMAIN_QUERIES.items():
+        for query in queries:
+            work.append(("search", lambda q=query, d=domain: core.search(q, d, MAX_RESULTS)))
+    for stack in AVAILABLE_STACKS:
+        for query in STACK_QUERIES:
+            work.append(("search_stack", lambda q=query, s=stack: core.search_stack(q, s, MAX_RESULTS)))
+    for query in FEDERATED_QUERIES:
+        work.append(("search_all", lambda q=query: core.search_all(q, MAX_RESULTS)))
+    for page in AUDIT_PAGES:
+        work.append(("audit_page", lambda p=page: core.audit_page(p)))
+    for query in DESIGN_QUERIES:
+        work.append(("generate_design_system", lambda q=query: design_system.generate_design_system(q, "Bench")))
+    return work
+
+
+# ============ SYNTHETIC DATA ============
+def generate_synthetic_data(scale, out_dir, source_dir=None, seed=0):
+    """Write a copy of the data dir where every CSV has scale x as many rows.
+
+    Copy 0 of each row is the original; later copies swap about a quarter of
+    the words in each cell for words seen in the same column, so the vocabulary
+    and term statistics grow like real data instead of repeating verbatim.
+    """
+    source_dir = Path(source_dir or core.DATA_DIR)
+    out_dir = Path(out_dir)
+    rng = random.Random(seed)
+    written = {}
+    for csv_path in sorted(source_dir.rglob("*.csv")):
+        if core.INDEX_DIRNAME in csv_path.relative_to(source_dir).parts:
+            continue
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            rows = list(reader)
+        if header is None:
+            continue
+
+        width = max([len(header)] + [len(row) for row in rows])
+        vocab = [sorted({w for row in rows if i < len(row) for w in re.findall(r"\w+", row[i])}) for i in range(width)]
+
+        target = out_dir / csv_path.relative_to(source_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for copy in range(scale):
+                for row in rows:
+                    if copy == 0:
+                        writer.writerow(row)
+                        continue
+                    writer.writerow([_mutate(cell, vocab[i], rng) for i, cell in enumerate(row)])
+        written[target.relative_to(out_dir).as_posix()] = len(rows) * scale
+    return written
+
+
+def _mutate(cell, vocab, rng):
+    if not vocab:
+        return cell
+    return re.sub(r"\w+", lambda m: rng.choice(vocab) if rng.random() < 0.25 else m.group(0), cell)
+
+
+# ============ MODES ============
+@contextlib.contextmanager
+def _result_cache(size):
+    previous = core._RESULT_CACHE.maxsize
+    core._RESULT_CACHE.maxsize = size
+    core._RESULT_CACHE.clear()
+    try:
+        yield
+    finally:
+        core._RESULT_CACHE.maxsize = previous
+        core._RESULT_CACHE.clear()
+
+
+@contextlib.contextmanager
+def mode_warm():
+    """Indexes warm in memory, result cache off: the cost of scoring itself"""
+    core.build_indexes()
+    with _result_cache(0):
+        yield None
+
+
+@contextlib.contextmanager
+def mode_cached():
+    """Warm indexes with the result cache on (repeats are cache hits)"""
+    core.build_indexes()
+    with _result_cache(core.RESULT_CACHE_SIZE):
+        yield None
+
+
+@contextlib.contextmanager
+def mode_disk():
+    """Every call starts from an empty process cache: on-disk index + snapshot load each time"""
+    core.build_indexes()
+    with _result_cache(0):
+        yield core.clear_caches
+    core.clear_caches()
+
+
+@contextlib.contextmanager
+def mode_numpy():
+    """mode_warm with every index scored by the NumPy backend"""
+    previous = core.SCORING_BACKEND
+    core.SCORING_BACKEND = "numpy"
+    try:
+        with mode_warm():
+            yield None
+    finally:
+        core.SCORING_BACKEND = previous
+
+
+@contextlib.contextmanager
+def mode_exhaustive():
+    """mode_warm scoring every matching document: no top-k pruning, no NumPy"""
+    previous = core.PRUNE_MIN_DOCS, core.SCORING_BACKEND
+    core.PRUNE_MIN_DOCS, core.SCORING_BACKEND = 0, "python"
+    try:
+        with mode_warm():
+            yield None
+    finally:
+        core.PRUNE_MIN_DOCS, core.SCORING_BACKEND = previous
+
+
+# Each mode is a context manager that prepares the engine and yields an
+# optional hook to run before every timed call
+MODES = {
+    "warm": mode_warm,
+    "cached": mode_cached,
+    "disk": mode_disk,
+    "exhaustive": mode_exhaustive,
+}
+if core._numpy() is not None:
+    MODES["numpy"] = mode_numpy
+
+
+# ============ MEASUREMENT ============
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples_ms):
+    return {
+        "n": len(samples_ms),
+        "p50": round(percentile(samples_ms, 50), 4),
+        "p95": round(percentile(samples_ms, 95), 4),
+        "p99": round(percentile(samples_ms, 99), 4),
+        "mean": round(sum(samples_ms) / len(samples_ms), 4),
+        "max": round(max(samples_ms), 4)
+    }
+
+
+def time_mode(mode, repeat=3, work=None):
+    """Run the workload repeat times under a mode; returns op -> latency summary (ms)"""
+    work = work if work is not None else _workload()
+    samples = {}
+    with MODES[mode]() as before_each:
+        for _ in range(repeat):
+            for op, call in work:
+                if before_each is not None:
+                    before_each()
+                start = time.perf_counter()
+                call()
+                samples.setdefault(op, []).append((time.perf_counter() - start) * 1000)
+    return {op: summarize(values) for op, values in samples.items()}
+
+
+def time_index_build():
+    """Compile the snapshot, then build every index from scratch (ms)"""
+    shutil.rmtree(core.DATA_DIR / core.INDEX_DIRNAME, ignore_errors=True)
+    core.clear_caches()
+    start = time.perf_counter()
+    core.compile_snapshot()
+    snapshot_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    built = core.build_indexes()
+    index_ms = (time.perf_counter() - start) * 1000
+    return {"snapshot_ms": round(snapshot_ms, 3), "indexes_ms": round(index_ms, 3), "files": len(built)}
+
+
+_COLD_START = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {scripts!r})
+import core
+from pathlib import Path
+core.DATA_DIR = Path({data!r})
+imported = time.perf_counter()
+core.search({query!r}, {domain!r})
+done = time.perf_counter()
+print((imported - start) * 1000, (done - imported) * 1000)
+"""
+
+
+def time_cold_start(query="glassmorphism dark", domain="style"):
+    """Fresh interpreter + import + first query, before and after the indexes exist"""
+    code = _COLD_START.format(scripts=str(SCRIPTS_DIR), data=str(core.DATA_DIR), query=query, domain=domain)
+    results = {}
+    for label in ("no_index", "prebuilt_index"):
+        if label == "no_index":
+            shutil.rmtree(core.DATA_DIR / core.INDEX_DIRNAME, ignore_errors=True)
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+        results[label] = {
+            "process_ms": round((time.perf_counter() - start) * 1000, 3),
+            "import_ms": round(float(out[0]), 3),
+            "first_query_ms": round(float(out[1]), 3)
+        }
+    return results
+
+
+# search.py invocations timed by time_startup(), one per subcommand (all run with --no-daemon,
+# except forwarded: the search query sent to a daemon time_startup() starts for it)
+STARTUP_COMMANDS = {
+    "help": ["--help"],
+    "search": ["glassmorphism dark", "--domain", "style"],
+    "stack": ["rerender memo", "--stack", "react"],
+    "audit": ["--audit", "landing"],
+    "design-system": ["saas dashboard", "--design-system", "-p", "Bench"],
+    "persist": ["saas dashboard", "--design-system", "--persist", "-p", "Bench", "--page", "dashboard"],
+    "forwarded": ["glassmorphism dark", "--domain", "style"],
+}
+# search.py before the daemon, snapshot and stored indexes (ecf81dc), timed by time_startup() on
+# the reference machine (median of 3 rounds): import time, summed over -X importtime's top-level
+# imports, and each subcommand's process time past a bare `python -c pass` (forwarded: the
+# same query answered in-process, as there was no daemon to forward it to)
+BASELINE_IMPORT_MS = 55
+BASELINE_LATENCY_MS = {"help": 50, "search": 55, "stack": 45, "audit": 40, "design-system": 75, "persist": 95, "forwarded": 55}
+# How far past the baseline a subcommand may go before --startup fails. A one-off process now
+# reads a stored index instead of fitting one CSV and parses a larger CLI, so cold latency gets
+# more room (1.5-1.6x the baseline at the time); repeated queries belong to the daemon. A forwarded
+# query reads no index, so it keeps the import tolerance.
+STARTUP_TOLERANCE = 1.3
+COLD_LATENCY_TOLERANCE = 1.75
+STARTUP_BUDGET_MS = round(BASELINE_IMPORT_MS * STARTUP_TOLERANCE)
+COLD_LATENCY_BUDGET_MS = {command: round(ms * (STARTUP_TOLERANCE if command == "forwarded" else COLD_LATENCY_TOLERANCE))
+                          for command, ms in BASELINE_LATENCY_MS.items()}
+
+
+def parse_importtime(stderr):
+    """(module, self_us, cumulative_us, depth) for each line of `python -X importtime` output"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue
+        module = name[1:]
+        imports.append((module.strip(), int(self_us), int(cumulative_us), (len(module) - len(module.lstrip())) // 2))
+    return imports
+
+
+def _interpreter_ms(env, repeat):
+    """Median process time of a bare `python -c pass`: the floor every subcommand pays"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True, env=env)
+        runs.append((time.perf_counter() - start) * 1000)
+    return sorted(runs)[len(runs) // 2]
+
+
+@contextlib.contextmanager
+def _startup_daemon(scripts, socket_path, env, timeout=60):
+    """A `search.py --serve` daemon from scripts listening on socket_path inside the block"""
+    search_py = str(scripts / "search.py")
+    daemon = subprocess.Popen([sys.executable, search_py, "--serve", "--socket", str(socket_path)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    try:
+        deadline = time.monotonic() + timeout
+        while not socket_path.exists():
+            if daemon.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"Search daemon did not start on {socket_path}")
+            time.sleep(0.05)
+        yield socket_path
+    finally:
+        subprocess.run([sys.executable, search_py, "--stop", "--socket", str(socket_path)], capture_output=True, env=env)
+        try:
+            daemon.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            daemon.kill()
+            daemon.wait()
+
+
+def time_startup(root, commands=None, repeat=3, budget_ms=STARTUP_BUDGET_MS, latency_budget_ms=None):
+    """Run each search.py subcommand in a fresh `python -X importtime` process, and again
+    without it, from a copy of the scripts in root (next to root/data); reports the median
+    import time, process time and cold latency (process time past a bare interpreter), and
+    whether both stay within their budgets (latency_budget_ms overrides COLD_LATENCY_BUDGET_MS)"""
+    commands = commands or list(STARTUP_COMMANDS)
+    latency_budget_ms = {**COLD_LATENCY_BUDGET_MS, **(latency_budget_ms or {})}
+    scripts = Path(root) / "scripts"
+    if not scripts.exists():
+        shutil.copytree(SCRIPTS_DIR, scripts, ignore=shutil.ignore_patterns("tests", "__pycache__"))
+    # Time the installed experience: bytecode cached after the first run
+    env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    interpreter_ms = _interpreter_ms(env, repeat)
+    results = {}
+    with contextlib.ExitStack() as stack:
+        for command in commands:
+            args = [str(scripts / "search.py")] + STARTUP_COMMANDS[command]
+            if command == "forwarded":
+                # AF_UNIX paths are length-limited, so the socket stays out of a deep root
+                socket_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="uipro-bench-")))
+                args += ["--socket", str(stack.enter_context(_startup_daemon(scripts, socket_dir / "search.sock", env)))]
+            elif command != "help":
+                args.append("--no-daemon")
+            if command == "persist":
+                args += ["--output-dir", str(Path(root) / "persisted")]
+            runs = []
+            latencies = []
+            for _ in range(repeat + 1):
+                start = time.perf_counter()
+                stderr = subprocess.run([sys.executable, "-X", "importtime"] + args, capture_output=True, text=True, check=True, env=env).stderr
+                runs.append(((time.perf_counter() - start) * 1000, parse_importtime(stderr)))
+                start = time.perf_counter()
+                subprocess.run([sys.executable] + args, capture_output=True, check=True, env=env)
+                latencies.append((time.perf_counter() - start) * 1000)
+            # The first run compiles the bytecode (and builds the indexes); the median of the rest is reported
+            runs = sorted(runs[1:], key=lambda run: sum(c for _, _, c, depth in run[1] if depth == 0))
+            process_ms, imports = runs[len(runs) // 2]
+            import_ms = sum(cumulative for _, _, cumulative, depth in imports if depth == 0) / 1000
+            latency_ms = sorted(latencies[1:])[len(latencies[1:]) // 2] - interpreter_ms
+            heaviest = sorted((entry for entry in imports if entry[3] == 0), key=lambda entry: -entry[2])[:3]
+            results[command] = {
+                "import_ms": round(import_ms, 3),
+                "process_ms": round(process_ms, 3),
+                "latency_ms": round(latency_ms, 3),
+                "budget_ms": budget_ms,
+                "latency_budget_ms": latency_budget_ms[command],
+                "within_budget": import_ms <= budget_ms and latency_ms <= latency_budget_ms[command],
+                "heaviest": [[module, round(cumulative / 1000, 3)] for module, _, cumulative, _ in heaviest],
+                "modules": sorted({module for module, _, _, _ in imports})
+            }
+    return results
+
+
+def _retained_bytes(load):
+    """Bytes still allocated by load() once it returns (its result kept alive), via tracemalloc"""
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = load()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def measure_row_memory():
+    """Memory held by each domain's loaded rows: csv.DictReader dicts vs core.ColumnRows (KB)"""
+    report = {}
+    sources = [(domain, config["file"]) for domain, config in CSV_CONFIG.items()]
+    sources += [(f"stack:{stack}", config["file"]) for stack, config in core.STACK_CONFIG.items()]
+    for name, file in sources:
+        path = core.DATA_DIR / file
+        if not path.exists():
+            continue
+
+        def load_dicts():
+            with open(path, 'r', encoding='utf-8') as f:
+                return list(csv.DictReader(f))
+
+        def load_columns():
+            with open(path, 'r', encoding='utf-8') as f:
+                return core.ColumnRows.read(f)
+
+        dicts, columns = _retained_bytes(load_dicts), _retained_bytes(load_columns)
+        report[name] = {
+            "rows": len(load_columns()),
+            "dicts_kb": round(dicts / 1024, 1),
+            "columnar_kb": round(columns / 1024, 1),
+            "saved_pct": round(100 * (1 - columns / dicts), 1) if dicts else 0.0
+        }
+    return report
+
+
+def peak_rss_mb():
+    """Peak RSS of this process and of its finished children, in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2 ** 20, 2),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2 ** 20, 2)
+    }
+
+
+@contextlib.contextmanager
+def use_data_dir(path):
+    """Point core and design_system at another data directory"""
+    previous = core.DATA_DIR, design_system.DATA_DIR
+    core.DATA_DIR = design_system.DATA_DIR = Path(path)
+    core.clear_caches()
+    try:
+        yield
+    finally:
+        core.DATA_DIR, design_system.DATA_DIR = previous
+        core.clear_caches()
+
+
+def run_benchmark(scale=1, modes=None, repeat=3, cold_start=True, quality=False):
+    """Full benchmark on a scratch copy of the data (scaled when scale > 1); returns the report dict"""
+    modes = list(modes or MODES)
+    with tempfile.TemporaryDirectory(prefix="uipro-bench-") as scratch:
+        data_dir = Path(scratch) / "data"
+        if scale > 1:
+            generate_synthetic_data(scale, data_dir)
+        else:
+            shutil.copytree(core.DATA_DIR, data_dir, ignore=shutil.ignore_patterns(core.INDEX_DIRNAME))
+
+        with use_data_dir(data_dir):
+            report = {
+                "scale": scale,
+                "repeat": repeat,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "data_bytes": sum(p.stat().st_size for p in data_dir.rglob("*.csv")),
+                "queries": len(_workload())
+            }
+            if cold_start:
+                report["cold_start"] = time_cold_start()
+                report["startup"] = time_startup(scratch)
+            report["index_build"] = time_index_build()
+            report["modes"] = {mode: time_mode(mode, repeat) for mode in modes}
+            report["row_memory"] = measure_row_memory()
+            if quality:
+                from evaluate import evaluate_modes
+                report["quality"] = evaluate_modes(modes)
+            report["peak_rss_mb"] = peak_rss_mb()
+    return report
+
+
+def format_report(report):
+    """Human-readable summary of a run_benchmark() report"""
+    lines = [f"## UI Pro Max Benchmark (scale {report['scale']}x, {report['data_bytes']:,} bytes of CSV)"]
+    for label, cold in report.get("cold_start", {}).items():
+        lines.append(f"cold start ({label}): {cold['process_ms']:.1f} ms process, {cold['import_ms']:.1f} ms import, {cold['first_query_ms']:.1f} ms first query")
+    if report.get("startup"):
+        lines.append(format_startup(report["startup"]))
+    build = report["index_build"]
+    lines.append(f"index build: {build['snapshot_ms']:.1f} ms snapshot + {build['indexes_ms']:.1f} ms for {build['files']} indexes")
+    for mode, ops in report["modes"].items():
+        lines.append(f"\n### mode: {mode}")
+        lines.append(f"{'op':<24}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+        for op, stats in ops.items():
+            lines.append(f"{op:<24}{stats['n']:>6}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}")
+    for mode, result in report.get("quality", {}).get("modes", {}).items():
+        scores = ", ".join(f"{section} {values['mrr']:.3f}" for section, values in result["metrics"].items())
+        lines.append(f"quality ({mode}): parity {'OK' if result['parity'] else 'BROKEN'}; MRR {scores}")
+    if report.get("row_memory"):
+        lines.append("\n" + format_row_memory(report["row_memory"]))
+    if report.get("peak_rss_mb"):
+        lines.append(f"\npeak RSS: {report['peak_rss_mb']['self']} MB (cold-start children: {report['peak_rss_mb']['children']} MB)")
+    return "\n".join(lines)
+
+
+def format_startup(startup):
+    """Human-readable summary of a time_startup() report"""
+    lines = [f"{'search.py startup':<24}{'import':>9}{'latency':>10}{'budget':>9}  (ms, import budget {next(iter(startup.values()))['budget_ms']} ms)"]
+    for command, result in startup.items():
+        heaviest = ", ".join(f"{module} {ms:.1f}" for module, ms in result["heaviest"])
+        status = "" if result["within_budget"] else "  OVER BUDGET"
+        lines.append(f"{command:<24}{result['import_ms']:>9.1f}{result['latency_ms']:>10.1f}{result['latency_budget_ms']:>9}  {heaviest}{status}")
+    return "\n".join(lines)
+
+
+def format_row_memory(memory):
+    """Human-readable summary of a measure_row_memory() report"""
+    lines = [f"{'row memory':<24}{'rows':>7}{'dicts':>10}{'columnar':>10}{'saved':>8}  (KB)"]
+    for name, result in memory.items():
+        lines.append(f"{name:<24}{result['rows']:>7}{result['dicts_kb']:>10.1f}{result['columnar_kb']:>10.1f}{result['saved_pct']:>7.1f}%")
+    dicts = sum(result["dicts_kb"] for result in memory.values())
+    columns = sum(result["columnar_kb"] for result in memory.values())
+    if dicts:
+        lines.append(f"{'total':<24}{sum(result['rows'] for result in memory.values()):>7}{dicts:>10.1f}{columns:>10.1f}{100 * (1 - columns / dicts):>7.1f}%")
+    return "\n".join(lines)
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the UI Pro Max search engine")
+    parser.add_argument("--scale", type=int, default=1, help="Scale every CSV by this factor with synthetic rows (e.g. 10, 100)")
+    parser.add_argument("--mode", action="append", choices=list(MODES), help="Mode(s) to time (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the query corpus per mode")
+    parser.add_argument("--no-cold-start", action="store_true", help="Skip the fresh-process measurements")
+    parser.add_argument("--eval", action="store_true", help="Also score the golden queries and check ranking parity per mode")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report instead of the summary")
+    parser.add_argument("--output", "-o", type=str, default=None, help="Also write the JSON report to this file")
+    parser.add_argument("--synthesize", type=str, metavar="DIR", help="Only write the scaled synthetic data to DIR")
+    parser.add_argument("--startup", action="store_true", help=f"Only time search.py startup per subcommand; exit 1 if one exceeds {STARTUP_BUDGET_MS} ms of imports or its cold latency budget")
+    parser.add_argument("--memory", action="store_true", help="Only measure the memory held by each domain's loaded rows")
+    args = parser.parse_args()
+
+    if args.memory:
+        # Read-only, so the shipped data is measured in place unless a scale is asked for
+        with tempfile.TemporaryDirectory(prefix="uipro-bench-") as scratch:
+            data_dir = core.DATA_DIR
+            if args.scale > 1:
+                data_dir = Path(scratch) / "data"
+                generate_synthetic_data(args.scale, data_dir)
+            with use_data_dir(data_dir):
+                memory = measure_row_memory()
+        print(json.dumps(memory, indent=2) if args.json else format_row_memory(memory))
+        sys.exit(0)
+
+    if args.startup:
+        with tempfile.TemporaryDirectory(prefix="uipro-bench-") as scratch:
+            shutil.copytree(core.DATA_DIR, Path(scratch) / "data", ignore=shutil.ignore_patterns(core.INDEX_DIRNAME))
+            startup = time_startup(scratch, repeat=args.repeat)
+        print(json.dumps(startup, indent=2) if args.json else format_startup(startup))
+        sys.exit(0 if all(result["within_budget"] for result in startup.values()) else 1)
+
+    if args.synthesize:
+        written = generate_synthetic_data(max(1, args.scale), args.synthesize)
+        print(f"Wrote {len(written)} CSV files ({sum(written.values()):,} rows) to {args.synthesize}")
+        sys.exit(0)
+
+    report = run_benchmark(args.scale, args.mode, args.repeat, not args.no_cold_start, args.eval)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Client - forwards one request to a running search daemon
+(see server.py) and falls back to answering it in-process.
+
+Kept apart from server.py so a forwarded query only loads json, os and socket:
+the engine (core.py) is imported only when no daemon is running.
+"""
+
+import json
+import os
+import stat
+import zlib
+
+CONNECT_TIMEOUT = 0.5
+REQUEST_TIMEOUT = 60
+
+# The data directory core.DATA_DIR points to, without importing core
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def socket_dir():
+    """Private per-user directory for daemon sockets: $XDG_RUNTIME_DIR when set, otherwise a
+    per-user directory in the temp dir (created 0700 by the daemon, see server._private_dir)"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "ui-ux-pro-max")
+    # tempfile.gettempdir()'s environment lookup, without the ~8 ms tempfile import
+    temp_dir = os.environ.get("TMPDIR") or os.environ.get("TEMP") or os.environ.get("TMP") or "/tmp"
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(temp_dir, f"ui-ux-pro-max-{user}")
+
+
+def default_socket_path(data_dir=None):
+    """Per-user, per-install socket path (one daemon per data directory)"""
+    data_key = f"{zlib.crc32(os.path.realpath(data_dir or DATA_DIR).encode('utf-8')):08x}"
+    return os.path.join(socket_dir(), f"{data_key}.sock")
+
+
+def _owned_by_us(st):
+    """Whether a stat result belongs to the current user (always true without POSIX uids)"""
+    return not hasattr(os, "getuid") or st.st_uid == os.getuid()
+
+
+def request(payload, socket_path=None, timeout=REQUEST_TIMEOUT):
+    """Send one request to a running daemon; returns the response dict, or None if no daemon
+    of this user is listening. Once the request is sent, a failure raises instead: the daemon
+    may already have acted on it, so it must not be run a second time in-process."""
+    socket_path = os.fspath(socket_path or default_socket_path())
+    try:
+        st = os.stat(socket_path)
+    except OSError:
+        return None
+    # Only a socket of our own is trusted with a request (and its answer)
+    if not stat.S_ISSOCK(st.st_mode) or not _owned_by_us(st):
+        return None
+    import socket
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return None
+        sock.settimeout(timeout)
+        try:
+            sock.sendall((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+            buffer = b""
+            while not buffer.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    raise ConnectionError("connection closed before a response")
+                buffer += chunk
+        except OSError as e:
+            raise RuntimeError(f"Search daemon on {socket_path} did not answer: {e}") from e
+    finally:
+        sock.close()
+    return json.loads(buffer)
+
+
+def run(payload, use_daemon=True, socket_path=None, local=None):
+    """Forward a request to the daemon when one is running, otherwise run it in-process
+    with local(payload) (server.dispatch by default, or e.g. a caller that streams its output)"""
+    if use_daemon:
+        response = request(payload, socket_path)
+        if response is not None:
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+            return response["result"]
+    if local is None:
+        from server import dispatch as local
+    return local(payload)
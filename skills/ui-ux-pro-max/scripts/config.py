@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Config - the searchable domains and stacks and the search defaults.
+
+Plain data, shared by core.py and the CLI: search.py builds its arguments from
+it without loading the engine, which a query forwarded to the daemon never needs.
+"""
+
+MAX_RESULTS = 3
+# Domains search_routed() searches by default
+ROUTE_TOP_N = 3
+# Concurrent workers for batches, routed searches and design-system briefs
+BATCH_WORKERS = 4
+
+CSV_CONFIG = {
+    "style": {
+        "file": "styles.csv",
+        "search_cols": ["Style Category", "Keywords", "Best For", "Type", "AI Prompt Keywords"],
+        # BM25F: a hit in the style name outweighs one in the long keyword blobs
+        "field_weights": {"Style Category": 8.0, "Best For": 0.5, "Type": 0.5},
+        "field_b": {"Style Category": 0.3},
+        "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Performance", "Accessibility", "Framework Compatibility", "Complexity", "AI Prompt Keywords", "CSS/Technical Keywords", "Implementation Checklist", "Design System Variables"]
+    },
+    "color": {
+        "file": "colors.csv",
+        "search_cols": ["Product Type", "Notes"],
+        "output_cols": ["Product Type", "Primary (Hex)", "Secondary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Notes"]
+    },
+    "chart": {
+        "file": "charts.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Data Type", "Keywords", "Best Chart Type", "Accessibility Notes"],
+        "field_weights": {"Data Type": 3.0, "Accessibility Notes": 0.5},
+        "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "Color Guidance", "Accessibility Notes", "Library Recommendation", "Interactive Level"]
+    },
+    "landing": {
+        "file": "landing.csv",
+        "search_cols": ["Pattern Name", "Keywords", "Conversion Optimization", "Section Order"],
+        "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"]
+    },
+    "product": {
+        "file": "products.csv",
+        "search_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Key Considerations"],
+        "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"]
+    },
+    "ux": {
+        "file": "ux-guidelines.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Issue", "Description", "Platform"],
+        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+    },
+    "typography": {
+        "file": "typography.csv",
+        "search_cols": ["Font Pairing Name", "Category", "Mood/Style Keywords", "Best For", "Heading Font", "Body Font"],
+        "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"]
+    },
+    "icons": {
+        "file": "icons.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Icon Name", "Keywords", "Best For"],
+        "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"]
+    },
+    "react": {
+        "file": "react-performance.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+    },
+    "web": {
+        "file": "web-interface.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Issue", "Keywords", "Description"],
+        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+    },
+    "animation": {
+        "file": "animations.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Pattern", "Keywords", "Trigger"],
+        "output_cols": ["Category", "Pattern", "Keywords", "Trigger", "Duration", "Easing", "CSS Properties", "Code Example", "Accessibility", "Severity"]
+    },
+    "component": {
+        "file": "components.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Component", "Pattern", "Keywords", "Description"],
+        "output_cols": ["Component", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Accessibility", "Responsive", "Severity"]
+    },
+    "responsive": {
+        "file": "responsive.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
+        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Breakpoint", "Code Example Good", "Code Example Bad", "Severity"]
+    },
+    "darkmode": {
+        "file": "dark-mode.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
+        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+    },
+    "tokens": {
+        "file": "design-tokens.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Token Name", "Keywords", "Usage"],
+        "output_cols": ["Category", "Token Name", "Keywords", "Value", "Scale", "CSS Variable", "Tailwind Class", "Usage", "Notes", "Severity"]
+    },
+    "a11y": {
+        "file": "accessibility.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Criterion", "Keywords", "Description"],
+        "output_cols": ["Category", "Criterion", "WCAG Level", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Testing", "Severity"]
+    },
+    "page-standards": {
+        "file": "page-standards.csv",
+        "search_cols": ["Page Type", "Keywords", "Required Sections"],
+        "output_cols": ["Page Type", "Keywords", "Required Sections", "Recommended Sections", "Nav Requirements", "Footer Requirements", "SEO Requirements", "Internal Links", "Common Violations", "Severity"]
+    },
+    "navigation": {
+        "file": "navigation-ia.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
+        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+    },
+    "seo": {
+        "file": "seo-per-page.csv",
+        "search_cols": ["Page Type", "Keywords", "Title Format", "Schema Type"],
+        "output_cols": ["Page Type", "Keywords", "Title Format", "Meta Description", "Schema Type", "Indexing", "Canonical", "Open Graph", "Heading Structure", "Internal Link Strategy", "Severity"]
+    },
+    "layout": {
+        "file": "global-layout.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
+        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+    },
+    "auth": {
+        "file": "auth-pages.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
+        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+    },
+    "empty-states": {
+        "file": "empty-states.csv",
+        "tokenizer": "stem",
+        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
+        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
+    },
+    "audit-rules": {
+        "file": "page-audit-rules.csv",
+        "search_cols": ["Rule ID", "Page Type", "Check Type", "Rule Description"],
+        "output_cols": ["Rule ID", "Page Type", "Check Type", "Rule Description", "Violation Example", "Fix Suggestion", "Severity"]
+    }
+}
+
+STACK_CONFIG = {
+    "html-tailwind": {"file": "stacks/html-tailwind.csv"},
+    "react": {"file": "stacks/react.csv"},
+    "nextjs": {"file": "stacks/nextjs.csv"},
+    "astro": {"file": "stacks/astro.csv"},
+    "vue": {"file": "stacks/vue.csv"},
+    "nuxtjs": {"file": "stacks/nuxtjs.csv"},
+    "nuxt-ui": {"file": "stacks/nuxt-ui.csv"},
+    "svelte": {"file": "stacks/svelte.csv"},
+    "swiftui": {"file": "stacks/swiftui.csv"},
+    "react-native": {"file": "stacks/react-native.csv"},
+    "flutter": {"file": "stacks/flutter.csv"},
+    "shadcn": {"file": "stacks/shadcn.csv"},
+    "jetpack-compose": {"file": "stacks/jetpack-compose.csv"}
+}
+
+AVAILABLE_STACKS = list(STACK_CONFIG.keys())
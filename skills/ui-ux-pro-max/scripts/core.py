@@ -5,148 +5,62 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import heapq
+import json
+import os
 import re
+import threading
+from array import array
 from pathlib import Path
 from math import log
-from collections import defaultdict
+from bisect import bisect_left
+from collections import Counter, defaultdict, OrderedDict
+from functools import lru_cache
+from itertools import chain
+from config import MAX_RESULTS, CSV_CONFIG, STACK_CONFIG, AVAILABLE_STACKS, ROUTE_TOP_N, BATCH_WORKERS
+from snapshot import build_snapshot, load_table
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
-MAX_RESULTS = 3
-
-CSV_CONFIG = {
-    "style": {
-        "file": "styles.csv",
-        "search_cols": ["Style Category", "Keywords", "Best For", "Type", "AI Prompt Keywords"],
-        "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Performance", "Accessibility", "Framework Compatibility", "Complexity", "AI Prompt Keywords", "CSS/Technical Keywords", "Implementation Checklist", "Design System Variables"]
-    },
-    "color": {
-        "file": "colors.csv",
-        "search_cols": ["Product Type", "Notes"],
-        "output_cols": ["Product Type", "Primary (Hex)", "Secondary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Notes"]
-    },
-    "chart": {
-        "file": "charts.csv",
-        "search_cols": ["Data Type", "Keywords", "Best Chart Type", "Accessibility Notes"],
-        "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "Color Guidance", "Accessibility Notes", "Library Recommendation", "Interactive Level"]
-    },
-    "landing": {
-        "file": "landing.csv",
-        "search_cols": ["Pattern Name", "Keywords", "Conversion Optimization", "Section Order"],
-        "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"]
-    },
-    "product": {
-        "file": "products.csv",
-        "search_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Key Considerations"],
-        "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"]
-    },
-    "ux": {
-        "file": "ux-guidelines.csv",
-        "search_cols": ["Category", "Issue", "Description", "Platform"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "typography": {
-        "file": "typography.csv",
-        "search_cols": ["Font Pairing Name", "Category", "Mood/Style Keywords", "Best For", "Heading Font", "Body Font"],
-        "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"]
-    },
-    "icons": {
-        "file": "icons.csv",
-        "search_cols": ["Category", "Icon Name", "Keywords", "Best For"],
-        "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"]
-    },
-    "react": {
-        "file": "react-performance.csv",
-        "search_cols": ["Category", "Issue", "Keywords", "Description"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "web": {
-        "file": "web-interface.csv",
-        "search_cols": ["Category", "Issue", "Keywords", "Description"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "animation": {
-        "file": "animations.csv",
-        "search_cols": ["Category", "Pattern", "Keywords", "Trigger"],
-        "output_cols": ["Category", "Pattern", "Keywords", "Trigger", "Duration", "Easing", "CSS Properties", "Code Example", "Accessibility", "Severity"]
-    },
-    "component": {
-        "file": "components.csv",
-        "search_cols": ["Component", "Pattern", "Keywords", "Description"],
-        "output_cols": ["Component", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Accessibility", "Responsive", "Severity"]
-    },
-    "responsive": {
-        "file": "responsive.csv",
-        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
-        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Breakpoint", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "darkmode": {
-        "file": "dark-mode.csv",
-        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
-        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "tokens": {
-        "file": "design-tokens.csv",
-        "search_cols": ["Category", "Token Name", "Keywords", "Usage"],
-        "output_cols": ["Category", "Token Name", "Keywords", "Value", "Scale", "CSS Variable", "Tailwind Class", "Usage", "Notes", "Severity"]
-    },
-    "a11y": {
-        "file": "accessibility.csv",
-        "search_cols": ["Category", "Criterion", "Keywords", "Description"],
-        "output_cols": ["Category", "Criterion", "WCAG Level", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Testing", "Severity"]
-    },
-    "page-standards": {
-        "file": "page-standards.csv",
-        "search_cols": ["Page Type", "Keywords", "Required Sections"],
-        "output_cols": ["Page Type", "Keywords", "Required Sections", "Recommended Sections", "Nav Requirements", "Footer Requirements", "SEO Requirements", "Internal Links", "Common Violations", "Severity"]
-    },
-    "navigation": {
-        "file": "navigation-ia.csv",
-        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
-        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "seo": {
-        "file": "seo-per-page.csv",
-        "search_cols": ["Page Type", "Keywords", "Title Format", "Schema Type"],
-        "output_cols": ["Page Type", "Keywords", "Title Format", "Meta Description", "Schema Type", "Indexing", "Canonical", "Open Graph", "Heading Structure", "Internal Link Strategy", "Severity"]
-    },
-    "layout": {
-        "file": "global-layout.csv",
-        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
-        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "auth": {
-        "file": "auth-pages.csv",
-        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
-        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "empty-states": {
-        "file": "empty-states.csv",
-        "search_cols": ["Category", "Pattern", "Keywords", "Description"],
-        "output_cols": ["Category", "Pattern", "Keywords", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "audit-rules": {
-        "file": "page-audit-rules.csv",
-        "search_cols": ["Rule ID", "Page Type", "Check Type", "Rule Description"],
-        "output_cols": ["Rule ID", "Page Type", "Check Type", "Rule Description", "Violation Example", "Fix Suggestion", "Severity"]
-    }
-}
 
-STACK_CONFIG = {
-    "html-tailwind": {"file": "stacks/html-tailwind.csv"},
-    "react": {"file": "stacks/react.csv"},
-    "nextjs": {"file": "stacks/nextjs.csv"},
-    "astro": {"file": "stacks/astro.csv"},
-    "vue": {"file": "stacks/vue.csv"},
-    "nuxtjs": {"file": "stacks/nuxtjs.csv"},
-    "nuxt-ui": {"file": "stacks/nuxt-ui.csv"},
-    "svelte": {"file": "stacks/svelte.csv"},
-    "swiftui": {"file": "stacks/swiftui.csv"},
-    "react-native": {"file": "stacks/react-native.csv"},
-    "flutter": {"file": "stacks/flutter.csv"},
-    "shadcn": {"file": "stacks/shadcn.csv"},
-    "jetpack-compose": {"file": "stacks/jetpack-compose.csv"}
-}
+# Prebuilt indexes live in DATA_DIR/.index and are rebuilt when the source CSV changes
+INDEX_DIRNAME = ".index"
+INDEX_VERSION = 6
+# An edited CSV has its index patched for the changed rows only (see _row_changes),
+# unless more than this fraction of its rows changed, which rebuilds it instead
+INCREMENTAL_MAX_CHANGED = 0.25
+# Optional compiled copy of every CSV (see snapshot.py), memory-mapped when current
+SNAPSHOT_FILE = "data.snap"
+# Recent search results kept in memory (0 disables the cache)
+RESULT_CACHE_SIZE = 512
+# Tokenizer used when a CSV_CONFIG entry has no "tokenizer" key (see TOKENIZERS)
+DEFAULT_TOKENIZER = "default"
+# Distinct texts (cells, queries) whose tokens each tokenizer remembers
+TOKEN_CACHE_SIZE = 8192
+# BM25 scoring backend: "auto" scores indexes of at least VECTOR_MIN_DOCS rows with
+# NumPy when it is installed, "numpy" every index, "python" none (see _VectorIndex)
+SCORING_BACKEND = "auto"
+VECTOR_MIN_DOCS = 512
+# Top-k queries skip documents that cannot reach the top k (MaxScore, see BM25._score_pruned)
+# on indexes of at least PRUNE_MIN_DOCS rows; 0 disables pruning. The shipped CSVs have at most
+# ~120 rows, so it only applies to larger (e.g. benchmark.py --scale) data
+PRUNE_MIN_DOCS = 1000
+# Relative safety margin for pruning decisions (bounds are summed in another order than scores)
+PRUNE_EPSILON = 1e-9
+# Query tokens missing from an index expand to its nearest terms (see _FuzzyIndex): within
+# FUZZY_MAX_EDITS edits (1 below 6 letters) or as a prefix, keeping at most FUZZY_MAX_EXPANSIONS
+# of the FUZZY_MAX_CANDIDATES best trigram / prefix candidates; shorter tokens never expand
+FUZZY_MATCHING = True
+FUZZY_MIN_LEN = 4
+FUZZY_MAX_EDITS = 2
+FUZZY_MAX_EXPANSIONS = 3
+FUZZY_MAX_CANDIDATES = 32
+# Adjacent word pairs in a cell are indexed as phrase terms ("dark mode"), so a query's
+# adjacent words score as a phrase too; PHRASE_WEIGHT scales their IDF (see _shingles).
+# Phrases found in fewer than PHRASE_MIN_DF rows are dropped (most pairs occur only once)
+PHRASE_SHINGLES = True
+PHRASE_WEIGHT = 0.5
+PHRASE_MIN_DF = 2
 
 # Common columns for all stacks
 _STACK_COLS = {
@@ -154,137 +68,1573 @@ _STACK_COLS = {
     "output_cols": ["Category", "Guideline", "Description", "Do", "Don't", "Code Good", "Code Bad", "Severity", "Docs URL"]
 }
 
-AVAILABLE_STACKS = list(STACK_CONFIG.keys())
+
+# ============ TOKENIZERS ============
+_WORD_RE = re.compile(r'\w+')
+
+STOPWORDS = frozenset([
+    "the", "and", "for", "with", "from", "into", "onto", "over", "than", "then", "that", "this",
+    "these", "those", "are", "was", "were", "been", "being", "have", "has", "had", "not", "but",
+    "all", "any", "each", "its", "our", "your", "you", "they", "them", "their", "can", "will",
+    "should", "would", "could", "when", "where", "which", "while", "who", "what", "how", "why",
+    "also", "more", "most", "such", "only", "very", "just", "some", "other", "out",
+    "via", "per", "etc", "use", "using"
+])
+
+# (suffix, replacement) tried in order; the first one leaving a stem of 3+ letters wins
+_STEM_SUFFIXES = (
+    ("izations", "iz"), ("ization", "iz"), ("ations", "at"), ("ation", "at"),
+    ("ings", ""), ("ing", ""), ("ies", "y"), ("ied", "y"), ("edly", ""), ("ed", ""),
+    ("es", ""), ("ly", ""), ("s", ""), ("e", "")
+)
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def light_stem(word):
+    """Strip common English inflections (buttons -> button, animated / animation -> animat)"""
+    for suffix, replacement in _STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            # class, focus, canvas-like words are not plurals
+            if suffix == "s" and word.endswith(("ss", "us", "is")):
+                return word
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+class Tokenizer:
+    """Lowercase word tokenizer: compiled pattern, short-word filter, optional stopwords and stemming.
+
+    Tokens are memoized per distinct text, so repeated cells (categories,
+    platforms, severities) and repeated queries are only tokenized once.
+    """
+
+    def __init__(self, stopwords=(), stem=False, min_len=3, cache_size=TOKEN_CACHE_SIZE):
+        self.stopwords = frozenset(stopwords)
+        self.stem = stem
+        self.min_len = min_len
+        self._cached = lru_cache(maxsize=cache_size)(self._tokenize)
+
+    def __call__(self, text):
+        return list(self._cached(str(text)))
+
+    def _tokenize(self, text):
+        words = [w for w in _WORD_RE.findall(text.lower()) if len(w) >= self.min_len and w not in self.stopwords]
+        if self.stem:
+            words = [light_stem(w) for w in words]
+        return tuple(words)
+
+    def cache_info(self):
+        return self._cached.cache_info()
+
+
+def _shingles(tokens):
+    """Phrase terms for adjacent tokens: "dark mode" (the space never occurs inside a token)"""
+    return [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def _is_phrase(term):
+    return " " in term
+
+
+def _drop_rare_phrases(postings_maps, terms=None):
+    """Remove phrase terms found in fewer than PHRASE_MIN_DF documents (over all the maps), only among terms if given"""
+    docs = defaultdict(set)
+    for postings_map in postings_maps:
+        for term in (postings_map if terms is None else terms):
+            if _is_phrase(term) and term in postings_map:
+                docs[term].update(postings_map[term])
+    for term, found_in in docs.items():
+        if len(found_in) < PHRASE_MIN_DF:
+            for postings_map in postings_maps:
+                postings_map.pop(term, None)
+
+
+def _patch_postings(postings_maps, n_docs, changes, split, cells_of, phrases):
+    """Replace documents in postings maps without re-indexing the others.
+
+    changes lists (start, end, docs) in ascending order: documents [start, end)
+    of the n_docs old ones become docs, each a list of per-cell token lists;
+    later documents shift along. split(cells) gives each map's cells of a
+    document (all of them for BM25, one per field for BM25F), and cells_of(idx)
+    any current document's cells. Postings are replaced, never modified, so
+    maps copied from a live index can be patched while it serves searches.
+
+    Phrase terms end up as _drop_rare_phrases leaves a fresh build: a phrase
+    that a new document lifts to PHRASE_MIN_DF gets back its dropped
+    occurrence, found by re-tokenizing only the documents holding both of
+    its words. Returns the terms whose postings changed.
+    """
+    new_index = []
+    added = []
+    shift = prev = 0
+    for start, end, docs in changes:
+        new_index.extend(range(prev + shift, start + shift))
+        new_index.extend([None] * (end - start))
+        added.extend((start + shift + offset, cells) for offset, cells in enumerate(docs))
+        shift += len(docs) - (end - start)
+        prev = end
+    new_index.extend(range(prev + shift, n_docs + shift))
+    moved = any(len(docs) != end - start for start, end, docs in changes)
+    removed = [idx for start, end, _ in changes for idx in range(start, end)]
+
+    touched = set()
+    owned = [set() for _ in postings_maps]
+    for postings_map, fresh in zip(postings_maps, owned):
+        for term, postings in list(postings_map.items()):
+            if moved:
+                patched = {new_index[idx]: tf for idx, tf in postings.items() if new_index[idx] is not None}
+            elif any(idx in postings for idx in removed):
+                patched = {idx: tf for idx, tf in postings.items() if new_index[idx] is not None}
+            else:
+                continue
+            if len(patched) < len(postings):
+                touched.add(term)
+            if patched:
+                postings_map[term] = patched
+                fresh.add(term)
+            else:
+                del postings_map[term]
+
+    def own(pos, term):
+        """Postings of term in map pos that this patch may modify"""
+        postings_map = postings_maps[pos]
+        if term not in owned[pos]:
+            postings_map[term] = dict(postings_map.get(term, ()))
+            owned[pos].add(term)
+        return postings_map[term]
+
+    hidden = set()
+    for idx, cells in added:
+        for pos, group in enumerate(split(cells)):
+            counts = Counter(token for tokens in group for token in tokens)
+            if phrases:
+                shingled = Counter(phrase for tokens in group for phrase in _shingles(tokens))
+                # Not indexed anywhere yet: its other occurrences, if any, were dropped as rare
+                hidden.update(phrase for phrase in shingled if not any(phrase in other for other in postings_maps))
+                counts.update(shingled)
+            for term, tf in counts.items():
+                own(pos, term)[idx] = tf
+            touched.update(counts)
+
+    if hidden:
+        new_docs = {idx for idx, _ in added}
+        shingles = {}
+        for phrase in hidden:
+            first, second = phrase.split(" ")
+            for pos, postings_map in enumerate(postings_maps):
+                for idx in (postings_map.get(first, {}).keys() & postings_map.get(second, {}).keys()) - new_docs:
+                    if idx not in shingles:
+                        shingles[idx] = [Counter(p for tokens in group for p in _shingles(tokens)) for group in split(cells_of(idx))]
+                    tf = shingles[idx][pos][phrase]
+                    if tf:
+                        own(pos, phrase)[idx] = tf
+    if phrases:
+        _drop_rare_phrases(postings_maps, touched)
+    return touched
+
+
+# Selectable per domain with CSV_CONFIG[domain]["tokenizer"]
+TOKENIZERS = {
+    "default": Tokenizer(),
+    "stem": Tokenizer(stopwords=STOPWORDS, stem=True),
+}
+
+
+def _tokenizer_name(config):
+    return config.get("tokenizer", DEFAULT_TOKENIZER)
+
+
+def _field_spec(config):
+    """((column, weight, b), ...) for a BM25F entry (one with "field_weights"), else None"""
+    if "field_weights" not in config:
+        return None
+    weights = config["field_weights"]
+    field_b = config.get("field_b", {})
+    return tuple((col, weights.get(col, 1.0), field_b.get(col, 0.75)) for col in config["search_cols"])
 
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
     """BM25 ranking algorithm for text search"""
 
-    def __init__(self, k1=1.5, b=0.75):
+    def __init__(self, k1=1.5, b=0.75, tokenizer=DEFAULT_TOKENIZER, phrases=False):
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.tokenizer = tokenizer
+        self.phrases = phrases
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
+        self.postings = {}
+        self.doc_norms = []
+        self.max_idf = 0
         self.N = 0
+        self.term_bounds = {}
+        self._vectors = None
+        self._fuzzy = None
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        """Lowercase, split, remove punctuation, filter short words (plus this index's tokenizer steps)"""
+        return TOKENIZERS[self.tokenizer](text)
 
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Build BM25 index (postings lists, doc lengths, IDF) from documents"""
+        corpus = [self.tokenize(doc) for doc in documents]
+        self.fit_tokens(corpus, [_shingles(doc) for doc in corpus] if self.phrases else None)
+
+    def fit_tokens(self, corpus, phrases=None):
+        """fit() for documents that are already tokenized.
+
+        phrases holds each document's phrase terms (see _shingles); they get
+        postings of their own but leave the document lengths unchanged.
+        """
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+        for idx, doc in enumerate(corpus):
+            for word in (doc + phrases[idx] if phrases else doc):
+                postings = self.postings.setdefault(word, {})
+                postings[idx] = postings.get(idx, 0) + 1
+        if phrases:
+            _drop_rare_phrases([self.postings])
 
-        for word, freq in self.doc_freqs.items():
+        for word, postings in self.postings.items():
+            self.doc_freqs[word] = len(postings)
+
+        self._compute_idf()
+        # Stored with the index where pruning will use them, computed on demand elsewhere
+        if 0 < PRUNE_MIN_DOCS <= self.N:
+            self._compute_bounds()
+
+    def update(self, changes, cells_of):
+        """Patch the fitted index for changed documents (see _patch_postings for changes and cells_of).
+
+        Only the postings of terms in removed or added documents change. Doc
+        lengths are spliced, avgdl and the document norms follow, and IDF is
+        recomputed for the touched terms only (for all of them when the number
+        of documents changed). Containers are replaced rather than modified,
+        so a copy.copy() of a live index can be updated while the original
+        keeps serving searches.
+        """
+        self.postings = dict(self.postings)
+        touched = _patch_postings([self.postings], self.N, changes, lambda cells: [cells], cells_of, self.phrases)
+        doc_lengths = []
+        prev = 0
+        for start, end, docs in changes:
+            doc_lengths += self.doc_lengths[prev:start] + [sum(map(len, cells)) for cells in docs]
+            prev = end
+        self.doc_lengths = doc_lengths + self.doc_lengths[prev:]
+        resized = len(self.doc_lengths) != self.N
+        self.N = len(self.doc_lengths)
+        self.avgdl = sum(self.doc_lengths) / self.N if self.N else 0
+
+        if resized:
+            self.doc_freqs = defaultdict(int, {word: len(postings) for word, postings in self.postings.items()})
+            self.idf = {}
+            self._compute_idf()
+        else:
+            self.doc_freqs = defaultdict(int, self.doc_freqs)
+            self.idf = dict(self.idf)
+            for word in touched:
+                if word in self.postings:
+                    self.doc_freqs[word] = len(self.postings[word])
+                else:
+                    self.doc_freqs.pop(word, None)
+                    self.idf.pop(word, None)
+            self._compute_idf(touched & self.postings.keys())
+        if 0 < PRUNE_MIN_DOCS <= self.N:
+            self._compute_bounds()
+
+    def _compute_idf(self, words=None):
+        # While N is unchanged, only words whose document frequency changed need a new IDF
+        for word in (self.doc_freqs if words is None else words):
+            freq = self.doc_freqs[word]
             self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+        self._weigh_phrases(words)
+        # Per-document length normalization, precomputed once per index
+        self.doc_norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
+        self.term_bounds = {}
+        self._vectors = None
+        self._fuzzy = None
+        self._vector_index()
 
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+    def _weigh_phrases(self, words=None):
+        """Scale phrase IDFs (of words, if given) by PHRASE_WEIGHT; max_idf stays that of single words"""
+        for word in (self.idf if words is None else words):
+            if _is_phrase(word):
+                self.idf[word] = self.idf[word] * PHRASE_WEIGHT
+        self.max_idf = max((idf for word, idf in self.idf.items() if not _is_phrase(word)), default=0)
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+    def _compute_bounds(self):
+        """Per-term upper bound: the largest contribution the term makes to any document"""
+        k1, norms = self.k1, self.doc_norms
+        self.term_bounds = {
+            word: self.idf[word] * max(tf * (k1 + 1) / (tf + norms[idx]) for idx, tf in postings.items())
+            for word, postings in self.postings.items()
+        }
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+    def _vector_index(self):
+        """NumPy term matrix for this index, or None when scoring stays in pure Python"""
+        if SCORING_BACKEND == "python" or (SCORING_BACKEND == "auto" and self.N < VECTOR_MIN_DOCS) or _numpy() is None:
+            return None
+        if self._vectors is None:
+            self._vectors = _VectorIndex(self)
+        return self._vectors
 
-            scores.append((idx, score))
+    def expand_tokens(self, query_tokens, known=None):
+        """Replace each query token missing from the vocabulary by its nearest terms.
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        Tokens for which known(token) is true are real words this index lacks and
+        are kept. Returns (tokens, expansions): expansions maps every expanded token
+        to the terms it became, [] when none is close enough (the token is then kept).
+        """
+        unmatched = [token for token in query_tokens
+                     if token not in self.postings and not _is_phrase(token) and not (known and known(token))]
+        if not FUZZY_MATCHING or not unmatched or not self.postings:
+            return list(query_tokens), {}
+        if self._fuzzy is None:
+            self._fuzzy = _FuzzyIndex(self.postings)
+        expansions = {token: self._fuzzy.nearest(token) for token in unmatched}
+        tokens = []
+        for token in query_tokens:
+            tokens.extend(expansions.get(token) or [token])
+        return tokens, expansions
 
+    def query_terms(self, query_tokens):
+        """Query tokens plus, for an index with phrase terms, their adjacent pairs"""
+        return list(query_tokens) + _shingles(query_tokens) if self.phrases else list(query_tokens)
 
-# ============ SEARCH FUNCTIONS ============
+    def score(self, query, max_results=None):
+        """Score documents against query via the postings of its terms.
+
+        Only documents containing at least one query term are scored. Returns
+        (idx, score) pairs sorted by score (ties by document order); with
+        max_results, a heap keeps just the top-k instead of sorting them all.
+        """
+        return self.score_tokens(self.query_terms(self.tokenize(query)), max_results)
+
+    def score_tokens(self, query_tokens, max_results=None):
+        """score() for an already tokenized query"""
+        vectors = self._vector_index()
+        if vectors is not None:
+            return vectors.score_batch([query_tokens], max_results)[0]
+        if max_results is not None and 0 < max_results and 0 < PRUNE_MIN_DOCS <= self.N:
+            return self._score_pruned(query_tokens, max_results)
+        scores = {}
+
+        for token in query_tokens:
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = self.idf[token]
+            for idx, tf in postings.items():
+                numerator = tf * (self.k1 + 1)
+                denominator = tf + self.doc_norms[idx]
+                scores[idx] = scores.get(idx, 0) + idf * numerator / denominator
+
+        def rank_key(item):
+            return (-item[1], item[0])
+
+        if max_results is not None and max_results < len(scores):
+            return heapq.nsmallest(max_results, scores.items(), key=rank_key)
+        return sorted(scores.items(), key=rank_key)
+
+    def _score_pruned(self, query_tokens, max_results):
+        """score_tokens() top-k via MaxScore, term at a time.
+
+        Terms are accumulated in decreasing order of their upper bound. Once
+        the bounds of the terms left sum to less than the current k-th best
+        partial score, unseen documents cannot make the top k: the long
+        postings of the remaining (common) terms are then only probed for
+        the candidates already seen, and candidates that cannot catch up are
+        dropped. Survivors are rescored in query order, so scores and ties are
+        exactly those of the exhaustive path.
+        """
+        if not self.term_bounds:
+            self._compute_bounds()
+        counts = {}
+        for token in query_tokens:
+            if token in self.postings:
+                counts[token] = counts.get(token, 0) + 1
+        bounds = {token: self.term_bounds[token] * count for token, count in counts.items()}
+        remaining = sum(bounds.values())
+        k1, norms = self.k1, self.doc_norms
+        partial = {}
+        threshold = 0
+        for token in sorted(bounds, key=bounds.get, reverse=True):
+            postings = self.postings[token]
+            weight = self.idf[token] * counts[token] * (k1 + 1)
+            if remaining < threshold * (1 - PRUNE_EPSILON):
+                # Unseen documents can no longer reach the top k: probe the candidates only
+                for idx in partial:
+                    tf = postings.get(idx)
+                    if tf is not None:
+                        partial[idx] += weight * tf / (tf + norms[idx])
+                remaining -= bounds[token]
+                cutoff = threshold * (1 - PRUNE_EPSILON) - remaining
+                partial = {idx: score for idx, score in partial.items() if score >= cutoff}
+            else:
+                for idx, tf in postings.items():
+                    partial[idx] = partial.get(idx, 0) + weight * tf / (tf + norms[idx])
+                remaining -= bounds[token]
+            if len(partial) >= max_results:
+                threshold = heapq.nlargest(max_results, partial.values())[-1]
+
+        cutoff = threshold * (1 - PRUNE_EPSILON)
+        scored = [(idx, self._exact_score(idx, query_tokens)) for idx, score in partial.items() if score >= cutoff]
+        return heapq.nsmallest(max_results, scored, key=lambda item: (-item[1], item[0]))
+
+    def _exact_score(self, idx, query_tokens):
+        """One document's score, summed in query order exactly like score_tokens()"""
+        score = 0
+        for token in query_tokens:
+            postings = self.postings.get(token)
+            if postings:
+                tf = postings.get(idx)
+                if tf is not None:
+                    score = score + self.idf[token] * (tf * (self.k1 + 1)) / (tf + self.doc_norms[idx])
+        return score
+
+    def score_batch(self, queries, max_results=None):
+        """score_tokens() for many tokenized queries, one matrix pass per chunk with NumPy"""
+        vectors = self._vector_index()
+        if vectors is not None:
+            return vectors.score_batch(queries, max_results)
+        return [self.score_tokens(query_tokens, max_results) for query_tokens in queries]
+
+    def max_score(self, query_tokens):
+        """Upper bound of any document's score for these tokens (term frequency saturates at k1 + 1).
+
+        Tokens missing from the vocabulary count at the rarest term's IDF, so a
+        corpus that only covers part of the query gets a proportionally lower ceiling.
+        Missing phrase terms count nothing: their words are already counted.
+        """
+        return sum(self.idf.get(token, 0 if _is_phrase(token) else self.max_idf) for token in query_tokens) * (self.k1 + 1)
+
+    def to_dict(self):
+        """Serialize the fitted index (postings are stored as [doc, tf] pairs)"""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "tokenizer": self.tokenizer,
+            "phrases": self.phrases,
+            "N": self.N,
+            "avgdl": self.avgdl,
+            "doc_lengths": self.doc_lengths,
+            "postings": {word: [[idx, tf] for idx, tf in postings.items()] for word, postings in self.postings.items()},
+            "term_bounds": self.term_bounds,
+            "phrase_weight": PHRASE_WEIGHT,
+            "phrase_min_df": PHRASE_MIN_DF
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a fitted index from to_dict() output without re-tokenizing"""
+        bm25 = cls(data["k1"], data["b"], data.get("tokenizer", DEFAULT_TOKENIZER), data.get("phrases", False))
+        bm25.N = data["N"]
+        bm25.avgdl = data["avgdl"]
+        bm25.doc_lengths = data["doc_lengths"]
+        bm25.postings = {word: dict(pairs) for word, pairs in data["postings"].items()}
+        for word, postings in bm25.postings.items():
+            bm25.doc_freqs[word] = len(postings)
+        bm25._compute_idf()
+        # Bounds include phrase IDFs, so they only hold for the weight they were computed with
+        if data.get("phrase_weight", PHRASE_WEIGHT) == PHRASE_WEIGHT:
+            bm25.term_bounds = data.get("term_bounds", {})
+        return bm25
+
+
+class BM25F(BM25):
+    """BM25F: BM25 over a weighted sum of per-field, length-normalized term frequencies.
+
+    Each field keeps its own postings and lengths. A term's pseudo frequency in
+    a document is sum(weight[f] * tf[f] / (1 - b[f] + b[f] * len[f] / avglen[f])),
+    saturated once with k1. Pseudo frequencies are folded into the inherited
+    postings (with a constant k1 document norm), so scoring, top-k and max_score
+    are shared with BM25. Weights and b can change without re-tokenizing.
+    """
+
+    def __init__(self, k1=1.5, b=0.75, tokenizer=DEFAULT_TOKENIZER, field_weights=None, field_b=None, phrases=False):
+        super().__init__(k1, b, tokenizer, phrases)
+        self.field_weights = dict(field_weights or {})
+        self.field_b = dict(field_b or {})
+        self.fields = []
+        self.field_postings = {}
+        self.field_lengths = {}
+
+    def fit_fields(self, fields, corpus):
+        """Index documents given as one token list per field (in fields order).
+
+        With phrases, each field's adjacent pairs are indexed in that field too;
+        field lengths still count single words only.
+        """
+        self.fields = list(fields)
+        self.N = len(corpus)
+        self.field_postings = {field: {} for field in self.fields}
+        self.field_lengths = {field: [] for field in self.fields}
+        for idx, doc in enumerate(corpus):
+            for field, tokens in zip(self.fields, doc):
+                self.field_lengths[field].append(len(tokens))
+                field_postings = self.field_postings[field]
+                for word in (tokens + _shingles(tokens) if self.phrases else tokens):
+                    postings = field_postings.setdefault(word, {})
+                    postings[idx] = postings.get(idx, 0) + 1
+        if self.phrases:
+            _drop_rare_phrases(list(self.field_postings.values()))
+        if self.N:
+            self._compute_idf()
+
+    def update(self, changes, cells_of):
+        """update() for per-field documents (one cell per field, in fields order).
+
+        Field postings and lengths are patched; any changed row moves the
+        fields' average lengths, so the pseudo frequencies are then refolded
+        from the patched postings, without re-tokenizing.
+        """
+        self.field_postings = {field: dict(self.field_postings[field]) for field in self.fields}
+        _patch_postings([self.field_postings[field] for field in self.fields], self.N, changes,
+                        lambda cells: [[tokens] for tokens in cells], cells_of, self.phrases)
+        field_lengths = {}
+        for pos, field in enumerate(self.fields):
+            lengths = []
+            prev = 0
+            for start, end, docs in changes:
+                lengths += self.field_lengths[field][prev:start] + [len(cells[pos]) for cells in docs]
+                prev = end
+            field_lengths[field] = lengths + self.field_lengths[field][prev:]
+        self.field_lengths = field_lengths
+        self.N += sum(len(docs) - (end - start) for start, end, docs in changes)
+        if self.N:
+            self._compute_idf()
+
+    def _compute_idf(self):
+        self.postings = {}
+        for field in self.fields:
+            weight = self.field_weights.get(field, 1.0)
+            if weight <= 0:
+                continue
+            b = self.field_b.get(field, self.b)
+            lengths = self.field_lengths[field]
+            avglen = sum(lengths) / self.N or 1
+            norms = [1 - b + b * length / avglen for length in lengths]
+            for word, field_postings in self.field_postings[field].items():
+                postings = self.postings.get(word)
+                if postings is None:
+                    # Most words occur in one field only: fold them in one pass
+                    self.postings[word] = {idx: weight * tf / norms[idx] for idx, tf in field_postings.items()}
+                    continue
+                for idx, tf in field_postings.items():
+                    postings[idx] = postings.get(idx, 0) + weight * tf / norms[idx]
+
+        self.doc_lengths = [sum(lengths) for lengths in zip(*self.field_lengths.values())]
+        self.avgdl = sum(self.doc_lengths) / self.N if self.N else 0
+        self.doc_freqs = defaultdict(int, {word: len(postings) for word, postings in self.postings.items()})
+        self.idf = {word: log((self.N - freq + 0.5) / (freq + 0.5) + 1) for word, freq in self.doc_freqs.items()}
+        self._weigh_phrases()
+        # Length normalization already happened per field
+        self.doc_norms = [self.k1] * self.N
+        self._vectors = None
+        self._fuzzy = None
+        self._vector_index()
+        # Only pruned scoring needs them (see _score_pruned), so they are computed on first use
+        self.term_bounds = {}
+
+    def _compute_bounds(self):
+        # Every document norm is k1 here, so a term's bound is reached at its largest pseudo frequency
+        k1 = self.k1
+        self.term_bounds = {word: self.idf[word] * (tf * (k1 + 1)) / (tf + k1)
+                            for word, tf in ((word, max(postings.values())) for word, postings in self.postings.items())}
+
+    def to_dict(self):
+        """Serialize the per-field index (weights and b are reapplied on load)"""
+        return {
+            "model": "bm25f",
+            "k1": self.k1,
+            "b": self.b,
+            "tokenizer": self.tokenizer,
+            "phrases": self.phrases,
+            "phrase_min_df": PHRASE_MIN_DF,
+            "N": self.N,
+            "fields": self.fields,
+            "field_lengths": self.field_lengths,
+            "field_postings": {field: {word: [[idx, tf] for idx, tf in postings.items()] for word, postings in terms.items()}
+                               for field, terms in self.field_postings.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data, field_weights=None, field_b=None, fold=True):
+        """Rebuild from to_dict() output, scoring with the given field weights and b.
+
+        fold=False skips folding the fields into scoring postings, for an
+        index that update() folds right away.
+        """
+        bm25 = cls(data["k1"], data["b"], data.get("tokenizer", DEFAULT_TOKENIZER), field_weights, field_b, data.get("phrases", False))
+        bm25.N = data["N"]
+        bm25.fields = data["fields"]
+        bm25.field_lengths = data["field_lengths"]
+        bm25.field_postings = {field: {word: dict(pairs) for word, pairs in terms.items()}
+                               for field, terms in data["field_postings"].items()}
+        if bm25.N and fold:
+            bm25._compute_idf()
+        return bm25
+
+
+# ============ NUMPY BACKEND ============
+@lru_cache(maxsize=None)
+def _numpy():
+    """NumPy, imported on first vector scoring (it costs ~100 ms of startup); None when not installed"""
+    try:
+        import numpy
+    except ImportError:  # optional: scoring stays in pure Python
+        return None
+    return numpy
+
+
+class _VectorIndex:
+    """Sparse doc x term matrix of a fitted BM25, stored column by column (CSC).
+
+    Column t lists the documents containing term t with their whole BM25
+    contribution idf * tf * (k1 + 1) / (tf + norm), computed once at fit time.
+    A batch of queries scores as one np.bincount over the concatenated columns
+    of its terms; bincount adds in input order, exactly like the pure-Python
+    loop, so scores and rankings are bit-identical to it.
+    """
+
+    # Upper bound on queries x documents scored in one bincount
+    BATCH_CELLS = 1 << 22
+
+    def __init__(self, bm25):
+        self.N = bm25.N
+        self.spans = {}
+        docs, tfs, idfs = [], [], []
+        for word, postings in bm25.postings.items():
+            self.spans[word] = (len(docs), len(docs) + len(postings))
+            docs.extend(postings.keys())
+            tfs.extend(postings.values())
+            idfs.extend([bm25.idf[word]] * len(postings))
+        np = _numpy()
+        self.docs = np.array(docs, dtype=np.int64)
+        tf = np.array(tfs, dtype=np.float64)
+        norms = np.array(bm25.doc_norms, dtype=np.float64)
+        # Same operation order as BM25.score_tokens: idf * numerator / denominator
+        self.weights = np.array(idfs, dtype=np.float64) * (tf * (bm25.k1 + 1)) / (tf + norms[self.docs])
+
+    def score_batch(self, queries, max_results=None):
+        np = _numpy()
+        chunk = max(1, self.BATCH_CELLS // max(self.N, 1))
+        ranked = []
+        for start in range(0, len(queries), chunk):
+            batch = queries[start:start + chunk]
+            docs, weights = [], []
+            for row, query_tokens in enumerate(batch):
+                for token in query_tokens:
+                    span = self.spans.get(token)
+                    if span:
+                        docs.append(self.docs[span[0]:span[1]] + row * self.N)
+                        weights.append(self.weights[span[0]:span[1]])
+            if not docs:
+                ranked.extend([] for _ in batch)
+                continue
+            scores = np.bincount(np.concatenate(docs), np.concatenate(weights), minlength=len(batch) * self.N)
+            ranked.extend(self._top(row_scores, max_results) for row_scores in scores.reshape(len(batch), self.N))
+        return ranked
+
+    @staticmethod
+    def _top(scores, max_results):
+        """(idx, score) pairs ranked by (-score, idx), like BM25.score_tokens"""
+        np = _numpy()
+        candidates = np.flatnonzero(scores)
+        if max_results is not None and max_results < len(candidates):
+            if max_results <= 0:
+                return []
+            # argpartition finds the k-th best score; every candidate tied with it
+            # stays in so the lowest document index wins the tie, as in Python
+            kth = np.argpartition(-scores[candidates], max_results - 1)[max_results - 1]
+            candidates = candidates[scores[candidates] >= scores[candidates[kth]]]
+        order = np.lexsort((candidates, -scores[candidates]))[:max_results]
+        chosen = candidates[order]
+        return list(zip(chosen.tolist(), scores[chosen].tolist()))
+
+
+# ============ FUZZY MATCHING ============
+def _trigrams(word):
+    """Trigrams of ^word$ (len(word) of them); one edit changes at most three, a swap four"""
+    padded = f"^{word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    """Optimal string alignment distance (Levenshtein plus adjacent swaps), or limit + 1 past limit.
+
+    Only the diagonal band of width 2 * limit + 1 is computed; cells outside it exceed limit.
+    """
+    over = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return over
+    before, previous = None, [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            cb = b[j - 1]
+            cost = previous[j - 1] + (ca != cb)
+            if previous[j] < cost:
+                cost = previous[j] + 1
+            if current[j - 1] < cost:
+                cost = current[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and before[j - 2] < cost:
+                cost = before[j - 2] + 1
+            current[j] = cost
+        if min(current[low - 1:high + 1]) > limit:
+            return over
+        before, previous = previous, current
+    return min(previous[-1], over)
+
+
+class _FuzzyIndex:
+    """Trigram and prefix lookup over one index's vocabulary, for typo-tolerant queries.
+
+    nearest() gathers at most FUZZY_MAX_CANDIDATES terms (prefix completions,
+    then the terms sharing the most trigrams) and keeps the ones at the
+    smallest edit distance, so its cost is bounded whatever the vocabulary.
+    """
+
+    def __init__(self, postings):
+        self.terms = sorted(postings)
+        self.doc_freqs = {term: len(docs) for term, docs in postings.items()}
+        self.grams = defaultdict(list)
+        for term in self.terms:
+            for gram in _trigrams(term):
+                self.grams[gram].append(term)
+        self.nearest = lru_cache(maxsize=TOKEN_CACHE_SIZE)(self._nearest)
+
+    def _nearest(self, token):
+        """Up to FUZZY_MAX_EXPANSIONS closest terms (a prefix completion counts as one edit)"""
+        if len(token) < FUZZY_MIN_LEN:
+            return []
+        budget = min(FUZZY_MAX_EDITS, 1 if len(token) < 6 else 2)
+        distances = {}
+        start = bisect_left(self.terms, token)
+        for term in self.terms[start:start + FUZZY_MAX_CANDIDATES]:
+            if not term.startswith(token):
+                break
+            distances[term] = 1
+
+        shared = Counter(chain.from_iterable(self.grams.get(gram, ()) for gram in _trigrams(token)))
+        # A term within the budget shares all but 4 * budget of the token's trigrams
+        needed = len(token) - 4 * budget
+        candidates = [term for term, count in shared.items()
+                      if count >= needed and abs(len(term) - len(token)) <= budget and term not in distances]
+        for term in heapq.nsmallest(FUZZY_MAX_CANDIDATES - len(distances), candidates, key=lambda term: (-shared[term], term)):
+            distance = _edit_distance(token, term, budget)
+            if distance <= budget:
+                distances[term] = distance
+
+        if not distances:
+            return []
+        best = min(distances.values())
+        closest = sorted((term for term, distance in distances.items() if distance == best), key=lambda term: (-self.doc_freqs[term], term))
+        return closest[:FUZZY_MAX_EXPANSIONS]
+
+
+class _FuzzyStats:
+    """How often scored queries needed vocabulary expansion (see BM25.expand_tokens)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def record(self, expansions):
+        with self._lock:
+            self.queries += 1
+            if expansions:
+                self.unmatched_tokens += len(expansions)
+                expanded = [terms for terms in expansions.values() if terms]
+                self.expanded_queries += bool(expanded)
+                self.expanded_tokens += len(expanded)
+                self.added_terms += sum(len(terms) for terms in expanded)
+
+    def clear(self):
+        with self._lock:
+            self.queries = 0
+            self.expanded_queries = 0
+            self.unmatched_tokens = 0
+            self.expanded_tokens = 0
+            self.added_terms = 0
+
+    def info(self):
+        with self._lock:
+            return {
+                "queries": self.queries,
+                "expanded_queries": self.expanded_queries,
+                "unmatched_tokens": self.unmatched_tokens,
+                "expanded_tokens": self.expanded_tokens,
+                "added_terms": self.added_terms
+            }
+
+
+_FUZZY_STATS = _FuzzyStats()
+
+
+def fuzzy_info():
+    """Expansion counters over the queries scored so far (cached results are not rescored)"""
+    return _FUZZY_STATS.info()
+
+
+# ============ ROW STORE ============
+class ColumnRows:
+    """Read-only sequence of CSV rows stored column by column, the in-memory twin of SnapshotRows.
+
+    Each column keeps its distinct values once (Severity, Platform, Category
+    repeat a handful of strings across every row) and an array of small codes
+    into them, instead of one dict per row repeating every column name.
+    Indexing decodes just that row into a fresh dict, exactly as
+    csv.DictReader would have produced it; column() reads one field of
+    every row without building any dicts.
+    """
+
+    def __init__(self, columns, values, codes, rest=None):
+        self.columns = columns
+        self._values = values
+        self._codes = codes
+        self._rest = rest or {}
+        self._n = len(codes[0]) if codes else 0
+
+    @classmethod
+    def read(cls, f):
+        """Parse an open CSV file like csv.DictReader: blank lines skipped, short rows padded
+        with None, cells past the header kept per row under the None key"""
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        width = len(columns)
+        rows = [row for row in reader if row]
+        rest = {}
+        for idx, row in enumerate(rows):
+            if len(row) > width:
+                rest[idx] = row[width:]
+            elif len(row) < width:
+                row.extend([None] * (width - len(row)))
+        values, codes = [], []
+        for cells in (list(zip(*rows))[:width] if rows else [()] * width):
+            # Equal strings share one object and one code
+            distinct = {}
+            column = [distinct.setdefault(value, len(distinct)) for value in cells]
+            values.append(list(distinct))
+            codes.append(array("B" if len(distinct) <= 0xFF else "H" if len(distinct) <= 0xFFFF else "I", column))
+        return cls(columns, values, codes, rest)
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._n))]
+        if idx < 0:
+            idx += self._n
+        if not 0 <= idx < self._n:
+            raise IndexError("row index out of range")
+        row = {col: values[codes[idx]] for col, values, codes in zip(self.columns, self._values, self._codes)}
+        if idx in self._rest:
+            row[None] = list(self._rest[idx])
+        return row
+
+    def __iter__(self):
+        for idx in range(self._n):
+            yield self[idx]
+
+    def column(self, col):
+        """All values of one column, in row order ("" for unknown columns, like row.get(col, ""))"""
+        if col not in self.columns:
+            return [""] * self._n
+        pos = len(self.columns) - 1 - self.columns[::-1].index(col)
+        values = self._values[pos]
+        return [values[code] for code in self._codes[pos]]
+
+
+# ============ INDEX PERSISTENCE ============
 def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
+    """Load CSV rows: lazily from the compiled snapshot when it is current, else into a ColumnRows"""
+    rows = load_table(DATA_DIR / INDEX_DIRNAME / SNAPSHOT_FILE, DATA_DIR, filepath)
+    if rows is not None:
+        return rows
     with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+        return ColumnRows.read(f)
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+def _column(rows, col):
+    """One column of every row; snapshot and columnar rows read it without materializing dicts"""
+    if hasattr(rows, "column"):
+        return rows.column(col)
+    return [row.get(col, "") for row in rows]
+
+
+def _index_path(filepath):
+    """Location of the prebuilt index for a CSV (stacks/react.csv -> .index/stacks__react.json)"""
+    filepath = Path(filepath)
+    try:
+        parts = filepath.with_suffix("").relative_to(DATA_DIR).parts
+    except ValueError:
+        parts = (filepath.stem,)
+    return DATA_DIR / INDEX_DIRNAME / ("__".join(parts) + ".json")
+
+
+def _file_fingerprint(filepath):
+    """Cheap change detector: mtime + size"""
+    stat = os.stat(filepath)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _file_hash(filepath):
+    """Content hash, used when the mtime changed but the content may not have"""
+    # Imported here, like difflib: only a touched CSV needs it, not every search process
+    import hashlib
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    """Atomically write JSON (write-then-rename); a read-only data dir just skips caching"""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # dumps() runs the C encoder; dump() to a file streams through the pure-Python one
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _build_index(filepath, search_cols, tokenizer=DEFAULT_TOKENIZER, fields=None):
+    """Tokenize the CSV and fit a fresh BM25 index (BM25F over search_cols when fields is given).
+
+    Each cell is tokenized on its own (words never span cells), so the
+    tokenizer's memo serves every repeated cell value from cache.
+    """
+    data = _load_rows(filepath)
+    columns = [_column(data, col) for col in search_cols]
+    tokenize = TOKENIZERS[tokenizer]
+    if fields is not None:
+        bm25 = BM25F(tokenizer=tokenizer, field_weights={col: w for col, w, _ in fields}, field_b={col: b for col, _, b in fields},
+                     phrases=PHRASE_SHINGLES)
+        bm25.fit_fields(search_cols, [[tokenize(value) for value in values] for values in zip(*columns)])
+        return bm25
+    cells = [[tokenize(value) for value in values] for values in zip(*columns)]
+    corpus = [[token for tokens in doc for token in tokens] for doc in cells]
+    # Phrases never span cells
+    phrases = [[phrase for tokens in doc for phrase in _shingles(tokens)] for doc in cells] if PHRASE_SHINGLES else None
+    bm25 = BM25(tokenizer=tokenizer, phrases=PHRASE_SHINGLES)
+    bm25.fit_tokens(corpus, phrases)
+    return bm25
+
+
+def _row_hashes(rows, search_cols):
+    """Digest of each row's indexed cells; rows that keep theirs keep their postings on an update"""
+    import hashlib
+    columns = [_column(rows, col) for col in search_cols]
+    return [hashlib.blake2b("\x1f".join(map(str, values)).encode("utf-8"), digest_size=8).hexdigest()
+            for values in zip(*columns)]
+
+
+def _row_changes(old_hashes, new_hashes):
+    """Changed rows as (old_start, old_end, new_start, new_end) spans, or None when too many changed.
+
+    The common head and tail are skipped, and only the rows between them are
+    aligned, so a few edited, inserted or deleted rows give a few short spans.
+    Past INCREMENTAL_MAX_CHANGED of the rows, rebuilding is about as cheap.
+    """
+    # Imported here: only an edited CSV needs it, not every search process
+    import difflib
+    head = 0
+    limit = min(len(old_hashes), len(new_hashes))
+    while head < limit and old_hashes[head] == new_hashes[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and old_hashes[-1 - tail] == new_hashes[-1 - tail]:
+        tail += 1
+    matcher = difflib.SequenceMatcher(None, old_hashes[head:len(old_hashes) - tail], new_hashes[head:len(new_hashes) - tail], autojunk=False)
+    spans = [(head + i1, head + i2, head + j1, head + j2) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != "equal"]
+    if sum(max(i2 - i1, j2 - j1) for i1, i2, j1, j2 in spans) > INCREMENTAL_MAX_CHANGED * len(new_hashes):
+        return None
+    return spans
+
+
+def _patch_index(bm25, spans, rows, search_cols, tokenizer=DEFAULT_TOKENIZER):
+    """Copy of bm25 updated to rows, re-tokenizing only the rows in spans (see _row_changes)"""
+    import copy
+    if not spans:
+        return bm25
+    tokenize = TOKENIZERS[tokenizer]
+
+    def cells_of(idx):
+        row = rows[idx]
+        return [tokenize(row.get(col, "")) for col in search_cols]
+
+    patched = copy.copy(bm25)
+    patched.update([(i1, i2, [cells_of(j) for j in range(j1, j2)]) for i1, i2, j1, j2 in spans], cells_of)
+    return patched
+
+
+def _index_from_dict(data, fields=None, fold=True):
+    if fields is not None:
+        return BM25F.from_dict(data, {col: w for col, w, _ in fields}, {col: b for col, _, b in fields}, fold)
+    return BM25.from_dict(data)
+
+
+def _load_index(filepath, search_cols, tokenizer=DEFAULT_TOKENIZER, fields=None, previous=None):
+    """Return a fitted BM25 for filepath, reusing the on-disk index while the CSV is unchanged.
+
+    Field weights and b are not part of the stored index, so tuning them
+    never forces a rebuild. After an edit, the index of the old CSV is
+    patched for the changed rows (see _row_changes): previous, the
+    (bm25, rows) pair still in memory, when given, else the stored index.
+    """
+    index_path = _index_path(filepath)
+    fingerprint = _file_fingerprint(filepath)
+    # A warm index is patched in any case, so the stored one is not worth reading
+    cached = _read_json(index_path) if previous is None else None
+    digest = None
+    stale = None
+
+    model = "bm25" if fields is None else "bm25f"
+    if (cached and cached.get("version") == INDEX_VERSION and cached.get("search_cols") == search_cols
+            and cached["bm25"].get("tokenizer") == tokenizer and cached["bm25"].get("model", "bm25") == model
+            and cached["bm25"].get("phrases", False) == PHRASE_SHINGLES and cached["bm25"].get("phrase_min_df") == PHRASE_MIN_DF):
+        source = cached["source"]
+        if source["mtime_ns"] == fingerprint["mtime_ns"] and source["size"] == fingerprint["size"]:
+            return _index_from_dict(cached["bm25"], fields)
+        # Touched but possibly unchanged: compare content before rebuilding
+        digest = _file_hash(filepath)
+        if source["sha256"] == digest:
+            source.update(fingerprint)
+            _write_json(index_path, cached)
+            return _index_from_dict(cached["bm25"], fields)
+        stale = cached
+
+    rows = _load_rows(filepath)
+    row_hashes = _row_hashes(rows, search_cols)
+    if previous is not None:
+        base, base_hashes = previous[0], _row_hashes(previous[1], search_cols)
+    else:
+        base, base_hashes = None, stale and stale.get("row_hashes")
+    spans = _row_changes(base_hashes, row_hashes) if base_hashes else None
+    if spans is None:
+        bm25 = _build_index(filepath, search_cols, tokenizer, fields)
+    else:
+        if base is None:
+            # Folded here only when nothing is patched: update() refolds a patched index itself
+            base = _index_from_dict(stale["bm25"], fields, fold=not spans)
+        bm25 = _patch_index(base, spans, rows, search_cols, tokenizer)
+    _write_json(index_path, {
+        "version": INDEX_VERSION,
+        "search_cols": search_cols,
+        "source": dict(fingerprint, sha256=digest or _file_hash(filepath)),
+        "row_hashes": row_hashes,
+        "bm25": bm25.to_dict()
+    })
+    return bm25
+
+
+# ============ WARM CACHE ============
+# Loaded rows and indexes stay in memory (e.g. in the search daemon) until their CSV changes
+_ROWS_CACHE = {}
+_CORPUS_CACHE = {}
+_ROUTER_CACHE = {}
+_CACHE_LOCK = threading.RLock()
+
+
+def _load_rows(filepath):
+    """Load CSV rows, reusing the in-memory copy while the file is unchanged"""
+    key = str(filepath)
+    fingerprint = _file_fingerprint(filepath)
+    cached = _ROWS_CACHE.get(key)
+    if cached and cached[0] == fingerprint:
+        return cached[1]
+    with _CACHE_LOCK:
+        # Another thread may have loaded it while we waited
+        cached = _ROWS_CACHE.get(key)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        rows = _load_csv(filepath)
+        _ROWS_CACHE[key] = (fingerprint, rows)
+        return rows
+
 
-    data = _load_csv(filepath)
+def _corpus_key(filepath, config):
+    return (str(filepath), tuple(config["search_cols"]), _tokenizer_name(config), _field_spec(config))
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+def _load_corpus(filepath, config):
+    """Return (bm25, rows) for a CSV_CONFIG-style entry, kept warm in memory while the file is unchanged"""
+    search_cols, tokenizer, fields = config["search_cols"], _tokenizer_name(config), _field_spec(config)
+    key = _corpus_key(filepath, config)
+    fingerprint = _file_fingerprint(filepath)
+    cached = _CORPUS_CACHE.get(key)
+    if cached and cached[0] == fingerprint:
+        return cached[1], cached[2]
+    with _CACHE_LOCK:
+        cached = _CORPUS_CACHE.get(key)
+        if cached and cached[0] == fingerprint:
+            return cached[1], cached[2]
+        # An index already warm for an older version of the CSV is patched, not reloaded
+        bm25 = _load_index(filepath, search_cols, tokenizer, fields, cached[1:] if cached else None)
+        rows = _load_rows(filepath)
+        _CORPUS_CACHE[key] = (fingerprint, bm25, rows)
+        return bm25, rows
 
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
 
-    return results
+def _corpus_sources():
+    """(filepath, config) of every domain and stack CSV present"""
+    sources = [(DATA_DIR / config["file"], config) for config in CSV_CONFIG.values()]
+    sources += [(DATA_DIR / config["file"], _STACK_COLS) for config in STACK_CONFIG.values()]
+    return [(filepath, config) for filepath, config in sources if filepath.exists()]
+
+
+def build_indexes():
+    """Build (or refresh) the index of every domain and stack CSV, and the audit index, and keep them warm"""
+    built = []
+    for filepath, config in _corpus_sources():
+        _load_corpus(filepath, config)
+        built.append(filepath.relative_to(DATA_DIR).as_posix())
+    _load_router()
+    _load_audit_index()
+    return built
+
+
+def compile_snapshot():
+    """Compile every CSV into the binary snapshot that _load_csv memory-maps"""
+    names = build_snapshot(DATA_DIR, DATA_DIR / INDEX_DIRNAME / SNAPSHOT_FILE)
+    clear_caches()
+    return names
+
+
+def clear_caches():
+    """Drop every in-memory row, index and result cache (on-disk indexes are kept)"""
+    with _CACHE_LOCK:
+        _ROWS_CACHE.clear()
+        _CORPUS_CACHE.clear()
+        _ROUTER_CACHE.clear()
+        _AUDIT_CACHE.clear()
+    _RESULT_CACHE.clear()
+    _FUZZY_STATS.clear()
+
+
+# ============ WATCH MODE ============
+# CSVs are polled (one os.stat each), which needs no file-event library
+WATCH_INTERVAL = 1.0
+
+
+def refresh_indexes():
+    """Bring every warm index up to date with its CSV; returns the CSVs that changed.
+
+    Edited CSVs are patched for their changed rows (see _load_index), so the
+    next search finds its index current instead of updating it itself.
+    """
+    refreshed = []
+    for filepath, config in _corpus_sources():
+        cached = _CORPUS_CACHE.get(_corpus_key(filepath, config))
+        try:
+            if cached is not None and cached[0] == _file_fingerprint(filepath):
+                continue
+            _load_corpus(filepath, config)
+        except OSError:
+            # Removed or replaced mid-poll; the next poll sees it settled
+            continue
+        refreshed.append(filepath.relative_to(DATA_DIR).as_posix())
+    if refreshed:
+        _load_router()
+    return refreshed
+
+
+def watch(interval=WATCH_INTERVAL, stop=None, on_change=None):
+    """Keep every index current: refresh_indexes() each interval seconds until stop (an Event) is set.
+
+    on_change, if given, is called with the list of CSVs refreshed by each poll that found changes.
+    """
+    stop = stop or threading.Event()
+    build_indexes()
+    while not stop.wait(interval):
+        refreshed = refresh_indexes()
+        if refreshed and on_change is not None:
+            on_change(refreshed)
+
+
+# ============ RESULT CACHE ============
+class _ResultCache:
+    """Bounded LRU of ranked results with hit/miss counters"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+_RESULT_CACHE = _ResultCache(RESULT_CACHE_SIZE)
+
+
+def search_cache_info():
+    """Hit/miss statistics of the search result cache"""
+    return _RESULT_CACHE.info()
+
+
+def invalidate_search_cache():
+    """Forget all cached search results, e.g. right after editing a CSV in place.
+
+    Entries are keyed on the CSV's mtime and size, so edits are normally picked
+    up on their own; this covers edits that keep both unchanged.
+    """
+    _RESULT_CACHE.clear()
+
+
+# ============ DOMAIN ROUTER ============
+# Intent keywords per domain. Bare "page" and "section" are left out: every
+# page type has them, so they say nothing about the domain
+DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
+    "landing": ["landing", "cta", "conversion", "hero", "testimonial", "pricing"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "flat", "aurora", "prompt", "css", "implementation", "variable", "checklist"],
+    "ux": ["ux", "usability", "touch", "scroll", "keyboard", "navigation", "mobile", "gesture"],
+    "typography": ["font", "typography", "heading", "serif", "sans", "pairing", "typeface", "google fonts"],
+    "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
+    "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
+    "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"],
+    "animation": ["animation", "transition", "hover", "micro-interaction", "loading", "skeleton", "fade", "slide", "bounce", "easing", "duration", "keyframe"],
+    "component": ["button", "modal", "dialog", "card", "table", "toast", "dropdown", "tooltip", "accordion", "carousel", "search bar", "sidebar", "navbar", "tab", "pagination", "badge", "avatar"],
+    "responsive": ["responsive", "breakpoint", "mobile-first", "container query", "fluid", "clamp", "srcset", "viewport", "media query", "adaptive"],
+    "darkmode": ["dark mode", "dark theme", "light mode", "theme toggle", "prefers-color-scheme", "oled", "surface color", "dark background"],
+    "tokens": ["token", "spacing", "shadow", "elevation", "border-radius", "z-index", "design system", "scale", "css variable", "custom property"],
+    "a11y": ["accessibility", "wcag", "aria", "screen reader", "contrast", "focus", "keyboard", "a11y", "inclusive", "assistive"],
+    "page-standards": ["page type", "required sections", "mandatory", "page structure", "what sections", "must have"],
+    "navigation": ["navbar", "nav", "breadcrumb", "sidebar", "footer", "menu", "mega menu", "bottom nav", "hamburger", "skip to content"],
+    "seo": ["seo", "meta", "title tag", "schema", "open graph", "canonical", "indexing", "noindex", "sitemap", "structured data"],
+    "layout": ["max-width", "container", "z-index", "spacing", "grid", "full-bleed", "sticky footer", "padding", "section spacing"],
+    "auth": ["auth", "login", "sign in", "sign up", "register", "forgot password", "oauth", "2fa", "verification", "authentication"],
+    "empty-states": ["empty state", "loading", "skeleton", "spinner", "error page", "404", "500", "offline", "no results", "onboarding"],
+    "audit-rules": ["audit", "check", "violation", "compliance", "missing section", "validate"]
+}
+# Tokenizer for the vocabulary signal, and where the fitted router is cached
+ROUTER_TOKENIZER = "stem"
+ROUTER_FILE = "router.json"
+
+
+_ROUTE_WORD_RE = re.compile(r'\w[\w.\-]*')
+
+
+def _route_words(text):
+    """Lowercase words keeping inner . and - (next.js, e-commerce, z-index)"""
+    return [word.rstrip('.-') for word in _ROUTE_WORD_RE.findall(text.lower())]
+
+
+class DomainRouter:
+    """Ranks domains for a query from two precomputed signals.
+
+    Keywords: DOMAIN_KEYWORDS as a phrase table matched on whole words,
+    longest phrase first, plurals allowed (charts -> chart, but "ui" no longer
+    matches inside "build"). A match adds its word count, split evenly
+    between the domains that list it.
+    Vocabulary: a centroid per domain fitted on the CSV rows, where a term
+    weighs (rows containing it / rows) * log(domains / domains containing it).
+    It breaks keyword ties ("focus": a11y or web) and routes queries that no
+    keyword covers. Confidence is a domain's share of the summed scores.
+
+    The centroids are kept packed, one "domain:weight domain:weight" string per
+    term: loading them is a flat string map for the JSON parser, and a term's
+    weights are only unpacked when a query uses it.
+    """
+
+    def __init__(self, term_weights, keywords=None):
+        self.term_weights = term_weights
+        self._unpacked = {}
+        owners = {}
+        for domain, words in (DOMAIN_KEYWORDS if keywords is None else keywords).items():
+            for keyword in words:
+                owners.setdefault(keyword, []).append(domain)
+        self.owners = owners
+        self.max_words = max((len(keyword.split()) for keyword in owners), default=1)
+        # Keywords that are not words ("#") are still matched as substrings
+        self.symbols = [keyword for keyword in owners if not _route_words(keyword) == keyword.split()]
+        self.order = {domain: i for i, domain in enumerate(CSV_CONFIG)}
+
+    @classmethod
+    def fit(cls, vocabularies, keywords=None):
+        """Fit the vocabulary centroids from domain -> one token set per row"""
+        doc_freqs = {domain: defaultdict(int) for domain in vocabularies}
+        domain_freqs = defaultdict(int)
+        for domain, rows in vocabularies.items():
+            for tokens in rows:
+                for token in tokens:
+                    doc_freqs[domain][token] += 1
+            for token in doc_freqs[domain]:
+                domain_freqs[token] += 1
+
+        term_weights = {}
+        n_domains = len(vocabularies)
+        for domain, freqs in doc_freqs.items():
+            n_rows = len(vocabularies[domain])
+            for token, freq in freqs.items():
+                # A term every domain uses carries no routing signal
+                weight = round(freq / n_rows * log(n_domains / domain_freqs[token]), 4)
+                if weight > 0:
+                    term_weights.setdefault(token, []).append(f"{domain}:{weight!r}")
+        return cls({token: " ".join(weights) for token, weights in term_weights.items()}, keywords)
+
+    def weights(self, token):
+        """(domain, weight) pairs of a term, [] for a term no domain uses"""
+        weights = self._unpacked.get(token)
+        if weights is None:
+            packed = self.term_weights.get(token)
+            weights = [(domain, float(weight)) for domain, _, weight in
+                       (pair.rpartition(":") for pair in packed.split())] if packed else []
+            self._unpacked[token] = weights
+        return weights
+
+    def route(self, query, top_n=None):
+        """(domain, confidence) pairs, best first; ties keep CSV_CONFIG order"""
+        scores = {}
+        for keyword in self._keywords(query):
+            owners = self.owners[keyword]
+            for domain in owners:
+                scores[domain] = scores.get(domain, 0) + len(keyword.split()) / len(owners)
+        for token in TOKENIZERS[ROUTER_TOKENIZER](query):
+            for domain, weight in self.weights(token):
+                scores[domain] = scores.get(domain, 0) + weight
+
+        total = sum(scores.values())
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.order.get(item[0], len(self.order))))
+        return [(domain, round(score / total, 4)) for domain, score in ranked[:top_n]]
+
+    def _keywords(self, query):
+        """Keywords in the query: longest phrase at each word, non-overlapping"""
+        words = _route_words(query)
+        found = [keyword for keyword in self.symbols if keyword in query]
+        i = 0
+        while i < len(words):
+            for n in range(min(self.max_words, len(words) - i), 0, -1):
+                keyword = self._keyword(" ".join(words[i:i + n]))
+                if keyword:
+                    found.append(keyword)
+                    i += n
+                    break
+            else:
+                i += 1
+        return found
+
+    def _keyword(self, phrase):
+        if phrase in self.owners:
+            return phrase
+        for suffix in ("s", "es"):
+            if phrase.endswith(suffix) and phrase[:-len(suffix)] in self.owners:
+                return phrase[:-len(suffix)]
+        return None
+
+    def knows(self, token):
+        """Whether the token is a stopword or in any domain's vocabulary (as-is or stemmed)"""
+        return token in STOPWORDS or token in self.term_weights or light_stem(token) in self.term_weights
+
+    def to_dict(self):
+        return {"terms": self.term_weights}
+
+    @classmethod
+    def from_dict(cls, data, keywords=None):
+        return cls(data["terms"], keywords)
+
+
+def _router_path():
+    return DATA_DIR / INDEX_DIRNAME / ROUTER_FILE
+
+
+def _read_router(sources, search_cols):
+    """Stored router when it was fitted on these CSVs (content-compared when only touched), else None"""
+    path = _router_path()
+    stored = _read_json(path)
+    if (not stored or stored.get("version") != INDEX_VERSION or stored.get("tokenizer") != ROUTER_TOKENIZER
+            or stored.get("search_cols") != search_cols or set(stored.get("sources", ())) != set(sources)):
+        return None
+    touched = False
+    for name, fingerprint in sources.items():
+        source = stored["sources"][name]
+        if source["mtime_ns"] == fingerprint["mtime_ns"] and source["size"] == fingerprint["size"]:
+            continue
+        if source["sha256"] != _file_hash(DATA_DIR / name):
+            return None
+        source.update(fingerprint)
+        touched = True
+    if touched:
+        _write_json(path, stored)
+    return DomainRouter.from_dict(stored["router"])
+
+
+def _build_router(sources, search_cols):
+    tokenize = TOKENIZERS[ROUTER_TOKENIZER]
+    vocabularies = {}
+    for domain, config in CSV_CONFIG.items():
+        if config["file"] in sources:
+            rows = _load_rows(DATA_DIR / config["file"])
+            columns = [_column(rows, col) for col in config["search_cols"]]
+            vocabularies[domain] = [{token for value in values for token in tokenize(value)} for values in zip(*columns)]
+    router = DomainRouter.fit(vocabularies)
+    _write_json(_router_path(), {
+        "version": INDEX_VERSION,
+        "tokenizer": ROUTER_TOKENIZER,
+        "search_cols": search_cols,
+        "sources": {name: dict(fingerprint, sha256=_file_hash(DATA_DIR / name)) for name, fingerprint in sources.items()},
+        "router": router.to_dict()
+    })
+    return router
+
+
+def _router_signature(root):
+    """Version of the CSVs the router is fitted on: (domain, file, search_cols, mtime_ns, size) each"""
+    # Checked on every routed query, so skip pathlib: one os.stat per CSV, compared as a tuple
+    signature = []
+    for domain, config in CSV_CONFIG.items():
+        try:
+            stat = os.stat(os.path.join(root, config["file"]))
+        except OSError:
+            continue
+        signature.append((domain, config["file"], tuple(config["search_cols"]), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _load_router():
+    """DomainRouter over every domain CSV: warm in memory, persisted next to the indexes"""
+    root = os.fspath(DATA_DIR)
+    signature = _router_signature(root)
+    cached = _ROUTER_CACHE.get(root)
+    if cached and cached[0] == signature:
+        return cached[1]
+    with _CACHE_LOCK:
+        cached = _ROUTER_CACHE.get(root)
+        if cached and cached[0] == signature:
+            return cached[1]
+        sources = {name: {"mtime_ns": mtime_ns, "size": size} for _, name, _, mtime_ns, size in signature}
+        search_cols = {domain: config["search_cols"] for domain, config in CSV_CONFIG.items()}
+        router = _read_router(sources, search_cols) or _build_router(sources, search_cols)
+        _ROUTER_CACHE[root] = (signature, router)
+        return router
+
+
+def route_domains(query, top_n=None):
+    """Domains ranked for a query as (domain, confidence) pairs; confidences sum to 1"""
+    return _load_router().route(query, top_n)
+
+
+# ============ SEARCH FUNCTIONS ============
+def _project_row(row, output_cols):
+    """Keep only the configured output columns of a row"""
+    return {col: row.get(col, "") for col in output_cols if col in row}
+
+
+def _expand_query(bm25, query_tokens):
+    """bm25.expand_tokens() for likely typos: words another domain knows are only missing here"""
+    if all(token in bm25.postings for token in query_tokens):
+        return list(query_tokens), {}
+    return bm25.expand_tokens(query_tokens, _load_router().knows)
+
+
+def _rank_csv(filepath, config, query, max_results):
+    """Top (score, result) pairs with score > 0 for a query.
+
+    Results are cached per (file version, normalized query tokens, limit), and
+    those of a query with words missing from the index also per router signature:
+    _expand_query() expands them against the router, fitted on every domain's CSV.
+    Callers always get fresh result dicts so cached entries cannot be mutated.
+    """
+    tokenizer, output_cols = _tokenizer_name(config), config["output_cols"]
+    query_tokens = TOKENIZERS[tokenizer](query)
+    fingerprint = _file_fingerprint(filepath)
+    key = (str(filepath), fingerprint["mtime_ns"], fingerprint["size"], tuple(config["search_cols"]), tuple(output_cols),
+           tokenizer, _field_spec(config), tuple(query_tokens), max_results)
+    cached = _RESULT_CACHE.get(key)
+    if cached is not None and (cached[0] is None or cached[0] == _router_signature(os.fspath(DATA_DIR))):
+        ranked = cached[1]
+    else:
+        bm25, data = _load_corpus(filepath, config)
+        vocabulary = None
+        if not all(token in bm25.postings for token in query_tokens):
+            vocabulary = _router_signature(os.fspath(DATA_DIR))
+        query_tokens, expansions = _expand_query(bm25, query_tokens)
+        _FUZZY_STATS.record(expansions)
+        scored = bm25.score_tokens(bm25.query_terms(query_tokens), max_results)
+        ranked = [(score, _project_row(data[idx], output_cols)) for idx, score in scored if score > 0]
+        _RESULT_CACHE.put(key, (vocabulary, ranked))
+    return [(score, dict(result)) for score, result in ranked]
+
+
+def _search_csv(filepath, config, query, max_results):
+    """Core search function using BM25"""
+    if not filepath.exists():
+        return []
+
+    # BM25 search against the prebuilt index
+    return [result for _, result in _rank_csv(filepath, config, query, max_results)]
 
 
 def detect_domain(query):
-    """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "flat", "aurora", "prompt", "css", "implementation", "variable", "checklist"],
-        "ux": ["ux", "usability", "touch", "scroll", "keyboard", "navigation", "mobile", "gesture"],
-        "typography": ["font", "typography", "heading", "serif", "sans", "pairing", "typeface", "google fonts"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"],
-        "animation": ["animation", "transition", "hover", "micro-interaction", "loading", "skeleton", "fade", "slide", "bounce", "easing", "duration", "keyframe"],
-        "component": ["button", "modal", "dialog", "card", "table", "toast", "dropdown", "tooltip", "accordion", "carousel", "search bar", "sidebar", "navbar", "tab", "pagination", "badge", "avatar"],
-        "responsive": ["responsive", "breakpoint", "mobile-first", "container query", "fluid", "clamp", "srcset", "viewport", "media query", "adaptive"],
-        "darkmode": ["dark mode", "dark theme", "light mode", "theme toggle", "prefers-color-scheme", "oled", "surface color", "dark background"],
-        "tokens": ["token", "spacing", "shadow", "elevation", "border-radius", "z-index", "design system", "scale", "css variable", "custom property"],
-        "a11y": ["accessibility", "wcag", "aria", "screen reader", "contrast", "focus", "keyboard", "a11y", "inclusive", "assistive"],
-        "page-standards": ["page type", "required sections", "mandatory", "page structure", "what sections", "must have"],
-        "navigation": ["navbar", "nav", "breadcrumb", "sidebar", "footer", "menu", "mega menu", "bottom nav", "hamburger", "skip to content"],
-        "seo": ["seo", "meta", "title tag", "schema", "open graph", "canonical", "indexing", "noindex", "sitemap", "structured data"],
-        "layout": ["max-width", "container", "z-index", "spacing", "grid", "full-bleed", "sticky footer", "padding", "section spacing"],
-        "auth": ["auth", "login", "sign in", "sign up", "register", "forgot password", "oauth", "2fa", "verification", "authentication"],
-        "empty-states": ["empty state", "loading", "skeleton", "spinner", "error page", "404", "500", "offline", "no results", "onboarding"],
-        "audit-rules": ["audit", "check", "violation", "compliance", "missing section", "validate"]
-    }
+    """Auto-detect the most relevant domain from query (style when nothing matches)"""
+    ranked = route_domains(query, 1)
+    return ranked[0][0] if ranked else "style"
+
 
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "style"
+def _domain_result(domain, config, query, results):
+    return {
+        "domain": domain,
+        "query": query,
+        "file": config["file"],
+        "count": len(results),
+        "results": results
+    }
 
 
 def search(query, domain=None, max_results=MAX_RESULTS):
@@ -298,15 +1648,9 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"File not found: {filepath}", "domain": domain}
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    results = _search_csv(filepath, config, query, max_results)
 
-    return {
-        "domain": domain,
-        "query": query,
-        "file": config["file"],
-        "count": len(results),
-        "results": results
-    }
+    return _domain_result(domain, config, query, results)
 
 
 def search_stack(query, stack, max_results=MAX_RESULTS):
@@ -319,7 +1663,7 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     if not filepath.exists():
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
+    results = _search_csv(filepath, _STACK_COLS, query, max_results)
 
     return {
         "domain": "stack",
@@ -331,64 +1675,267 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
     }
 
 
-# ============ AUDIT FUNCTIONS ============
-def audit_page(page_type):
-    """Load audit rules and standards for a specific page type, return checklist."""
-    rules_file = DATA_DIR / "page-audit-rules.csv"
-    standards_file = DATA_DIR / "page-standards.csv"
-    seo_file = DATA_DIR / "seo-per-page.csv"
+# ============ FEDERATED SEARCH ============
+def _corpora(domains=None, stacks=None):
+    """(label, filepath, config) for each selected domain, then each stack"""
+    for domain in (CSV_CONFIG if domains is None else domains):
+        config = CSV_CONFIG[domain]
+        label = {"domain": domain, "file": config["file"]}
+        yield label, DATA_DIR / config["file"], config
+    for stack in (STACK_CONFIG if stacks is None else stacks):
+        config = STACK_CONFIG[stack]
+        label = {"domain": "stack", "stack": stack, "file": config["file"]}
+        yield label, DATA_DIR / config["file"], _STACK_COLS
 
-    result = {"page_type": page_type, "standard": None, "seo": None, "rules": [], "total_checks": 0}
 
-    # Map common page type aliases (covers short forms, long forms, and CSV variations)
-    type_aliases = {
-        "landing": ["landing", "landing page"],
-        "sign up": ["sign up"],
-        "sign in": ["sign in"],
-        "dashboard": ["dashboard", "dashboard user", "dashboard admin"],
-        "pricing": ["pricing"],
-        "blog post": ["blog post"],
-        "blog list": ["blog list"],
-        "checkout": ["checkout"],
-        "pdp": ["pdp", "product detail pdp"],
-        "settings": ["settings", "settings/profile"],
-        "search": ["search results"],
-        "404": ["404", "404 error"],
-        "contact": ["contact"],
-        "about": ["about"],
+def _unknown_corpora(domains, stacks):
+    unknown = [d for d in (domains or []) if d not in CSV_CONFIG] + [s for s in (stacks or []) if s not in STACK_CONFIG]
+    if unknown:
+        return {"error": f"Unknown domain or stack: {', '.join(unknown)}"}
+    return None
+
+
+def search_all(query, max_results=MAX_RESULTS, domains=None, stacks=None):
+    """Federated search: score query against every domain and stack, merged into one ranking.
+
+    Raw BM25 scores are not comparable across corpora (each has its own IDF
+    table and average length), so every score is divided by the best score
+    the query could reach in that corpus (BM25.max_score). Each result carries
+    its domain/stack label and the normalized score in [0, 1).
+    Pass domains / stacks lists to restrict the search; [] skips that group.
+    """
+    error = _unknown_corpora(domains, stacks)
+    if error:
+        return error
+
+    merged = []
+    for order, (label, filepath, config) in enumerate(_corpora(domains, stacks)):
+        if not filepath.exists():
+            continue
+        bm25, _ = _load_corpus(filepath, config)
+        ceiling = bm25.max_score(bm25.query_terms(_expand_query(bm25, bm25.tokenize(query))[0]))
+        if ceiling <= 0:
+            continue
+        # A corpus can never contribute more than max_results rows to the merged top-k
+        for rank, (score, result) in enumerate(_rank_csv(filepath, config, query, max_results)):
+            merged.append((-score / ceiling, order, rank, label, result))
+
+    top = heapq.nsmallest(max_results, merged, key=lambda item: item[:3])
+    results = [dict(label, score=round(-neg_score, 4), result=result) for neg_score, _, _, label, result in top]
+
+    return {
+        "domain": "all",
+        "query": query,
+        "count": len(results),
+        "results": results
     }
 
-    # Resolve all matching type names for this page_type
-    page_type_lower = page_type.lower()
-    match_types = [page_type_lower]
-    for key, aliases in type_aliases.items():
-        if page_type_lower in aliases or page_type_lower == key:
-            match_types = list(set(aliases + [key]))
-            break
-
-    # Load page standard
-    if standards_file.exists():
-        standards = _load_csv(standards_file)
-        for s in standards:
-            if s.get("Page Type", "").lower() in match_types:
-                result["standard"] = s
-                break
 
-    # Load SEO requirements
-    if seo_file.exists():
-        seo_data = _load_csv(seo_file)
-        for s in seo_data:
-            if s.get("Page Type", "").lower() in match_types:
-                result["seo"] = s
-                break
+def _search_domain(domain, query, max_results):
+    config = CSV_CONFIG[domain]
+    filepath = DATA_DIR / config["file"]
+    if not filepath.exists():
+        return {"error": f"File not found: {filepath}", "domain": domain}
+    ranked = _rank_csv(filepath, config, query, max_results)
+    return _domain_result(domain, config, query, [result for _, result in ranked])
+
+
+def search_domains(query, limits, workers=1):
+    """Run one query against several domains at once.
 
-    # Load audit rules (page-specific + Global + Any)
-    if rules_file.exists():
-        all_rules = _load_csv(rules_file)
-        for rule in all_rules:
-            rule_type = rule.get("Page Type", "").lower()
-            if rule_type in match_types or rule_type in ["global", "any"]:
-                result["rules"].append(rule)
+    limits maps domain -> max_results; returns domain -> the same dict
+    search(query, domain, max_results) would. The query is tokenized once per
+    tokenizer and every domain is scored against its warm index. With
+    workers > 1 the domains are searched on a thread pool; results are still
+    keyed in limits order, so the output does not depend on which finished first.
+    """
+    error = _unknown_corpora(list(limits), None)
+    if error:
+        return error
 
+    if workers <= 1 or len(limits) <= 1:
+        return {domain: _search_domain(domain, query, max_results) for domain, max_results in limits.items()}
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(workers, len(limits))) as pool:
+        results = list(pool.map(lambda item: _search_domain(item[0], query, item[1]), limits.items()))
+    return dict(zip(limits, results))
+
+
+def search_routed(query, top_n=ROUTE_TOP_N, max_results=MAX_RESULTS, workers=None):
+    """Search the top_n domains route_domains() picks for a query, in parallel.
+
+    Each route is the search() result of one domain plus its routing
+    confidence, best route first. A query that matches no domain is routed
+    to style, like detect_domain().
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    routes = route_domains(query, top_n) or [("style", 0.0)]
+    workers = BATCH_WORKERS if workers is None else workers
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(routes)))) as pool:
+        results = list(pool.map(lambda route: search(query, route[0], max_results), routes))
+
+    return {
+        "domain": "routed",
+        "query": query,
+        "count": sum(result.get("count", 0) for result in results),
+        "routes": [dict(result, confidence=confidence) for (_, confidence), result in zip(routes, results)]
+    }
+
+
+# ============ BATCH SEARCH ============
+def _batch_error(record):
+    """Why a batch record cannot run (None when it is well-formed)"""
+    if not isinstance(record, dict) or not isinstance(record.get("query"), str) or not record["query"].strip():
+        return "Batch record must be a JSON object with a non-empty string 'query'"
+    for field in ("domain", "stack"):
+        if record.get(field) is not None and not isinstance(record[field], str):
+            return f"Batch record '{field}' must be a string"
+    max_results = record.get("max_results", MAX_RESULTS)
+    if isinstance(max_results, bool) or not isinstance(max_results, int) or max_results < 1:
+        return "Batch record 'max_results' must be a positive integer"
+    return None
+
+
+def _batch_one(record):
+    """Run one batch record: {"query", "domain" | "stack", "max_results", "id"?}.
+
+    A malformed record, or one whose search fails, yields an {"error"} result
+    for its line instead of ending the batch.
+    """
+    error = _batch_error(record)
+    try:
+        result = {"error": error} if error else _batch_search(record)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+
+    if isinstance(record, dict) and "id" in record:
+        result = dict(result, id=record["id"])
+    return result
+
+
+def _batch_search(record):
+    max_results = record.get("max_results", MAX_RESULTS)
+    if record.get("stack"):
+        return search_stack(record["query"], record["stack"], max_results)
+    if record.get("domain") and record["domain"] not in CSV_CONFIG:
+        return {"error": f"Unknown domain: {record['domain']}. Available: {', '.join(CSV_CONFIG)}"}
+    return search(record["query"], record.get("domain"), max_results)
+
+
+def search_batch(records, workers=BATCH_WORKERS):
+    """Run many searches, yielding one result per record in input order.
+
+    Every CSV is loaded and indexed once for the whole batch (warm cache), and
+    records are scored concurrently on a thread pool. Records are consumed
+    lazily with a bounded look-ahead, so results stream while input is read.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for record in records:
+            pending.append(pool.submit(_batch_one, record))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# ============ AUDIT FUNCTIONS ============
+# The three audit CSVs are folded into one page-type index (.index/audit.json), rebuilt when any changes
+AUDIT_FILES = {"standard": "page-standards.csv", "seo": "seo-per-page.csv", "rules": "page-audit-rules.csv"}
+AUDIT_INDEX_FILE = "audit.json"
+# Rules of these page types apply to every page
+AUDIT_GLOBAL_TYPES = ("global", "any")
+# Map common page type aliases (covers short forms, long forms, and CSV variations)
+PAGE_TYPE_ALIASES = {
+    "landing": ["landing", "landing page"],
+    "sign up": ["sign up"],
+    "sign in": ["sign in"],
+    "dashboard": ["dashboard", "dashboard user", "dashboard admin"],
+    "pricing": ["pricing"],
+    "blog post": ["blog post"],
+    "blog list": ["blog list"],
+    "checkout": ["checkout"],
+    "pdp": ["pdp", "product detail pdp"],
+    "settings": ["settings", "settings/profile"],
+    "search": ["search results"],
+    "404": ["404", "404 error"],
+    "contact": ["contact"],
+    "about": ["about"],
+}
+_AUDIT_CACHE = {}
+
+
+def _page_type_key(page_type):
+    """(canonical key, page types it matches) for a page type or one of its aliases"""
+    page_type = page_type.lower()
+    for key, aliases in PAGE_TYPE_ALIASES.items():
+        if page_type in aliases or page_type == key:
+            return key, set(aliases + [key])
+    return page_type, {page_type}
+
+
+def _build_audit_index(tables):
+    """Page-type index over the audit rows: every known page type or alias maps to its
+    canonical key, and each key to the standard row, SEO row and rule rows it selects"""
+    page_types = {row.get("Page Type", "").lower() for rows in tables.values() for row in rows}
+    page_types.update(PAGE_TYPE_ALIASES)
+    page_types.update(alias for aliases in PAGE_TYPE_ALIASES.values() for alias in aliases)
+    types, entries = {}, {}
+    for page_type in sorted(page_types):
+        key, match_types = _page_type_key(page_type)
+        types[page_type] = key
+        if key in entries:
+            continue
+        entry = {}
+        for name in ("standard", "seo"):
+            entry[name] = next((idx for idx, row in enumerate(tables[name]) if row.get("Page Type", "").lower() in match_types), None)
+        entry["rules"] = [idx for idx, row in enumerate(tables["rules"])
+                          if row.get("Page Type", "").lower() in match_types or row.get("Page Type", "").lower() in AUDIT_GLOBAL_TYPES]
+        entries[key] = entry
+    global_rules = [idx for idx, row in enumerate(tables["rules"]) if row.get("Page Type", "").lower() in AUDIT_GLOBAL_TYPES]
+    return {"tables": tables, "types": types, "entries": entries, "global_rules": global_rules}
+
+
+def _load_audit_index():
+    """The page-type index, kept in memory and in DATA_DIR/.index while the audit CSVs are unchanged"""
+    paths = {name: DATA_DIR / file for name, file in AUDIT_FILES.items()}
+    sources = {name: _file_fingerprint(path) if path.exists() else None for name, path in paths.items()}
+    cached = _AUDIT_CACHE.get(str(DATA_DIR))
+    if cached and cached[0] == sources:
+        return cached[1]
+    with _CACHE_LOCK:
+        cached = _AUDIT_CACHE.get(str(DATA_DIR))
+        if cached and cached[0] == sources:
+            return cached[1]
+        index_path = DATA_DIR / INDEX_DIRNAME / AUDIT_INDEX_FILE
+        stored = _read_json(index_path)
+        if stored and stored.get("version") == INDEX_VERSION and stored.get("sources") == sources:
+            index = stored["index"]
+        else:
+            # The index keeps its own copy of the rows, so they are not cached a second time
+            index = _build_audit_index({name: list(_load_csv(path)) if sources[name] else [] for name, path in paths.items()})
+            _write_json(index_path, {"version": INDEX_VERSION, "sources": sources, "index": index})
+        _AUDIT_CACHE[str(DATA_DIR)] = (sources, index)
+        return index
+
+
+def audit_page(page_type):
+    """Load audit rules and standards for a specific page type, return checklist."""
+    index = _load_audit_index()
+    tables = index["tables"]
+    key = index["types"].get(page_type.lower())
+    entry = index["entries"][key] if key is not None else {"standard": None, "seo": None, "rules": index["global_rules"]}
+
+    # Fresh copies, so callers may edit their checklist without touching the index
+    result = {"page_type": page_type, "standard": None, "seo": None, "rules": [], "total_checks": 0}
+    for name in ("standard", "seo"):
+        if entry[name] is not None:
+            result[name] = dict(tables[name][entry[name]])
+    result["rules"] = [dict(tables["rules"][idx]) for idx in entry["rules"]]
     result["total_checks"] = len(result["rules"])
     return result
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Evaluation - relevance of search(), search_stack() and detect_domain()
+against golden queries, timed and checked for ranking parity in every benchmark mode.
+
+Usage:
+    python evaluate.py                       # every mode, summary
+    python evaluate.py --mode warm --json    # one mode, JSON report
+    python evaluate.py --k 5 --golden FILE   # other cutoff / golden set
+
+Golden file (golden_queries.json): query -> expected rows, most relevant first
+    search:        {"query", "domain", "key", "expected": [key column values]}
+    search_stack:  {"query", "stack", "key", "expected": [...]}
+    detect_domain: {"query", "expected": domain}   (ranked by route_domains)
+
+Metrics, averaged per function:
+    recall@k  share of the expected rows found in the top k
+    mrr       1 / rank of the first expected row (0 when none is returned)
+    ndcg@k    graded gain: the first expected row is the most relevant
+Parity: every mode must return exactly the rows the first mode returned.
+"""
+
+import argparse
+import json
+import time
+from math import log2
+from pathlib import Path
+
+import core
+import benchmark
+
+GOLDEN_FILE = Path(__file__).parent / "golden_queries.json"
+EVAL_K = 3
+
+
+# ============ METRICS ============
+def recall_at_k(ranked, expected, k):
+    return len(set(ranked[:k]) & set(expected)) / len(expected)
+
+
+def reciprocal_rank(ranked, expected):
+    for rank, name in enumerate(ranked, 1):
+        if name in expected:
+            return 1 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked, expected, k):
+    gains = {name: len(expected) - i for i, name in enumerate(expected)}
+    dcg = sum((2 ** gains.get(name, 0) - 1) / log2(rank + 1) for rank, name in enumerate(ranked[:k], 1))
+    ideal = sum((2 ** gains[name] - 1) / log2(rank + 1) for rank, name in enumerate(expected[:k], 1))
+    return dcg / ideal
+
+
+# ============ GOLDEN QUERIES ============
+def load_golden(path=None):
+    with open(path or GOLDEN_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _unique(names):
+    """Row names in rank order, first occurrence only (scaled data repeats names)"""
+    seen = set()
+    return [n for n in names if not (n in seen or seen.add(n))]
+
+
+def _ranked(section, case, k):
+    """Ranked row names (or domains) the engine returns for one golden case"""
+    if section == "search":
+        result = core.search(case["query"], case["domain"], k)
+    elif section == "search_stack":
+        result = core.search_stack(case["query"], case["stack"], k)
+    else:
+        return [domain for domain, _ in core.route_domains(case["query"])] or [core.detect_domain(case["query"])]
+    return _unique(row.get(case["key"], "") for row in result.get("results", []))
+
+
+def evaluate(golden=None, k=EVAL_K, mode="warm"):
+    """Score every golden case under one benchmark mode; returns metrics, latency and rankings"""
+    golden = golden if golden is not None else load_golden()
+    metrics, latency, rankings, misses = {}, {}, {}, []
+    with benchmark.MODES[mode]() as before_each:
+        for section, cases in golden.items():
+            totals = {f"recall@{k}": 0.0, "mrr": 0.0, f"ndcg@{k}": 0.0}
+            samples, ranked_lists = [], []
+            for case in cases:
+                if before_each is not None:
+                    before_each()
+                start = time.perf_counter()
+                ranked = _ranked(section, case, k)
+                samples.append((time.perf_counter() - start) * 1000)
+                ranked_lists.append(ranked)
+
+                expected = case["expected"] if isinstance(case["expected"], list) else [case["expected"]]
+                totals[f"recall@{k}"] += recall_at_k(ranked, expected, k)
+                totals["mrr"] += reciprocal_rank(ranked, expected)
+                totals[f"ndcg@{k}"] += ndcg_at_k(ranked, expected, k)
+                if expected[0] not in ranked[:k]:
+                    misses.append({"function": section, "query": case["query"], "expected": expected[0], "got": ranked[:k]})
+            if cases:
+                metrics[section] = dict({name: round(total / len(cases), 4) for name, total in totals.items()}, n=len(cases))
+                latency[section] = benchmark.summarize(samples)
+            rankings[section] = ranked_lists
+    return {"mode": mode, "k": k, "metrics": metrics, "latency_ms": latency, "misses": misses, "rankings": rankings}
+
+
+def evaluate_modes(modes=None, golden=None, k=EVAL_K):
+    """evaluate() in each mode; parity compares every mode's rankings with the first mode's"""
+    golden = golden if golden is not None else load_golden()
+    modes = list(modes or benchmark.MODES)
+    reports = {mode: evaluate(golden, k, mode) for mode in modes}
+    reference = reports[modes[0]]["rankings"]
+    summary = {}
+    for mode, report in reports.items():
+        mismatches = [
+            {"function": section, "query": case["query"]}
+            for section, cases in golden.items()
+            for case, ranked, expected in zip(cases, report["rankings"][section], reference[section])
+            if ranked != expected
+        ]
+        summary[mode] = {
+            "metrics": report["metrics"],
+            "latency_ms": report["latency_ms"],
+            "parity": not mismatches,
+            "mismatches": mismatches,
+            "misses": report["misses"]
+        }
+    return {"k": k, "reference_mode": modes[0], "modes": summary}
+
+
+def format_report(report):
+    """Human-readable summary of an evaluate_modes() report"""
+    k = report["k"]
+    lines = [f"## UI Pro Max Relevance (k={k}, parity vs {report['reference_mode']})"]
+    for mode, result in report["modes"].items():
+        lines.append(f"\n### mode: {mode} - parity {'OK' if result['parity'] else 'BROKEN (%d queries differ)' % len(result['mismatches'])}")
+        lines.append(f"{'function':<16}{'n':>5}{'recall@%d' % k:>11}{'mrr':>8}{'ndcg@%d' % k:>9}{'p50 ms':>9}{'p95 ms':>9}")
+        for section, values in result["metrics"].items():
+            timing = result["latency_ms"][section]
+            lines.append(f"{section:<16}{values['n']:>5}{values[f'recall@{k}']:>11.3f}{values['mrr']:>8.3f}{values[f'ndcg@{k}']:>9.3f}"
+                         f"{timing['p50']:>9.3f}{timing['p95']:>9.3f}")
+    first = next(iter(report["modes"].values()))
+    if first["misses"]:
+        lines.append(f"\nTop result missed ({len(first['misses'])}):")
+        for miss in first["misses"]:
+            lines.append(f"- {miss['function']}: \"{miss['query']}\" expected {miss['expected']!r}, got {miss['got']}")
+    return "\n".join(lines)
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate UI Pro Max ranking quality against golden queries")
+    parser.add_argument("--mode", action="append", choices=list(benchmark.MODES), help="Mode(s) to evaluate (default: all)")
+    parser.add_argument("--k", type=int, default=EVAL_K, help="Cutoff for recall@k and nDCG@k")
+    parser.add_argument("--golden", type=str, default=None, help=f"Golden query file (default: {GOLDEN_FILE.name})")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report instead of the summary")
+    args = parser.parse_args()
+
+    report = evaluate_modes(args.mode, load_golden(args.golden), args.k)
+    print(json.dumps(report, indent=2, ensure_ascii=False) if args.json else format_report(report))
@@ -3,6 +3,8 @@
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+       python search.py "<query>" --all [--max-results 5]
+       python search.py "<query>" --route 3      # the 3 most likely domains, searched in parallel
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
 
@@ -11,20 +13,42 @@ Stacks: html-tailwind, react, nextjs
 
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
-  --page       Also create a page-specific override file in design-system/pages/
+  --page       Also create a page-specific override file in design-system/pages/ (repeatable)
+  Files whose content is unchanged (apart from the Generated timestamp) are not rewritten.
+
+Indexes are cached in data/.index/ and updated automatically when a CSV changes
+(patched for the edited rows only, unless most of the CSV changed).
+  --build-index  Compile the binary data snapshot and prebuild every index up front
+  --watch        Keep the indexes current as CSVs are edited (with --serve: inside the daemon)
+
+Batch mode (JSONL in, JSONL out; each CSV is indexed once for the whole batch):
+  --batch FILE  Read {"query", "domain"|"stack", "max_results"} records from FILE ("-" for stdin)
+  --batch FILE --design-system [--persist] [-o DIR]
+                Generate a design system per {"query", "project_name", "page"} brief,
+                from a JSONL or .csv FILE with those columns
+
+Search daemon (keeps every index warm; the CLI forwards to it automatically):
+  --serve      Start the daemon on a Unix domain socket
+  --stop       Stop a running daemon
+  --no-daemon  Run in-process even if a daemon is running
 """
 
 import argparse
+import json
+import os
 import sys
-import io
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack, audit_page
-from design_system import generate_design_system, persist_design_system
 
-# Force UTF-8 for stdout/stderr to handle emojis on Windows (cp1252 default)
-if sys.stdout.encoding and sys.stdout.encoding.lower() != 'utf-8':
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-if sys.stderr.encoding and sys.stderr.encoding.lower() != 'utf-8':
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+# Each subcommand imports the engine pieces it uses in __main__ below, so --help,
+# a daemon-forwarded query or an audit never load the design-system generator,
+# the daemon's socketserver or NumPy, and a forwarded query not even core.py
+# (see `benchmark.py --startup`).
+
+
+def force_utf8_output():
+    """Switch stdout/stderr to UTF-8 to handle emojis on Windows (cp1252 default); no-op when already UTF-8"""
+    for stream in (sys.stdout, sys.stderr):
+        if stream.encoding and stream.encoding.lower() not in ('utf-8', 'utf8') and hasattr(stream, 'reconfigure'):
+            stream.reconfigure(encoding='utf-8')
 
 
 def format_output(result):
@@ -53,6 +77,51 @@ def format_output(result):
     return "\n".join(output)
 
 
+def format_federated_output(result):
+    """Format a merged cross-domain ranking (token-optimized)"""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    output = []
+    output.append(f"## UI Pro Max Federated Search")
+    output.append(f"**Query:** {result['query']} | **Found:** {result['count']} results\n")
+
+    for i, item in enumerate(result['results'], 1):
+        source = f"stack: {item['stack']}" if item.get("stack") else f"domain: {item['domain']}"
+        output.append(f"### Result {i} ({source}, score {item['score']})")
+        for key, value in item['result'].items():
+            value_str = str(value)
+            if len(value_str) > 300:
+                value_str = value_str[:300] + "..."
+            output.append(f"- **{key}:** {value_str}")
+        output.append("")
+
+    return "\n".join(output)
+
+
+def format_routed_output(result):
+    """Format the routed domains' results, each headed by its routing confidence"""
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    routes = ", ".join(f"{route['domain']} ({route['confidence']:.0%})" for route in result['routes'])
+    output = [f"## UI Pro Max Routed Search", f"**Query:** {result['query']} | **Domains:** {routes}\n"]
+    for route in result['routes']:
+        output.append(format_output(route))
+    return "\n".join(output)
+
+
+def read_jsonl(stream):
+    """Yield one parsed record per non-blank line (None for lines that are not valid JSON)"""
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
 def format_audit_output(result):
     """Format audit results as a comprehensive checklist"""
     output = []
@@ -140,10 +209,15 @@ def format_audit_output(result):
 
 
 if __name__ == "__main__":
+    from config import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, BATCH_WORKERS, ROUTE_TOP_N
+
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
+    parser.add_argument("--all", action="store_true", help="Search every domain and stack, merged into one ranking")
+    parser.add_argument("--route", type=int, nargs="?", const=ROUTE_TOP_N, default=None, metavar="N",
+                        help=f"Search the N domains the query most likely targets, in parallel (default N: {ROUTE_TOP_N})")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     # Design system generation
@@ -152,32 +226,106 @@ if __name__ == "__main__":
     parser.add_argument("--format", "-f", choices=["ascii", "markdown"], default="ascii", help="Output format for design system")
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
-    parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--page", type=str, action="append", default=None,
+                        help="Create page-specific override file in design-system/pages/ (repeat for several pages)")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
     # Page audit
     parser.add_argument("--audit", "-a", type=str, default=None, help="Audit a page type against standards. E.g., --audit landing")
+    # Index maintenance
+    parser.add_argument("--build-index", action="store_true", help="Compile the data snapshot and prebuild the BM25 indexes for every domain and stack")
+    # Search daemon
+    parser.add_argument("--serve", action="store_true", help="Run the search daemon (keeps all indexes warm in memory)")
+    parser.add_argument("--watch", action="store_true", help="Patch indexes as CSVs are edited (inside the daemon with --serve, else in the foreground)")
+    parser.add_argument("--stop", action="store_true", help="Stop a running search daemon")
+    parser.add_argument("--socket", type=str, default=None, help="Daemon socket path (default: per-user temp file)")
+    parser.add_argument("--no-daemon", action="store_true", help="Do not forward to a running daemon")
+    # Batch mode
+    parser.add_argument("--batch", type=str, default=None, help="Run a JSONL file of queries ('-' for stdin) and stream JSONL results")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help=f"Concurrent workers for --batch, searches or design-system briefs (default: {BATCH_WORKERS})")
 
     args = parser.parse_args()
+    use_daemon = not args.no_daemon
+    force_utf8_output()
+
+    if args.build_index:
+        from core import build_indexes, compile_snapshot
+        compiled = compile_snapshot()
+        built = build_indexes()
+        print(f"Compiled {len(compiled)} CSV files into the data snapshot, indexed {len(built)}")
+        sys.exit(0)
+    if args.serve:
+        from server import serve, default_socket_path
+        print(f"Serving UI Pro Max search on {args.socket or default_socket_path()}", flush=True)
+        serve(args.socket, watch=args.watch)
+        sys.exit(0)
+    if args.watch:
+        from core import DATA_DIR, watch
+        print(f"Watching {DATA_DIR} for CSV changes (Ctrl-C to stop)", flush=True)
+        try:
+            watch(on_change=lambda names: print(f"Updated {', '.join(names)}", flush=True))
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+    if args.stop:
+        from client import request
+        stopped = request({"op": "shutdown"}, args.socket) is not None
+        print("Search daemon stopped" if stopped else "No search daemon running")
+        sys.exit(0)
+    if args.batch and args.design_system:
+        from design_system import generate_design_systems
+        stream = sys.stdin if args.batch == "-" else open(args.batch, 'r', encoding='utf-8', newline='')
+        with stream:
+            if args.batch.lower().endswith(".csv"):
+                import csv
+                briefs = csv.DictReader(stream)
+            else:
+                briefs = read_jsonl(stream)
+            for result in generate_design_systems(briefs, args.format, args.persist, args.output_dir, args.workers):
+                print(json.dumps(result, ensure_ascii=False), flush=True)
+        sys.exit(0)
+    if args.batch:
+        from core import search_batch
+        stream = sys.stdin if args.batch == "-" else open(args.batch, 'r', encoding='utf-8')
+        with stream:
+            for result in search_batch(read_jsonl(stream), args.workers):
+                print(json.dumps(result, ensure_ascii=False), flush=True)
+        sys.exit(0)
+    if args.query is None and not args.audit:
+        parser.error("the following arguments are required: query")
+    if args.route is not None and args.route < 1:
+        parser.error("argument --route: N must be at least 1")
+    # Every query op goes through the daemon client; core loads only when no daemon answers,
+    # and design_system only for --design-system
+    from client import run
 
     # Audit takes highest priority
     if args.audit:
-        result = audit_page(args.audit)
+        result = run({"op": "audit_page", "page_type": args.audit}, use_daemon, args.socket)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
         else:
             print(format_audit_output(result))
     # Design system takes priority
     elif args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
-        print(result)
+        def stream_design_system(payload):
+            """In-process, the design system is written to stdout as it is rendered"""
+            from design_system import render_design_system, write_rendered
+            write_rendered(render_design_system(payload["query"], payload["project_name"], payload["output_format"],
+                                                payload["persist"], payload["page"], payload["output_dir"]), sys.stdout)
+            print()
+
+        result = run({
+            "op": "generate_design_system",
+            "query": args.query,
+            "project_name": args.project_name,
+            "output_format": args.format,
+            "persist": args.persist,
+            "page": args.page,
+            # The daemon runs elsewhere, so always hand it an absolute directory
+            "output_dir": os.path.abspath(args.output_dir or os.getcwd())
+        }, use_daemon, args.socket, stream_design_system)
+        if result is not None:
+            print(result)
         
         # Print persistence confirmation
         if args.persist:
@@ -185,26 +333,38 @@ if __name__ == "__main__":
             print("\n" + "=" * 60)
             print(f"✅ Design system persisted to design-system/{project_slug}/")
             print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
+            for page in args.page or []:
+                page_filename = page.lower().replace(' ', '-')
                 print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
             print("")
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
             print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
             print("=" * 60)
+    # Federated search
+    elif args.all:
+        result = run({"op": "search_all", "query": args.query, "max_results": args.max_results}, use_daemon, args.socket)
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_federated_output(result))
+    # Auto-routed search over the most likely domains
+    elif args.route is not None:
+        result = run({"op": "search_routed", "query": args.query, "top_n": args.route, "max_results": args.max_results}, use_daemon, args.socket)
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_routed_output(result))
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
+        result = run({"op": "search_stack", "query": args.query, "stack": args.stack, "max_results": args.max_results}, use_daemon, args.socket)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = run({"op": "search", "query": args.query, "domain": args.domain, "max_results": args.max_results}, use_daemon, args.socket)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Server - keeps every domain and stack index warm in memory
+and answers requests over a Unix domain socket, one JSON object per line.
+
+Usage:
+    python search.py --serve [--socket PATH]     # start the daemon
+    python search.py --serve --watch             # ... and patch indexes as CSVs are edited
+    python search.py "glassmorphism" -d style    # forwarded to the daemon when it is running (client.py)
+
+Protocol:
+    -> {"op": "search", "query": "glassmorphism", "domain": "style", "max_results": 3}
+    <- {"ok": true, "result": {...}}
+    <- {"ok": false, "error": "..."}
+
+Ops: search, search_stack, search_all, search_routed, audit_page,
+     generate_design_system, ping, cache_info, fuzzy_info, invalidate_cache, shutdown
+"""
+
+import json
+import os
+import stat
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import client
+import core
+from client import _owned_by_us, request
+from core import MAX_RESULTS, ROUTE_TOP_N, search, search_stack, search_all, search_routed, audit_page, build_indexes
+
+
+def default_socket_path():
+    """Per-user, per-install socket path of the daemon for core.DATA_DIR"""
+    return Path(client.default_socket_path(core.DATA_DIR))
+
+
+def _private_dir(path):
+    """Create path 0700 if missing and check no other user owns or can enter it: the temp dir
+    is shared, so a directory planted there must not be trusted with the socket"""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or not _owned_by_us(st) or (hasattr(os, "getuid") and st.st_mode & 0o077):
+        raise RuntimeError(f"Refusing to use {path} for the daemon socket: it is not a private directory of this user")
+
+
+# ============ REQUEST DISPATCH ============
+def _op_search(request):
+    return search(request["query"], request.get("domain"), request.get("max_results", MAX_RESULTS))
+
+
+def _op_search_stack(request):
+    return search_stack(request["query"], request["stack"], request.get("max_results", MAX_RESULTS))
+
+
+def _op_search_all(request):
+    return search_all(request["query"], request.get("max_results", MAX_RESULTS), request.get("domains"), request.get("stacks"))
+
+
+def _op_search_routed(request):
+    return search_routed(request["query"], request.get("top_n", ROUTE_TOP_N), request.get("max_results", MAX_RESULTS))
+
+
+def _op_audit_page(request):
+    return audit_page(request["page_type"])
+
+
+def _op_generate_design_system(request):
+    from design_system import generate_design_system
+    return generate_design_system(
+        request["query"],
+        request.get("project_name"),
+        request.get("output_format", "ascii"),
+        persist=request.get("persist", False),
+        page=request.get("page"),
+        output_dir=request.get("output_dir")
+    )
+
+
+def _op_ping(request):
+    return {"pid": os.getpid(), "data_dir": str(core.DATA_DIR)}
+
+
+def _op_cache_info(request):
+    return core.search_cache_info()
+
+
+def _op_fuzzy_info(request):
+    return core.fuzzy_info()
+
+
+def _op_invalidate_cache(request):
+    core.invalidate_search_cache()
+    return core.search_cache_info()
+
+
+OPS = {
+    "search": _op_search,
+    "search_stack": _op_search_stack,
+    "search_all": _op_search_all,
+    "search_routed": _op_search_routed,
+    "audit_page": _op_audit_page,
+    "generate_design_system": _op_generate_design_system,
+    "ping": _op_ping,
+    "cache_info": _op_cache_info,
+    "fuzzy_info": _op_fuzzy_info,
+    "invalidate_cache": _op_invalidate_cache,
+}
+
+
+def dispatch(request):
+    """Run one request in-process and return its result (raises on bad requests)"""
+    op = request.get("op")
+    if op not in OPS:
+        raise ValueError(f"Unknown op: {op}. Available: {', '.join(OPS)}")
+    try:
+        return OPS[op](request)
+    except KeyError as e:
+        raise ValueError(f"Missing field for {op}: {e.args[0]}")
+
+
+# ============ SERVER ============
+@lru_cache(maxsize=None)
+def _server_classes():
+    """(server class, request handler class); socketserver is only imported by --serve"""
+    import socketserver
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        """Reads JSON lines from a client and writes one JSON response line per request"""
+
+        def handle(self):
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if request.get("op") == "shutdown":
+                        self._reply({"ok": True, "result": None})
+                        threading.Thread(target=self.server.shutdown, daemon=True).start()
+                        return
+                    response = {"ok": True, "result": dispatch(request)}
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                self._reply(response)
+
+        def _reply(self, response):
+            payload = json.dumps(response, ensure_ascii=False, default=str) + "\n"
+            self.wfile.write(payload.encode("utf-8"))
+            self.wfile.flush()
+
+    class SearchServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    return SearchServer, RequestHandler
+
+
+def _remove_stale_socket(socket_path):
+    """Unlink a socket left behind by a dead daemon; refuse to steal a live one"""
+    if not socket_path.exists():
+        return
+    if request({"op": "ping"}, socket_path) is not None:
+        raise RuntimeError(f"A search daemon is already listening on {socket_path}")
+    socket_path.unlink()
+
+
+def serve(socket_path=None, ready=None, watch=False):
+    """Warm every index, then serve requests until a shutdown op arrives.
+
+    With watch, a background thread keeps the indexes current as CSVs change
+    (see core.watch), so no request pays for updating one.
+    """
+    import socket
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("The search daemon needs Unix domain sockets, which this platform lacks")
+    if socket_path is None:
+        socket_path = default_socket_path()
+        _private_dir(socket_path.parent)
+    socket_path = Path(socket_path)
+    _remove_stale_socket(socket_path)
+
+    build_indexes()
+
+    # The socket is created owner-only, rather than chmod-ed after bind() leaves it open
+    server_class, handler_class = _server_classes()
+    umask = os.umask(0o177)
+    try:
+        server = server_class(str(socket_path), handler_class)
+    finally:
+        os.umask(umask)
+
+    stop_watching = threading.Event()
+    if watch:
+        threading.Thread(target=core.watch, kwargs={"stop": stop_watching}, daemon=True).start()
+    try:
+        if ready is not None:
+            ready.set()
+        server.serve_forever()
+    finally:
+        stop_watching.set()
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Snapshot - compiles every CSV under data/ into one compact binary
+file that is memory-mapped and decoded lazily, row by row.
+
+Usage:
+    python snapshot.py                 # compile data/ into data/.index/data.snap
+    python search.py --build-index     # same, plus the BM25 indexes
+
+Layout (little-endian):
+    magic "UIPXSNAP" | u32 version | u32 header length | header JSON
+    u32 string offsets (strings + 1)  - string i is data[offsets[i]:offsets[i + 1]]
+    string data (UTF-8)               - every distinct cell value and column name, stored once
+    tables                            - per CSV, rows x columns u32 string ids
+
+Rows are fixed width, so row i of a table starts at table offset + i * columns * 4.
+A missing cell (short CSV row) is stored as MISSING and decodes to None, and cells past the
+header (long CSV row) are kept per row under the None key, both exactly as csv.DictReader does.
+"""
+
+import csv
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+MAGIC = b"UIPXSNAP"
+VERSION = 1
+MISSING = 0xFFFFFFFF
+
+_PREAMBLE = struct.Struct("<8sII")
+_U32 = struct.Struct("<I")
+
+
+# ============ BUILD ============
+def build_snapshot(data_dir, out_path):
+    """Compile every CSV under data_dir into out_path; returns the table names"""
+    data_dir = Path(data_dir)
+    out_path = Path(out_path)
+
+    strings = []
+    string_ids = {}
+
+    def intern(value):
+        if value is None:
+            return MISSING
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    tables = {}
+    table_rows = []
+    for csv_path in sorted(data_dir.rglob("*.csv")):
+        name = csv_path.relative_to(data_dir).as_posix()
+        stat = os.stat(csv_path)
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+            columns = list(reader.fieldnames or [])
+        tables[name] = {
+            "columns": [intern(col) for col in columns],
+            "rows": len(rows),
+            # Cells beyond the header (csv.DictReader's restkey None), keyed by row index
+            "rest": {str(idx): [intern(value) for value in row[None]] for idx, row in enumerate(rows) if None in row},
+            "source": {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+        }
+        table_rows.append((name, [[intern(row.get(col)) for col in columns] for row in rows]))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    string_offsets = [0]
+    for blob in encoded:
+        string_offsets.append(string_offsets[-1] + len(blob))
+    string_data = b"".join(encoded)
+
+    # Offsets depend on the header length, which depends on the offsets: fix the point
+    header = {"strings": len(strings), "tables": tables}
+    while True:
+        header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        offsets_at = _PREAMBLE.size + len(header_bytes)
+        data_at = offsets_at + 4 * len(string_offsets)
+        position = data_at + len(string_data)
+        layout = {"offsets_at": offsets_at, "data_at": data_at, "tables_at": {}}
+        for name, rows in table_rows:
+            layout["tables_at"][name] = position
+            position += 4 * len(rows) * len(tables[name]["columns"])
+        if header.get("layout") == layout:
+            break
+        header["layout"] = layout
+
+    tmp_path = out_path.with_name(f"{out_path.name}.{os.getpid()}.tmp")
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(struct.pack(f"<{len(string_offsets)}I", *string_offsets))
+        f.write(string_data)
+        for name, rows in table_rows:
+            flat = [sid for row in rows for sid in row]
+            f.write(struct.pack(f"<{len(flat)}I", *flat))
+
+    # Rows already handed out (e.g. in core's row caches) keep reading the old map, which
+    # stays valid after the replace and is unmapped once the last of them is dropped
+    forget_snapshot(out_path)
+    os.replace(tmp_path, out_path)
+    return list(tables)
+
+
+# ============ LOAD ============
+class Snapshot:
+    """A memory-mapped snapshot; tables decode strings only when a row is read"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_len = _PREAMBLE.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a v{VERSION} snapshot: {self.path}")
+        self.header = json.loads(self._mm[_PREAMBLE.size:_PREAMBLE.size + header_len])
+        layout = self.header["layout"]
+        self._offsets_at = layout["offsets_at"]
+        self._data_at = layout["data_at"]
+
+    def string(self, sid):
+        if sid == MISSING:
+            return None
+        start = _U32.unpack_from(self._mm, self._offsets_at + 4 * sid)[0]
+        end = _U32.unpack_from(self._mm, self._offsets_at + 4 * sid + 4)[0]
+        return self._mm[self._data_at + start:self._data_at + end].decode("utf-8")
+
+    def table(self, name):
+        """Lazy rows of one CSV (name relative to the data dir), or None if not compiled"""
+        info = self.header["tables"].get(name)
+        if info is None:
+            return None
+        return SnapshotRows(self, info, self.header["layout"]["tables_at"][name])
+
+    def close(self):
+        self._mm.close()
+
+
+class SnapshotRows:
+    """Read-only sequence of CSV rows backed by the snapshot.
+
+    Indexing decodes just that row into a fresh dict; column() reads one
+    field of every row without building any dicts.
+    """
+
+    def __init__(self, snapshot, info, offset):
+        self._snapshot = snapshot
+        self._offset = offset
+        self._n = info["rows"]
+        self._rest = info["rest"]
+        self.columns = [snapshot.string(sid) for sid in info["columns"]]
+        self._row = struct.Struct(f"<{len(self.columns)}I")
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(self._n))]
+        if idx < 0:
+            idx += self._n
+        if not 0 <= idx < self._n:
+            raise IndexError("snapshot row index out of range")
+        ids = self._row.unpack_from(self._snapshot._mm, self._offset + idx * self._row.size)
+        row = {col: self._snapshot.string(sid) for col, sid in zip(self.columns, ids)}
+        if str(idx) in self._rest:
+            row[None] = [self._snapshot.string(sid) for sid in self._rest[str(idx)]]
+        return row
+
+    def __iter__(self):
+        for idx in range(self._n):
+            yield self[idx]
+
+    def column(self, col):
+        """All values of one column, in row order ("" for unknown columns, like row.get(col, ""))"""
+        if col not in self.columns:
+            return [""] * self._n
+        position = self._offset + 4 * self.columns.index(col)
+        string = self._snapshot.string
+        return [string(_U32.unpack_from(self._snapshot._mm, position + idx * self._row.size)[0]) for idx in range(self._n)]
+
+
+_OPEN = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def open_snapshot(path):
+    """Shared Snapshot for path, reopened when the file is rebuilt; None if missing or unreadable"""
+    path = Path(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = str(path)
+    fingerprint = (stat.st_mtime_ns, stat.st_size)
+    with _OPEN_LOCK:
+        cached = _OPEN.get(key)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        try:
+            snapshot = Snapshot(path)
+        except (OSError, ValueError, struct.error):
+            return None
+        _OPEN[key] = (fingerprint, snapshot)
+        return snapshot
+
+
+def forget_snapshot(path):
+    """Drop the shared Snapshot for path without unmapping it; returns its (fingerprint, Snapshot)"""
+    with _OPEN_LOCK:
+        return _OPEN.pop(str(Path(path)), None)
+
+
+def close_snapshot(path):
+    """Forget and unmap the shared Snapshot for path (no rows of it may be read afterwards)"""
+    cached = forget_snapshot(path)
+    if cached:
+        cached[1].close()
+
+
+def load_table(snapshot_path, data_dir, csv_path):
+    """Lazy rows for csv_path if the snapshot holds an up-to-date copy of it, else None"""
+    snapshot = open_snapshot(snapshot_path)
+    if snapshot is None:
+        return None
+    try:
+        name = Path(csv_path).relative_to(data_dir).as_posix()
+    except ValueError:
+        return None
+    info = snapshot.header["tables"].get(name)
+    if info is None:
+        return None
+    stat = os.stat(csv_path)
+    if info["source"] != {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}:
+        return None
+    return snapshot.table(name)
+
+
+# ============ CLI SUPPORT ============
+if __name__ == "__main__":
+    import argparse
+    from core import DATA_DIR, INDEX_DIRNAME, SNAPSHOT_FILE
+
+    parser = argparse.ArgumentParser(description="Compile the data directory into a binary snapshot")
+    parser.add_argument("--data-dir", type=str, default=str(DATA_DIR), help="Directory of CSV files")
+    parser.add_argument("--output", "-o", type=str, default=None, help=f"Snapshot path (default: <data-dir>/{INDEX_DIRNAME}/{SNAPSHOT_FILE})")
+    args = parser.parse_args()
+
+    out_path = Path(args.output) if args.output else Path(args.data_dir) / INDEX_DIRNAME / SNAPSHOT_FILE
+    names = build_snapshot(args.data_dir, out_path)
+    print(f"Compiled {len(names)} CSV files into {out_path} ({out_path.stat().st_size:,} bytes)")
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""Shared fixtures for the ui-ux-pro-max script tests"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import core
+
+REAL_DATA_DIR = core.DATA_DIR
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Copy the shipped data into a temp dir so index files never touch the repo."""
+    target = tmp_path / "data"
+    shutil.copytree(REAL_DATA_DIR, target, ignore=shutil.ignore_patterns(core.INDEX_DIRNAME))
+    monkeypatch.setattr(core, "DATA_DIR", target)
+    core.clear_caches()
+    yield target
+    core.clear_caches()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Tests for benchmark.py"""
+
+import csv
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import benchmark
+import core
+
+
+def _rows(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_percentile_nearest_rank():
+    samples = list(range(1, 101))
+    assert benchmark.percentile(samples, 50) == 50
+    assert benchmark.percentile(samples, 99) == 99
+    assert benchmark.percentile([7], 95) == 7
+    assert benchmark.percentile([], 50) is None
+
+
+def test_synthetic_data_scales_every_csv(data_dir, tmp_path):
+    out = tmp_path / "scaled"
+    written = benchmark.generate_synthetic_data(3, out, data_dir)
+    assert "styles.csv" in written and "stacks/react.csv" in written
+    original = _rows(data_dir / "styles.csv")
+    scaled = _rows(out / "styles.csv")
+    assert len(scaled) == 3 * len(original)
+    assert scaled[:len(original)] == original
+    assert scaled[len(original):2 * len(original)] != original
+
+
+def test_synthetic_data_is_deterministic(data_dir, tmp_path):
+    benchmark.generate_synthetic_data(2, tmp_path / "a", data_dir)
+    benchmark.generate_synthetic_data(2, tmp_path / "b", data_dir)
+    assert (tmp_path / "a" / "colors.csv").read_bytes() == (tmp_path / "b" / "colors.csv").read_bytes()
+
+
+def test_time_mode_reports_every_op(data_dir):
+    work = [(op, call) for op, call in benchmark._workload()][::10]
+    for mode in benchmark.MODES:
+        summary = benchmark.time_mode(mode, repeat=1, work=work)
+        assert set(summary) == {op for op, _ in work}
+        for stats in summary.values():
+            assert stats["p50"] <= stats["p95"] <= stats["p99"] <= stats["max"]
+
+
+def test_modes_restore_result_cache(data_dir):
+    size = core._RESULT_CACHE.maxsize
+    with benchmark.MODES["warm"]():
+        assert core._RESULT_CACHE.maxsize == 0
+    assert core._RESULT_CACHE.maxsize == size
+
+
+def test_use_data_dir_switches_and_restores(data_dir, tmp_path):
+    design_data_dir = benchmark.design_system.DATA_DIR
+    benchmark.generate_synthetic_data(2, tmp_path / "scaled", data_dir)
+    with benchmark.use_data_dir(tmp_path / "scaled"):
+        assert benchmark.design_system.DATA_DIR == tmp_path / "scaled"
+        assert core.search("glassmorphism", "style")["count"] > 0
+    assert core.DATA_DIR == data_dir
+    assert benchmark.design_system.DATA_DIR == design_data_dir
+
+
+def test_parse_importtime_depths():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |     _json\n"
+              "import time:       400 |        520 |   json.decoder\n"
+              "import time:       300 |        820 | json\n")
+    assert benchmark.parse_importtime(stderr) == [("_json", 120, 120, 2), ("json.decoder", 400, 520, 1), ("json", 300, 820, 0)]
+
+
+def test_startup_imports_only_what_each_subcommand_needs(data_dir):
+    startup = benchmark.time_startup(data_dir.parent, ["help", "search", "design-system", "forwarded"], repeat=1)
+    for command in ("help", "search", "forwarded"):
+        imported = set(startup[command]["modules"])
+        assert not imported & {"numpy", "design_system", "socketserver"}, command
+    assert "design_system" in startup["design-system"]["modules"]
+    assert "socketserver" not in startup["design-system"]["modules"]
+    # A query a daemon answers never loads the engine
+    assert "core" in startup["search"]["modules"]
+    assert not set(startup["forwarded"]["modules"]) & {"core", "server"}
+    assert all(result["import_ms"] > 0 for result in startup.values())
+    assert all(result["latency_budget_ms"] == benchmark.COLD_LATENCY_BUDGET_MS[command] for command, result in startup.items())
+
+
+def test_startup_budget_covers_cold_latency(data_dir):
+    startup = benchmark.time_startup(data_dir.parent, ["search"], repeat=1, latency_budget_ms={"search": -1})
+    assert startup["search"]["latency_ms"] > startup["search"]["latency_budget_ms"]
+    assert not startup["search"]["within_budget"]
+    assert "OVER BUDGET" in benchmark.format_startup(startup)
+
+
+def test_row_memory_columnar_is_smaller(data_dir):
+    memory = benchmark.measure_row_memory()
+    assert "style" in memory and "stack:react" in memory
+    assert memory["style"]["rows"] == len(_rows(data_dir / "styles.csv"))
+    assert memory["style"]["columnar_kb"] < memory["style"]["dicts_kb"]
+    assert "total" in benchmark.format_row_memory(memory)
@@ -0,0 +1,871 @@
+#!/usr/bin/env python3
+"""Tests for core.py"""
+
+import copy
+import csv
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import core
+from core import BM25, BM25F
+
+
+def _fresh_search(query, domain, max_results):
+    """Reference result: rebuild the index from the CSV without any caching."""
+    config = core.CSV_CONFIG[domain]
+    filepath = core.DATA_DIR / config["file"]
+    data = core._load_csv(filepath)
+    tokenize = core.TOKENIZERS[core._tokenizer_name(config)]
+    cells = [[tokenize(row.get(col, "")) for col in config["search_cols"]] for row in data]
+    if "field_weights" in config:
+        bm25 = BM25F(tokenizer=core._tokenizer_name(config), field_weights=config["field_weights"], field_b=config.get("field_b"),
+                     phrases=core.PHRASE_SHINGLES)
+        bm25.fit_fields(config["search_cols"], cells)
+    else:
+        bm25 = BM25(tokenizer=core._tokenizer_name(config), phrases=core.PHRASE_SHINGLES)
+        phrases = [[phrase for tokens in doc for phrase in core._shingles(tokens)] for doc in cells]
+        bm25.fit_tokens([[token for tokens in doc for token in tokens] for doc in cells], phrases)
+    ranked = bm25.score(query)
+    return [data[idx][config["output_cols"][0]] for idx, score in ranked[:max_results] if score > 0]
+
+
+# ============ TOKENIZERS ============
+def test_default_tokenizer_splits_on_punctuation_and_drops_short_words():
+    assert core.TOKENIZERS["default"]("Dark-mode UI, for the OLED/web!") == ["dark", "mode", "for", "the", "oled", "web"]
+
+
+def test_stem_tokenizer_drops_stopwords_and_conflates_inflections():
+    tokenize = core.TOKENIZERS["stem"]
+    assert tokenize("the buttons with animations") == tokenize("button animated")
+    assert tokenize("focus class") == ["focus", "class"]
+    assert tokenize("libraries") == tokenize("library")
+
+
+def test_tokenizer_memoizes_repeated_text():
+    tokenizer = core.Tokenizer()
+    first = tokenizer("hover states")
+    first.append("mutated")
+    assert tokenizer("hover states") == ["hover", "states"]
+    assert tokenizer.cache_info().hits == 1
+
+
+def test_domain_tokenizer_is_selectable(data_dir, monkeypatch):
+    monkeypatch.setitem(core.CSV_CONFIG["landing"], "tokenizer", "stem")
+    stemmed = core.search("testimonial", "landing", 20)["results"]
+    assert core.search("testimonials", "landing", 20)["results"] == stemmed
+    assert core._read_json(data_dir / core.INDEX_DIRNAME / "landing.json")["bm25"]["tokenizer"] == "stem"
+
+    monkeypatch.setitem(core.CSV_CONFIG["landing"], "tokenizer", "default")
+    core.search("testimonial", "landing")
+    assert core._read_json(data_dir / core.INDEX_DIRNAME / "landing.json")["bm25"]["tokenizer"] == "default"
+
+
+# ============ BM25 ============
+def test_bm25_ranks_matching_document_first():
+    bm25 = BM25()
+    bm25.fit(["dark mode toggle", "light theme colors", "button hover states"])
+    ranked = bm25.score("hover button")
+    assert ranked[0][0] == 2
+    assert ranked[0][1] > 0
+
+
+def test_bm25_roundtrip_preserves_scores():
+    bm25 = BM25()
+    bm25.fit(["glassmorphism frosted glass blur", "minimalism clean white", "glass cards with blur"])
+    restored = BM25.from_dict(bm25.to_dict())
+    assert restored.score("glass blur") == bm25.score("glass blur")
+
+
+def test_bm25_only_scores_documents_containing_query_terms():
+    bm25 = BM25()
+    bm25.fit(["dark mode toggle", "light theme colors", "button hover states"])
+    assert sorted(idx for idx, _ in bm25.score("dark theme")) == [0, 1]
+    assert bm25.score("unrelated words") == []
+
+
+def test_bm25_top_k_matches_full_ranking():
+    docs = ["card %d hover shadow" % i if i % 3 else "card %d hover" % i for i in range(40)]
+    bm25 = BM25()
+    bm25.fit(docs)
+    full = bm25.score("card hover shadow")
+    for k in (1, 3, 10, 39, 40, 100):
+        assert bm25.score("card hover shadow", k) == full[:k]
+
+
+def test_bm25_ties_keep_document_order():
+    bm25 = BM25()
+    bm25.fit(["alpha beta", "gamma delta", "alpha beta", "alpha beta"])
+    assert [idx for idx, _ in bm25.score("alpha", 2)] == [0, 2]
+
+
+def test_bm25_empty_corpus():
+    bm25 = BM25()
+    bm25.fit([])
+    assert bm25.score("anything") == []
+
+
+# ============ TOP-K PRUNING ============
+PRUNE_DOCS = ["common words %d filler" % i + (" rare signal" if i % 17 == 0 else "") + (" common" if i % 5 == 0 else "")
+              for i in range(120)]
+
+
+def test_pruned_top_k_matches_exhaustive(monkeypatch):
+    bm25 = BM25()
+    bm25.fit(PRUNE_DOCS)
+    queries = ["rare common", "signal words filler", "common common rare", "words", "missing rare", "unknown"]
+    results = {}
+    for min_docs in (0, 1):
+        monkeypatch.setattr(core, "PRUNE_MIN_DOCS", min_docs)
+        results[min_docs] = [bm25.score(query, k) for query in queries for k in (1, 3, 10, 200)]
+    assert results[1] == results[0]
+
+
+def test_pruning_skips_documents_outside_top_k(monkeypatch):
+    monkeypatch.setattr(core, "PRUNE_MIN_DOCS", 1)
+    bm25 = BM25()
+    bm25.fit(PRUNE_DOCS)
+    rescored = []
+    exact_score = bm25._exact_score
+    monkeypatch.setattr(bm25, "_exact_score", lambda idx, tokens: rescored.append(idx) or exact_score(idx, tokens))
+    bm25.score("rare common words", 3)
+    assert 3 <= len(rescored) < len(PRUNE_DOCS) // 4
+
+
+def test_term_bounds_stored_with_large_indexes(data_dir, monkeypatch):
+    monkeypatch.setattr(core, "PRUNE_MIN_DOCS", 10)
+    core.search_stack("state management", "react")
+    index = core._read_json(data_dir / core.INDEX_DIRNAME / "stacks__react.json")["bm25"]
+    stored = index["term_bounds"]
+    bm25 = BM25.from_dict(index)
+    bm25._compute_bounds()
+    assert stored == bm25.term_bounds
+    assert all(score <= sum(stored[t] for t in bm25.tokenize("state management")) for _, score in bm25.score("state management"))
+
+
+# ============ BM25F ============
+def _fit_bm25f(docs, **kwargs):
+    bm25 = BM25F(**kwargs)
+    bm25.fit_fields(["name", "notes"], [[bm25.tokenize(name), bm25.tokenize(notes)] for name, notes in docs])
+    return bm25
+
+
+FIELD_DOCS = [
+    ("Glass Cards", "frosted panels over a soft blur background"),
+    ("Soft Shadows", "glass like depth with layered blur and glow"),
+    ("Minimal Grid", "plain white cards"),
+]
+
+
+def test_bm25f_field_weight_decides_ranking():
+    by_name = _fit_bm25f(FIELD_DOCS, field_weights={"name": 5.0})
+    by_notes = _fit_bm25f(FIELD_DOCS, field_weights={"name": 0.1})
+    assert by_name.score("glass blur")[0][0] == 0
+    assert by_notes.score("glass blur")[0][0] == 1
+
+
+def test_bm25f_zero_weight_field_is_ignored():
+    bm25 = _fit_bm25f(FIELD_DOCS, field_weights={"notes": 0})
+    assert bm25.score("frosted") == []
+    assert [idx for idx, _ in bm25.score("cards")] == [0]
+
+
+def test_bm25f_per_field_length_normalization():
+    docs = [("Cards", "cards"), ("Cards", "cards " + "filler " * 30)]
+    normalized = _fit_bm25f(docs, field_b={"notes": 1.0})
+    unnormalized = _fit_bm25f(docs, field_b={"notes": 0.0})
+    assert normalized.score("cards")[0][1] > normalized.score("cards")[1][1]
+    assert unnormalized.score("cards")[0][1] == unnormalized.score("cards")[1][1]
+
+
+def test_bm25f_roundtrip_reapplies_weights():
+    bm25 = _fit_bm25f(FIELD_DOCS, field_weights={"name": 5.0})
+    assert BM25F.from_dict(bm25.to_dict(), {"name": 5.0}).score("glass blur") == bm25.score("glass blur")
+    assert BM25F.from_dict(bm25.to_dict(), {"name": 0.1}).score("glass blur")[0][0] == 1
+
+
+def test_bm25f_scores_stay_below_max_score():
+    bm25 = _fit_bm25f(FIELD_DOCS * 3, field_weights={"name": 8.0})
+    tokens = bm25.tokenize("glass cards blur")
+    assert all(score < bm25.max_score(tokens) for _, score in bm25.score_tokens(tokens))
+
+
+def test_field_weight_change_reuses_on_disk_index(data_dir, monkeypatch):
+    core.search("glassmorphism", "style")
+
+    def fail_build(*args, **kwargs):
+        raise AssertionError("reweighting should not re-tokenize the CSV")
+
+    monkeypatch.setattr(core, "_build_index", fail_build)
+    monkeypatch.setitem(core.CSV_CONFIG["style"], "field_weights", {"Style Category": 1.0})
+    core.clear_caches()
+    assert core.search("glassmorphism", "style")["count"] > 0
+
+
+def test_style_name_outranks_keyword_mentions(data_dir):
+    results = core.search("brutalism", "style", 3)["results"]
+    assert results[0]["Style Category"] == "Brutalism"
+
+
+# ============ PHRASES ============
+PHRASE_DOCS = ["dark mode toggle", "dark mode colors", "mode of a dark room", "light mode toggle"]
+
+
+def test_adjacent_query_words_score_as_phrase():
+    plain, phrased = BM25(), BM25(phrases=True)
+    plain.fit(PHRASE_DOCS)
+    phrased.fit(PHRASE_DOCS)
+    assert phrased.doc_lengths == plain.doc_lengths
+    assert "dark mode" in phrased.postings and "dark mode" not in plain.postings
+    scores = dict(phrased.score("dark mode"))
+    assert scores[0] > dict(plain.score("dark mode"))[0]
+    assert scores[0] > scores[2]
+    assert BM25.from_dict(phrased.to_dict()).score("dark mode") == phrased.score("dark mode")
+
+
+def test_phrases_below_min_df_are_dropped():
+    bm25 = BM25(phrases=True)
+    bm25.fit(PHRASE_DOCS)
+    assert "mode toggle" in bm25.postings
+    assert "light mode" not in bm25.postings and "dark room" not in bm25.postings
+
+
+def test_bm25f_phrases_stay_within_fields():
+    bm25 = _fit_bm25f([("Dark Mode", "toggle"), ("Dark Mode", "colors"), ("Dark", "mode")], phrases=True)
+    assert set(bm25.postings["dark mode"]) == {0, 1}
+    assert bm25.field_lengths["name"] == [2, 2, 1]
+
+
+def test_missing_phrases_do_not_raise_max_score():
+    bm25 = BM25(phrases=True)
+    bm25.fit(PHRASE_DOCS)
+    tokens = bm25.tokenize("toggle colors")
+    assert bm25.max_score(bm25.query_terms(tokens)) == bm25.max_score(tokens)
+
+
+# ============ NUMPY BACKEND ============
+needs_numpy = pytest.mark.skipif(core._numpy() is None, reason="NumPy not installed")
+
+def test_import_core_leaves_numpy_unloaded():
+    # NumPy costs ~100 ms to import, so only a scoring call that needs it may load it
+    code = "import sys, core; print('numpy' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(core.__file__).parent, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+VECTOR_DOCS = ["card %d hover shadow" % i if i % 3 else "card %d hover" % i for i in range(40)] + ["dark mode toggle"] * 3
+
+
+def _scores_per_backend(bm25, queries, monkeypatch):
+    results = {}
+    for backend in ("python", "numpy"):
+        monkeypatch.setattr(core, "SCORING_BACKEND", backend)
+        results[backend] = [bm25.score(query, k) for query in queries for k in (None, 0, 1, 3, 100)]
+    return results
+
+
+@needs_numpy
+def test_numpy_backend_matches_python_exactly(monkeypatch):
+    bm25 = BM25()
+    bm25.fit(VECTOR_DOCS)
+    queries = ["card hover shadow", "dark", "dark dark toggle", "unknown", ""]
+    results = _scores_per_backend(bm25, queries, monkeypatch)
+    assert results["numpy"] == results["python"]
+
+
+@needs_numpy
+def test_numpy_backend_matches_bm25f(monkeypatch):
+    bm25 = _fit_bm25f(FIELD_DOCS * 4, field_weights={"name": 5.0})
+    results = _scores_per_backend(bm25, ["glass blur", "cards"], monkeypatch)
+    assert results["numpy"] == results["python"]
+
+
+@needs_numpy
+def test_numpy_batch_scores_match_single_queries(monkeypatch):
+    monkeypatch.setattr(core, "SCORING_BACKEND", "numpy")
+    monkeypatch.setattr(core._VectorIndex, "BATCH_CELLS", 50)
+    bm25 = BM25()
+    bm25.fit(VECTOR_DOCS)
+    queries = [bm25.tokenize(q) for q in ("card hover", "toggle", "nothing here", "shadow card 7")]
+    assert bm25.score_batch(queries, 3) == [bm25.score_tokens(q, 3) for q in queries]
+
+
+@needs_numpy
+def test_auto_backend_vectorizes_large_indexes_only(monkeypatch):
+    monkeypatch.setattr(core, "VECTOR_MIN_DOCS", 10)
+    small, large = BM25(), BM25()
+    small.fit(VECTOR_DOCS[:5])
+    large.fit(VECTOR_DOCS)
+    assert small._vector_index() is None
+    assert large._vector_index() is not None
+
+
+def test_numpy_backend_falls_back_without_numpy(monkeypatch):
+    monkeypatch.setattr(core, "_numpy", lambda: None)
+    monkeypatch.setattr(core, "SCORING_BACKEND", "numpy")
+    bm25 = BM25()
+    bm25.fit(VECTOR_DOCS)
+    assert bm25._vector_index() is None
+    assert bm25.score_batch([["card"], ["toggle"]], 2) == [bm25.score("card", 2), bm25.score("toggle", 2)]
+
+
+# ============ ROW STORE ============
+@pytest.mark.parametrize("name", ["styles.csv", "ux-guidelines.csv", "stacks/react.csv"])
+def test_column_rows_match_dict_reader(data_dir, name):
+    with open(data_dir / name, 'r', encoding='utf-8') as f:
+        expected = list(csv.DictReader(f))
+    rows = core._load_csv(data_dir / name)
+    assert len(rows) == len(expected)
+    assert list(rows) == expected
+    assert rows[-1] == expected[-1] and rows[2:5] == expected[2:5]
+    assert rows.column("No") == [row["No"] for row in expected]
+
+
+def test_column_rows_ragged_csv(tmp_path):
+    path = tmp_path / "ragged.csv"
+    path.write_text("A,B,A2\n1,x,y\n\n2,x\n3,x,z,extra,more\n", encoding="utf-8")
+    with open(path, 'r', encoding='utf-8') as f:
+        expected = list(csv.DictReader(f))
+    rows = core._load_csv(path)
+    assert list(rows) == expected
+    assert rows.column("B") == ["x", "x", "x"]
+    assert rows.column("Missing") == ["", "", ""]
+    # Repeated values are stored once per column
+    assert len(rows._values[1]) == 1
+
+
+# ============ INDEX PERSISTENCE ============
+def test_index_written_on_first_search(data_dir):
+    core.search("glassmorphism", "style")
+    assert (data_dir / core.INDEX_DIRNAME / "styles.json").exists()
+
+
+def test_stack_index_path_is_namespaced(data_dir):
+    core.search_stack("state hooks", "react")
+    assert (data_dir / core.INDEX_DIRNAME / "stacks__react.json").exists()
+
+
+@pytest.mark.parametrize("domain,query", [
+    ("style", "glassmorphism dark"),
+    ("ux", "animation accessibility"),
+    ("typography", "elegant luxury serif"),
+])
+def test_cached_index_matches_fresh_build(data_dir, domain, query):
+    first = core.search(query, domain, 5)
+    second = core.search(query, domain, 5)
+    expected = _fresh_search(query, domain, 5)
+    col = core.CSV_CONFIG[domain]["output_cols"][0]
+    assert [r[col] for r in first["results"]] == expected
+    assert second == first
+
+
+def test_index_rebuilt_when_csv_changes(data_dir):
+    assert core.search("zorblaxian", "color")["count"] == 0
+    csv_file = data_dir / "colors.csv"
+    with open(csv_file, "a", encoding="utf-8") as f:
+        f.write('999,Zorblaxian Widgets,#000000,#111111,#222222,#FFFFFF,#333333,#444444,zorblaxian palette\n')
+    stat = csv_file.stat()
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    result = core.search("zorblaxian", "color")
+    assert result["count"] == 1
+    assert result["results"][0]["Product Type"] == "Zorblaxian Widgets"
+
+
+def test_touched_but_unchanged_csv_reuses_index(data_dir, monkeypatch):
+    core.search("saas", "product")
+    csv_file = data_dir / "products.csv"
+    stat = csv_file.stat()
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def fail_build(*args, **kwargs):
+        raise AssertionError("index should not be rebuilt for an unchanged CSV")
+
+    monkeypatch.setattr(core, "_build_index", fail_build)
+    assert core.search("saas", "product")["count"] > 0
+
+
+def test_corrupt_index_is_rebuilt(data_dir):
+    core.search("hero", "landing")
+    index_file = data_dir / core.INDEX_DIRNAME / "landing.json"
+    index_file.write_text("{not json", encoding="utf-8")
+    core.clear_caches()
+    assert core.search("hero", "landing")["count"] > 0
+    assert core._read_json(index_file)["version"] == core.INDEX_VERSION
+
+
+def test_build_indexes_covers_every_domain_and_stack(data_dir):
+    built = core.build_indexes()
+    assert len(built) == len(core.CSV_CONFIG) + len(core.STACK_CONFIG)
+
+
+# ============ WARM CACHE ============
+def test_warm_cache_reused_between_searches(data_dir, monkeypatch):
+    core.search("hero", "landing")
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError("warm index should be reused")
+
+    monkeypatch.setattr(core, "_load_index", fail_load)
+    monkeypatch.setattr(core, "_load_csv", fail_load)
+    assert core.search("pricing", "landing")["count"] > 0
+
+
+def test_audit_page_returns_copies_of_cached_rows(data_dir):
+    first = core.audit_page("landing")
+    first["standard"]["Page Type"] = "mutated"
+    first["rules"][0]["Rule ID"] = "mutated"
+    second = core.audit_page("landing")
+    assert second["standard"]["Page Type"] != "mutated"
+    assert second["rules"][0]["Rule ID"] != "mutated"
+
+
+def _scan_audit(data_dir, page_type):
+    """Reference checklist: a linear scan of the three audit CSVs"""
+    _, match_types = core._page_type_key(page_type)
+    tables = {}
+    for name, file in core.AUDIT_FILES.items():
+        with open(data_dir / file, 'r', encoding='utf-8') as f:
+            tables[name] = list(csv.DictReader(f))
+    first = {name: next((row for row in tables[name] if row["Page Type"].lower() in match_types), None) for name in ("standard", "seo")}
+    rules = [row for row in tables["rules"] if row["Page Type"].lower() in match_types | {"global", "any"}]
+    return first["standard"], first["seo"], rules
+
+
+@pytest.mark.parametrize("page_type", ["landing", "Landing Page", "dashboard", "pdp", "search", "404 error", "Global", "unknown"])
+def test_audit_index_matches_linear_scan(data_dir, page_type):
+    result = core.audit_page(page_type)
+    assert (result["standard"], result["seo"], result["rules"]) == _scan_audit(data_dir, page_type)
+    assert result["total_checks"] == len(result["rules"])
+
+
+def test_audit_index_reused_from_disk_until_a_csv_changes(data_dir, monkeypatch):
+    expected = core.audit_page("checkout")
+    assert (data_dir / core.INDEX_DIRNAME / core.AUDIT_INDEX_FILE).exists()
+    core.clear_caches()
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError("stored audit index should be reused")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(core, "_load_csv", fail_load)
+        assert core.audit_page("checkout") == expected
+
+    def drop_checkout_rules(rows):
+        rows[:] = [row for row in rows if row[2] != "Checkout"]
+
+    _edit_rows(data_dir / core.AUDIT_FILES["rules"], drop_checkout_rules)
+    assert core.audit_page("checkout")["rules"] == _scan_audit(data_dir, "checkout")[2]
+    assert core.audit_page("checkout")["total_checks"] < expected["total_checks"]
+
+
+# ============ INCREMENTAL UPDATES ============
+def _edit_rows(path, edit):
+    """Rewrite a CSV through edit(rows) (header excluded) and move its mtime forward"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        header, *rows = list(csv.reader(f))
+    edit(rows)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerows([header] + rows)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _index_state(bm25):
+    state = (bm25.N, bm25.doc_lengths, bm25.avgdl, bm25.postings, bm25.idf, bm25.doc_norms)
+    return state + ((bm25.field_postings, bm25.field_lengths) if isinstance(bm25, BM25F) else ())
+
+
+def _edit_insert_delete(rows):
+    rows[3] = [cell + " zorblaxian dark mode" for cell in rows[3]]
+    rows.insert(7, list(rows[0]))
+    del rows[-2]
+
+
+def _fail_build(*args, **kwargs):
+    raise AssertionError("a few edited rows should patch the index, not rebuild it")
+
+
+@pytest.mark.parametrize("warm", [True, False])
+@pytest.mark.parametrize("domain", ["style", "ux"])
+def test_edited_rows_patch_index_like_fresh_build(data_dir, monkeypatch, domain, warm):
+    config = core.CSV_CONFIG[domain]
+    filepath = data_dir / config["file"]
+    args = (filepath, config["search_cols"], core._tokenizer_name(config), core._field_spec(config))
+    build = core._build_index
+    core.search("dark mode", domain)
+    _edit_rows(filepath, _edit_insert_delete)
+    if not warm:
+        core.clear_caches()
+
+    monkeypatch.setattr(core, "_build_index", _fail_build)
+    assert core.search("zorblaxian", domain)["count"] == 1
+    fresh = _index_state(build(*args))
+    assert _index_state(core._load_corpus(filepath, config)[0]) == fresh
+    stored = core._read_json(core._index_path(filepath))["bm25"]
+    assert _index_state(core._index_from_dict(stored, core._field_spec(config))) == fresh
+
+
+@pytest.mark.parametrize("warm", [True, False])
+def test_output_column_edit_keeps_index_like_fresh_build(data_dir, monkeypatch, warm):
+    config = core.CSV_CONFIG["style"]
+    filepath = data_dir / config["file"]
+    assert "Primary Colors" not in config["search_cols"]
+    args = (filepath, config["search_cols"], core._tokenizer_name(config), core._field_spec(config))
+    build = core._build_index
+    before = core.search("glassmorphism", "style")
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        column = next(csv.reader(f)).index("Primary Colors")
+
+    def edit_colors(rows):
+        rows[0][column] = "#123456"
+    _edit_rows(filepath, edit_colors)
+    if not warm:
+        core.clear_caches()
+
+    monkeypatch.setattr(core, "_build_index", _fail_build)
+    assert core.search("glassmorphism", "style")["count"] == before["count"] > 0
+    assert _index_state(core._load_corpus(filepath, config)[0]) == _index_state(build(*args))
+
+
+def test_mostly_rewritten_csv_is_rebuilt(data_dir, monkeypatch):
+    core.search("hero", "landing")
+    _edit_rows(data_dir / "landing.csv", lambda rows: rows.reverse())
+    builds = []
+    build = core._build_index
+    monkeypatch.setattr(core, "_build_index", lambda *args: builds.append(args) or build(*args))
+    assert core.search("hero", "landing")["count"] > 0
+    assert len(builds) == 1
+
+
+def test_update_restores_phrase_lifted_to_min_df():
+    bm25 = BM25(phrases=True)
+    bm25.fit(["dark mode toggle", "light theme", "plain text", "dark room"])
+    assert "dark mode" not in bm25.postings
+    docs = ["dark mode toggle", "dark mode colors", "plain text", "dark room"]
+    patched = copy.copy(bm25)
+
+    def cells_of(idx):
+        return [patched.tokenize(docs[idx])]
+
+    patched.update([(1, 2, [cells_of(1)])], cells_of)
+    fresh = BM25(phrases=True)
+    fresh.fit(docs)
+    assert patched.postings["dark mode"] == {0: 1, 1: 1}
+    assert _index_state(patched) == _index_state(fresh)
+    # The original index is untouched, so searches running on it stay valid
+    assert bm25.postings["light"] == {1: 1} and "dark mode" not in bm25.postings
+
+
+def test_refresh_indexes_patches_edited_csv(data_dir, monkeypatch):
+    core.build_indexes()
+    assert core.refresh_indexes() == []
+    _edit_rows(data_dir / "colors.csv", lambda rows: rows.append([rows[0][0], "Zorblaxian Widgets"] + rows[0][2:]))
+    monkeypatch.setattr(core, "_build_index", _fail_build)
+    assert core.refresh_indexes() == ["colors.csv"]
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError("refreshed index should be current")
+
+    monkeypatch.setattr(core, "_load_index", fail_load)
+    assert core.search("zorblaxian", "color")["results"][0]["Product Type"] == "Zorblaxian Widgets"
+
+
+def test_watch_reports_edits_until_stopped(data_dir):
+    stop, changed = threading.Event(), []
+
+    def on_change(names):
+        changed.extend(names)
+        stop.set()
+
+    watcher = threading.Thread(target=core.watch, args=(0.01, stop, on_change))
+    watcher.start()
+    try:
+        # Edit only once the initial build has warmed every index
+        while len(core._CORPUS_CACHE) < len(core._corpus_sources()) and watcher.is_alive():
+            stop.wait(0.01)
+        _edit_rows(data_dir / "typography.csv", lambda rows: rows.pop())
+        assert stop.wait(10)
+    finally:
+        stop.set()
+        watcher.join()
+    assert changed == ["typography.csv"]
+
+
+# ============ BATCH SEARCH ============
+def test_search_batch_preserves_order_and_matches_single_calls(data_dir):
+    records = [
+        {"query": "glassmorphism", "domain": "style", "max_results": 2},
+        {"query": "hooks state", "stack": "react"},
+        {"query": "elegant serif", "domain": "typography", "id": 7},
+        {"query": "dark mode toggle"},
+    ] * 5
+    results = list(core.search_batch(iter(records), workers=3))
+    assert len(results) == len(records)
+    assert results[0] == core.search("glassmorphism", "style", 2)
+    assert results[1] == core.search_stack("hooks state", "react")
+    assert results[2] == dict(core.search("elegant serif", "typography"), id=7)
+    assert results[3] == core.search("dark mode toggle")
+    assert results[4:8] == results[0:4]
+
+
+def test_search_batch_indexes_each_csv_once(data_dir, monkeypatch):
+    calls = []
+    original = core._load_index
+
+    def counting_load_index(filepath, *args):
+        calls.append(filepath.name)
+        return original(filepath, *args)
+
+    monkeypatch.setattr(core, "_load_index", counting_load_index)
+    records = [{"query": q, "domain": d} for q in ("card", "hover", "modal", "focus") for d in ("component", "animation", "a11y")]
+    list(core.search_batch(records, workers=4))
+    assert sorted(calls) == ["accessibility.csv", "animations.csv", "components.csv"]
+
+
+def test_search_batch_reports_bad_records(data_dir):
+    results = list(core.search_batch([None, {"domain": "style"}, {"query": "x", "domain": "nope"}]))
+    assert all("error" in r for r in results)
+    assert "Unknown domain" in results[2]["error"]
+
+
+def test_search_batch_streams_past_malformed_records(data_dir):
+    records = [
+        {"query": "glassmorphism", "domain": "style"},
+        {"query": "x", "max_results": "3", "id": 1},
+        {"query": 5},
+        {"stack": ["react"], "query": "hooks"},
+        {"query": "x", "max_results": None},
+        {"query": "x", "max_results": 0},
+        {"query": "x", "domain": ["style"]},
+        {"query": "hooks state", "stack": "react"},
+    ]
+    results = list(core.search_batch(iter(records), workers=2))
+    assert results[0] == core.search("glassmorphism", "style")
+    assert all("error" in result for result in results[1:7])
+    assert results[1]["id"] == 1
+    assert results[7] == core.search_stack("hooks state", "react")
+
+
+# ============ DOMAIN ROUTER ============
+def test_router_routes_past_generic_words(data_dir):
+    assert core.detect_domain("sign in page") == "auth"
+    assert core.detect_domain("required sections for page type") == "page-standards"
+    assert core.detect_domain("keyboard focus indicator") == "a11y"
+    assert [domain for domain, _ in core.route_domains("focus", 2)] == ["a11y", "web"]
+
+
+def test_route_confidences_are_ranked_shares(data_dir):
+    ranked = core.route_domains("dark mode toggle button")
+    assert ranked[0][0] == "darkmode"
+    assert abs(sum(confidence for _, confidence in ranked) - 1) < 0.01
+    assert [c for _, c in ranked] == sorted((c for _, c in ranked), reverse=True)
+
+
+def test_router_unpacks_term_weights_on_use():
+    router = core.DomainRouter.fit({"color": [{"hex", "palette"}, {"hex"}], "chart": [{"bar"}, {"hex"}]})
+    assert router.term_weights == {"palette": "color:0.3466", "bar": "chart:0.3466"}
+    assert router.weights("palette") == [("color", 0.3466)] and router.weights("hex") == []
+    stored = core.DomainRouter.from_dict(json.loads(json.dumps(router.to_dict())))
+    assert stored.route("hex palette") == router.route("hex palette") == [("color", 1.0)]
+
+
+def test_router_keywords_match_whole_words(data_dir):
+    router = core._load_router()
+    assert router._keywords("quick build guide") == []
+    assert router._keywords("bar charts in next.js") == ["bar", "chart", "next.js"]
+    assert router._keywords("sign in page for #fff") == ["#", "sign in"]
+
+
+def test_unmatched_query_falls_back_to_style(data_dir):
+    assert core.route_domains("qwxz") == []
+    assert core.detect_domain("qwxz") == "style"
+    assert [route["domain"] for route in core.search_routed("qwxz")["routes"]] == ["style"]
+
+
+def test_router_persisted_and_refit_on_csv_change(data_dir, monkeypatch):
+    core.route_domains("glassmorphism")
+    assert (data_dir / core.INDEX_DIRNAME / core.ROUTER_FILE).exists()
+
+    core.clear_caches()
+    build_router = core._build_router
+    monkeypatch.setattr(core, "_build_router", lambda *args: pytest.fail("router should load from disk"))
+    assert core.detect_domain("glassmorphism") == "style"
+
+    monkeypatch.setattr(core, "_build_router", build_router)
+    with open(data_dir / "icons.csv", 'a', encoding='utf-8') as f:
+        f.write("\n999,Zorblax,zorblax,zorblax,Lucide,zorblax,zorblax,zorblax,Outline\n")
+    assert core.detect_domain("zorblax") == "icons"
+
+
+def test_search_routed_matches_individual_searches(data_dir):
+    result = core.search_routed("focus ring contrast", 3, 2)
+    routes = core.route_domains("focus ring contrast", 3)
+    assert [(r["domain"], r["confidence"]) for r in result["routes"]] == routes
+    for route in result["routes"]:
+        expected = core.search("focus ring contrast", route["domain"], 2)
+        assert {key: value for key, value in route.items() if key != "confidence"} == expected
+    assert result["count"] == sum(route["count"] for route in result["routes"])
+
+
+# ============ FUZZY MATCHING ============
+def test_edit_distance_counts_swaps_and_stops_at_limit():
+    assert core._edit_distance("tailwnd", "tailwind", 2) == 1
+    assert core._edit_distance("hvoer", "hover", 2) == 1
+    assert core._edit_distance("neumorphic", "neumorphism", 2) == 2
+    assert core._edit_distance("card", "modal", 1) == 2
+
+
+def test_fuzzy_index_expands_prefixes_and_typos():
+    index = core._FuzzyIndex({"tailwind": {0: 1}, "glassmorphism": {0: 1, 1: 1}, "glassmorphic": {2: 1}, "hover": {1: 1}})
+    assert index.nearest("tailwnd") == ["tailwind"]
+    assert index.nearest("glassmorph") == ["glassmorphism", "glassmorphic"]
+    assert index.nearest("hvoer") == ["hover"]
+    assert index.nearest("car") == []
+    assert index.nearest("zorblaxian") == []
+
+
+def test_fuzzy_expansion_is_bounded(monkeypatch):
+    monkeypatch.setattr(core, "FUZZY_MAX_EXPANSIONS", 2)
+    index = core._FuzzyIndex({f"hover{c}": {0: 1} for c in "abcdef"})
+    assert index.nearest("hover") == ["hovera", "hoverb"]
+
+
+def test_search_expands_typos_not_missing_words(data_dir):
+    assert core.search("glassmorph", "style")["results"][0]["Style Category"] == "Glassmorphism"
+    assert core.search("healtcare", "product")["results"][0]["Product Type"] == "Healthcare App"
+    info = core.fuzzy_info()
+    assert info["queries"] == 2 and info["expanded_queries"] == 2 and info["expanded_tokens"] == 2
+    # "footer" is a navigation word, so style keeps it unexpanded (and finds nothing)
+    assert core.search("footer", "style")["count"] == 0
+    assert core.fuzzy_info()["unmatched_tokens"] == 2
+
+
+def test_expansion_follows_edits_to_other_domains(data_dir):
+    style = core.CSV_CONFIG["style"]
+    bm25, _ = core._load_corpus(data_dir / style["file"], style)
+    tokens, expansions = core._expand_query(bm25, ["glassmorph"])
+    assert "glassmorphism" in tokens and expansions["glassmorph"]
+    # A typography row makes "glassmorph" a real word, so style keeps it as it is
+    with open(data_dir / "typography.csv", "a", encoding="utf-8") as f:
+        f.write('999,Glassmorph Duo,Sans + Sans,Inter,Inter,"frosted, layered",Dashboards,,,,\n')
+    assert core._expand_query(bm25, ["glassmorph"]) == (["glassmorph"], {})
+    assert core.search("glassmorph", "style")["count"] == 0
+    assert core.search("glassmorph", "typography")["count"] == 1
+
+
+def test_fuzzy_matching_can_be_disabled(data_dir, monkeypatch):
+    monkeypatch.setattr(core, "FUZZY_MATCHING", False)
+    assert core.search("glassmorph", "style")["count"] == 0
+    assert core.fuzzy_info()["expanded_queries"] == 0
+
+
+# ============ FEDERATED SEARCH ============
+def test_search_all_merges_domains_with_labels(data_dir):
+    result = core.search_all("dark mode toggle", 8)
+    assert result["domain"] == "all"
+    assert 0 < result["count"] <= 8
+    scores = [item["score"] for item in result["results"]]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0 < score < 1 for score in scores)
+    for item in result["results"]:
+        if item["domain"] == "stack":
+            assert item["stack"] in core.STACK_CONFIG
+        else:
+            assert item["domain"] in core.CSV_CONFIG
+            assert item["file"] == core.CSV_CONFIG[item["domain"]]["file"]
+
+
+def test_search_all_single_domain_keeps_domain_order(data_dir):
+    merged = core.search_all("glassmorphism blur", 3, domains=["style"], stacks=[])
+    assert [item["result"] for item in merged["results"]] == core.search("glassmorphism blur", "style", 3)["results"]
+
+
+def test_search_all_restricts_to_stacks(data_dir):
+    result = core.search_all("hooks state", 5, domains=[], stacks=["react", "vue"])
+    assert {item["stack"] for item in result["results"]} <= {"react", "vue"}
+
+
+def test_search_all_rejects_unknown_corpus(data_dir):
+    assert "error" in core.search_all("x", domains=["nope"])
+
+
+def test_search_all_no_match(data_dir):
+    assert core.search_all("zzzqqq xxyyzz")["count"] == 0
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_search_domains_matches_individual_searches(data_dir, workers):
+    limits = {"style": 3, "color": 2, "landing": 2, "typography": 1}
+    grouped = core.search_domains("saas dashboard modern", limits, workers)
+    assert list(grouped) == list(limits)
+    for domain, max_results in limits.items():
+        assert grouped[domain] == core.search("saas dashboard modern", domain, max_results)
+
+
+# ============ RESULT CACHE ============
+def test_repeat_search_hits_result_cache(data_dir):
+    core.search("glassmorphism dark", "style")
+    before = core.search_cache_info()
+    core.search("Glassmorphism, DARK!", "style")
+    after = core.search_cache_info()
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"]
+
+
+def test_result_cache_returns_independent_copies(data_dir):
+    first = core.search("hero", "landing")
+    first["results"][0]["Pattern Name"] = "mutated"
+    assert core.search("hero", "landing")["results"][0]["Pattern Name"] != "mutated"
+
+
+def test_result_cache_keys_on_limit_and_domain(data_dir):
+    core.search("card hover", "component", 1)
+    core.search("card hover", "component", 3)
+    core.search_stack("card hover", "react", 1)
+    assert core.search_cache_info()["hits"] == 0
+
+
+def test_result_cache_misses_after_csv_edit(data_dir):
+    core.search("zorblaxian", "color")
+    csv_file = data_dir / "colors.csv"
+    with open(csv_file, "a", encoding="utf-8") as f:
+        f.write('999,Zorblaxian Widgets,#000000,#111111,#222222,#FFFFFF,#333333,#444444,zorblaxian palette\n')
+    assert core.search("zorblaxian", "color")["count"] == 1
+
+
+def test_cached_typo_expansion_follows_other_domains(data_dir):
+    assert core.search("glassmorph", "style")["count"] > 0
+    assert core.search("glassmorph", "style")["count"] > 0
+    assert core.search_cache_info()["hits"] == 1
+    # Once colors.csv knows "glassmorph", the router keeps it as a real word style lacks
+    with open(data_dir / "colors.csv", "a", encoding="utf-8") as f:
+        f.write('999,Glassmorph Studio,#000000,#111111,#222222,#FFFFFF,#333333,#444444,frosted palette\n')
+    assert core.search("glassmorph", "style")["count"] == 0
+
+
+def test_result_cache_is_bounded_lru(data_dir, monkeypatch):
+    monkeypatch.setattr(core._RESULT_CACHE, "maxsize", 2)
+    core.search("hero", "landing")
+    core.search("pricing", "landing")
+    core.search("hero", "landing")
+    core.search("testimonial", "landing")
+    assert core.search_cache_info()["size"] == 2
+    hits = core.search_cache_info()["hits"]
+    core.search("hero", "landing")
+    assert core.search_cache_info()["hits"] == hits + 1
+    core.search("pricing", "landing")
+    assert core.search_cache_info()["hits"] == hits + 1
+
+
+def test_invalidate_search_cache(data_dir):
+    core.search("hero", "landing")
+    core.invalidate_search_cache()
+    assert core.search_cache_info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": core._RESULT_CACHE.maxsize}
+    core.search("hero", "landing")
+    assert core.search_cache_info()["misses"] == 1
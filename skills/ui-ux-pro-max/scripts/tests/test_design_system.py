@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Tests for design_system.py"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import core
+import design_system
+
+
+@pytest.mark.parametrize("query", ["SaaS dashboard", "beauty spa wellness service", "gaming", "zzzqqq"])
+def test_parallel_generate_matches_sequential(data_dir, query):
+    sequential = design_system.DesignSystemGenerator().generate(query, workers=1)
+    core.clear_caches()
+    parallel = design_system.DesignSystemGenerator().generate(query, workers=4)
+    assert json.dumps(parallel) == json.dumps(sequential)
+
+
+def test_parallel_page_overrides_match_sequential(data_dir, monkeypatch):
+    ds = design_system.DesignSystemGenerator().generate("fintech crypto", workers=1)
+    monkeypatch.setattr(design_system, "GENERATE_WORKERS", 1)
+    sequential = design_system._generate_intelligent_overrides("checkout", "fintech crypto", ds)
+    core.clear_caches()
+    monkeypatch.setattr(design_system, "GENERATE_WORKERS", 4)
+    assert design_system._generate_intelligent_overrides("checkout", "fintech crypto", ds) == sequential
+
+
+def _scan_reasoning(rules, category):
+    """Reference lookup: the exact, partial and keyword passes over every rule"""
+    category = category.lower()
+    names = [rule["UI_Category"].lower() for rule in rules]
+    for matches in (lambda name: name == category,
+                    lambda name: name in category or category in name,
+                    lambda name: any(kw in category for kw in name.replace("/", " ").replace("-", " ").split())):
+        for rule, name in zip(rules, names):
+            if matches(name):
+                return rule
+    return {}
+
+
+@pytest.mark.parametrize("category", ["SaaS (General)", "saas", "Fintech Crypto Wallet", "Luxury Beauty", "Pet Tech", "", "zzz"])
+def test_reasoning_index_matches_linear_scan(category):
+    generator = design_system.DesignSystemGenerator()
+    assert generator._find_reasoning_rule(category) == _scan_reasoning(generator.reasoning_data, category)
+
+
+def test_reasoning_index_shared_until_csv_changes(data_dir, monkeypatch):
+    monkeypatch.setattr(design_system, "DATA_DIR", data_dir)
+    first = design_system.DesignSystemGenerator()
+    assert design_system.DesignSystemGenerator().reasoning is first.reasoning
+    reasoning = first._apply_reasoning("SaaS (General)", {})
+    reasoning["decision_rules"]["mutated"] = True
+    assert "mutated" not in first._apply_reasoning("SaaS (General)", {})["decision_rules"]
+
+    path = data_dir / design_system.REASONING_FILE
+    stat = path.stat()
+    path.write_text(path.read_text(encoding="utf-8").replace("SaaS (General)", "SaaS (Generic)"), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    edited = design_system.DesignSystemGenerator()
+    assert edited.reasoning is not first.reasoning
+    assert edited._find_reasoning_rule("saas (generic)")["UI_Category"] == "SaaS (Generic)"
+
+
+def test_decision_rules_are_parsed_on_first_use(monkeypatch):
+    rules = [{"UI_Category": "Alpha", "Decision_Rules": '{"if_dark": "contrast"}'},
+             {"UI_Category": "Beta", "Decision_Rules": "not json"},
+             {"UI_Category": "Gamma", "Decision_Rules": "[1, 2]"}]
+    loads, real_loads = [], json.loads
+    monkeypatch.setattr(json, "loads", lambda text: loads.append(text) or real_loads(text))
+    index = design_system.ReasoningIndex(rules)
+    assert loads == []
+    assert index.decision_rules(rules[0]) == {"if_dark": "contrast"}
+    assert index.decision_rules(rules[0]) is index.decision_rules(rules[0])
+    assert index.decision_rules(rules[1]) == {} and index.decision_rules(rules[2]) == {}
+    assert index.decision_rules({}) == {}
+    assert len(loads) == 4
+
+
+def test_bulk_generation_matches_single_briefs_in_order(data_dir, tmp_path):
+    briefs = [{"query": "SaaS dashboard", "project_name": "Alpha", "page": "dashboard", "id": 1},
+              {"query": "beauty spa wellness service"},
+              {"project_name": "no query"},
+              {"query": 5, "id": 4},
+              {"query": "SaaS", "project_name": "../../escaped"},
+              {"query": "SaaS", "project_name": "Beta", "page": ["home", "../escaped"]},
+              {"query": "fintech crypto", "project_name": "Gamma", "page": "checkout"}]
+    output_dir = tmp_path / "out"
+    results = list(design_system.generate_design_systems(iter(briefs), persist=True, output_dir=str(output_dir), workers=3))
+    assert [result.get("query") for result in results] == ["SaaS dashboard", "beauty spa wellness service",
+                                                           None, None, None, None, "fintech crypto"]
+    assert results[0]["id"] == 1 and results[3]["id"] == 4
+    assert all("error" in result for result in results[2:6])
+    for brief, result in zip(briefs, results):
+        if "error" not in result:
+            assert result["output"] == design_system.generate_design_system(brief["query"], brief.get("project_name"))
+    assert results[0]["files"] == [str(output_dir / "design-system" / "alpha" / "MASTER.md"),
+                                   str(output_dir / "design-system" / "alpha" / "pages" / "dashboard.md")]
+    assert all(Path(path).exists() for result in results if "files" in result for path in result["files"])
+    # Nothing from the rejected briefs is written, inside the output directory or out of it
+    assert not [path for path in tmp_path.rglob("*") if "escaped" in path.name]
+    assert not (output_dir / "design-system" / "beta").exists()
+
+
+def test_default_project_name_from_a_query_with_a_slash(data_dir, tmp_path):
+    briefs = [{"query": "A/B testing dashboard"}, {"query": "SaaS", "project_name": "A/B"}]
+    results = list(design_system.generate_design_systems(briefs, persist=True, output_dir=str(tmp_path), workers=1))
+    assert results[0]["project_name"] == "A/B TESTING DASHBOARD"
+    assert results[0]["files"] == [str(tmp_path / "design-system" / "a-b-testing-dashboard" / "MASTER.md")]
+    # A name the caller gives must still be a plain name
+    assert "error" in results[1]
+
+
+def test_bulk_generation_reports_a_failing_brief_and_continues(data_dir, monkeypatch):
+    generate = design_system.DesignSystemGenerator.generate
+
+    def failing(self, query, project_name=None, workers=None):
+        if query == "boom":
+            raise RuntimeError("search failed")
+        return generate(self, query, project_name, workers)
+
+    monkeypatch.setattr(design_system.DesignSystemGenerator, "generate", failing)
+    briefs = [{"query": "SaaS dashboard"}, {"query": "boom", "id": "b"}, {"query": "fintech crypto"}]
+    results = list(design_system.generate_design_systems(briefs, workers=2))
+    assert results[1] == {"error": "RuntimeError: search failed", "id": "b"}
+    assert [result.get("query") for result in results] == ["SaaS dashboard", None, "fintech crypto"]
+
+
+def test_persist_rewrites_only_changed_files(data_dir, tmp_path, monkeypatch):
+    saas = design_system.DesignSystemGenerator().generate("SaaS dashboard", "Demo")
+    first = design_system.persist_design_system(saas, "dashboard", str(tmp_path), "SaaS dashboard")
+    assert first["changed_files"] == first["created_files"] and first["unchanged_files"] == []
+    master = Path(first["created_files"][0])
+    written = master.read_text(encoding="utf-8")
+
+    # Only the Generated timestamp differs on a rerun: nothing is rewritten
+    monkeypatch.setattr(design_system, "datetime", _LaterDatetime)
+    again = design_system.persist_design_system(saas, "dashboard", str(tmp_path), "SaaS dashboard")
+    assert again["changed_files"] == [] and again["unchanged_files"] == first["created_files"]
+    assert master.read_text(encoding="utf-8") == written
+
+    fintech = design_system.DesignSystemGenerator().generate("fintech crypto", "Demo")
+    changed = design_system.persist_design_system(fintech, None, str(tmp_path))
+    assert changed["changed_files"] == [str(master)]
+    assert "2099-01-01" in master.read_text(encoding="utf-8")
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_persist_many_pages_renders_master_once(data_dir, tmp_path, monkeypatch):
+    saas = design_system.DesignSystemGenerator().generate("SaaS dashboard", "Demo")
+    calls = []
+    render_master_md = design_system.render_master_md
+    monkeypatch.setattr(design_system, "render_master_md", lambda ds: calls.append(ds) or render_master_md(ds))
+    result = design_system.persist_design_system(saas, ["dashboard", "checkout", "Blog Post"], str(tmp_path), "SaaS dashboard")
+    assert len(calls) == 1
+    pages = tmp_path / "design-system" / "demo" / "pages"
+    assert result["created_files"][1:] == [str(pages / "dashboard.md"), str(pages / "checkout.md"), str(pages / "blog-post.md")]
+    assert (pages / "checkout.md").read_text(encoding="utf-8").startswith("# Checkout Page Overrides")
+
+
+def test_persist_over_changed_files_renders_each_once(data_dir, tmp_path, monkeypatch):
+    saas = design_system.DesignSystemGenerator().generate("SaaS dashboard", "Demo")
+    design_system.persist_design_system(saas, "dashboard", str(tmp_path), "SaaS dashboard")
+    calls = []
+    for name in ("render_master_md", "render_page_override_md"):
+        render = getattr(design_system, name)
+        monkeypatch.setattr(design_system, name, lambda *args, render=render, name=name: calls.append(name) or render(*args))
+
+    fintech = design_system.DesignSystemGenerator().generate("fintech crypto", "Demo")
+    changed = design_system.persist_design_system(fintech, "dashboard", str(tmp_path), "fintech crypto")
+    master = tmp_path / "design-system" / "demo" / "MASTER.md"
+    assert changed["changed_files"][0] == str(master)
+    assert calls == ["render_master_md", "render_page_override_md"]
+    assert _strip_generated(master.read_text(encoding="utf-8")) == _strip_generated(design_system.format_master_md(fintech))
+
+    calls.clear()
+    again = design_system.persist_design_system(fintech, "dashboard", str(tmp_path), "fintech crypto")
+    assert again["changed_files"] == [] and len(calls) == 2
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+class _LaterDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2099, 1, 1, 12, 0, 0)
+
+
+@pytest.mark.parametrize("render,format_", [("render_ascii_box", "format_ascii_box"), ("render_markdown", "format_markdown"),
+                                            ("render_master_md", "format_master_md")])
+def test_streaming_renderers_match_string_api(data_dir, render, format_):
+    import io
+    saas = design_system.DesignSystemGenerator().generate("SaaS dashboard", "Demo")
+    stream = io.StringIO()
+    design_system.write_rendered(getattr(design_system, render)(saas), stream)
+    expected = getattr(design_system, format_)(saas)
+    assert _strip_generated(stream.getvalue()) == _strip_generated(expected)
+
+
+def test_persisted_file_content_matches_string_api(data_dir, tmp_path):
+    saas = design_system.DesignSystemGenerator().generate("SaaS dashboard", "Demo")
+    files = design_system.persist_design_system(saas, "checkout", str(tmp_path), "SaaS dashboard")["created_files"]
+    assert _strip_generated(Path(files[0]).read_text(encoding="utf-8")) == _strip_generated(design_system.format_master_md(saas))
+    page = design_system.format_page_override_md(saas, "checkout", "SaaS dashboard")
+    assert _strip_generated(Path(files[1]).read_text(encoding="utf-8")) == _strip_generated(page)
+
+
+def _strip_generated(text):
+    return design_system._GENERATED_LINE.sub("", text)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Tests for evaluate.py"""
+
+import csv
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import evaluate
+import core
+
+
+# ============ METRICS ============
+def test_recall_at_k():
+    assert evaluate.recall_at_k(["a", "b", "c"], ["a", "c"], 2) == 0.5
+    assert evaluate.recall_at_k(["a", "b", "c"], ["a", "c"], 3) == 1.0
+
+
+def test_reciprocal_rank():
+    assert evaluate.reciprocal_rank(["x", "a"], ["a"]) == 0.5
+    assert evaluate.reciprocal_rank(["x", "y"], ["a"]) == 0.0
+
+
+def test_ndcg_prefers_expected_order():
+    assert evaluate.ndcg_at_k(["a", "b"], ["a", "b"], 2) == 1.0
+    swapped = evaluate.ndcg_at_k(["b", "a"], ["a", "b"], 2)
+    assert 0 < swapped < 1
+    assert evaluate.ndcg_at_k(["x"], ["a"], 1) == 0.0
+
+
+# ============ GOLDEN QUERIES ============
+def test_golden_rows_exist_in_data():
+    golden = evaluate.load_golden()
+    for case in golden["search"] + golden["search_stack"]:
+        if "domain" in case:
+            path = core.DATA_DIR / core.CSV_CONFIG[case["domain"]]["file"]
+        else:
+            path = core.DATA_DIR / core.STACK_CONFIG[case["stack"]]["file"]
+        with open(path, 'r', encoding='utf-8') as f:
+            names = {row[case["key"]] for row in csv.DictReader(f)}
+        assert set(case["expected"]) <= names, case["query"]
+    for case in golden["detect_domain"]:
+        assert case["expected"] in core.CSV_CONFIG
+
+
+def test_modes_keep_ranking_parity(data_dir):
+    golden = evaluate.load_golden()
+    golden = {section: cases[::4] for section, cases in golden.items()}
+    report = evaluate.evaluate_modes(golden=golden)
+    for mode, result in report["modes"].items():
+        assert result["parity"], (mode, result["mismatches"])
+
+
+def test_quality_floor(data_dir):
+    metrics = evaluate.evaluate(mode="warm")["metrics"]
+    assert metrics["search"]["recall@3"] >= 0.95
+    assert metrics["search_stack"]["recall@3"] >= 0.95
+    assert metrics["detect_domain"]["mrr"] >= 0.95
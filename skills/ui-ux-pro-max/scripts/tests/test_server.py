@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Tests for server.py"""
+
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import client
+import core
+import server
+
+
+@pytest.fixture
+def daemon(data_dir):
+    """Run the daemon in a background thread on a private socket."""
+    # AF_UNIX paths are length-limited, so keep the socket out of pytest's deep tmp_path
+    socket_path = Path(tempfile.mkdtemp()) / "search.sock"
+    ready = threading.Event()
+    thread = threading.Thread(target=server.serve, args=(socket_path, ready), daemon=True)
+    thread.start()
+    assert ready.wait(10)
+    yield socket_path
+    server.request({"op": "shutdown"}, socket_path)
+    thread.join(5)
+
+
+def test_dispatch_matches_direct_calls(data_dir):
+    assert server.dispatch({"op": "search", "query": "glassmorphism", "domain": "style"}) == core.search("glassmorphism", "style")
+    assert server.dispatch({"op": "search_stack", "query": "hooks", "stack": "react", "max_results": 2}) == core.search_stack("hooks", "react", 2)
+    assert server.dispatch({"op": "audit_page", "page_type": "landing"}) == core.audit_page("landing")
+    assert server.dispatch({"op": "search_routed", "query": "focus ring", "top_n": 2}) == core.search_routed("focus ring", 2)
+
+
+def test_dispatch_rejects_unknown_op():
+    with pytest.raises(ValueError, match="Unknown op"):
+        server.dispatch({"op": "nope"})
+
+
+def test_dispatch_reports_missing_fields():
+    with pytest.raises(ValueError, match="query"):
+        server.dispatch({"op": "search"})
+
+
+def test_client_forwards_without_loading_the_engine(daemon):
+    code = ("import sys, client; response = client.request({'op': 'ping'}, sys.argv[1]);"
+            "print(response['ok'], 'core' in sys.modules)")
+    result = subprocess.run([sys.executable, "-c", code, str(daemon)], cwd=Path(client.__file__).parent,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["True", "False"]
+
+
+def test_request_without_daemon_returns_none(tmp_path):
+    assert server.request({"op": "ping"}, tmp_path / "missing.sock") is None
+
+
+def test_default_socket_lives_in_a_private_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    socket_path = server.default_socket_path()
+    assert socket_path.parent == tmp_path / "ui-ux-pro-max"
+    server._private_dir(socket_path.parent)
+    assert stat.S_IMODE(os.stat(socket_path.parent).st_mode) == 0o700
+
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    os.chmod(shared, 0o777)
+    with pytest.raises(RuntimeError, match="not a private directory"):
+        server._private_dir(shared)
+
+
+def test_request_ignores_a_path_that_is_not_a_socket(tmp_path):
+    planted = tmp_path / "search.sock"
+    planted.write_text("")
+    assert server.request({"op": "ping"}, planted) is None
+
+
+def test_run_does_not_rerun_a_request_the_daemon_dropped(data_dir, monkeypatch):
+    # A listener that takes the request and closes without answering
+    socket_path = Path(tempfile.mkdtemp()) / "search.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(socket_path))
+    listener.listen(1)
+    thread = threading.Thread(target=lambda: listener.accept()[0].close(), daemon=True)
+    thread.start()
+    monkeypatch.setattr(server, "dispatch", lambda payload: pytest.fail("re-ran a sent request in-process"))
+    try:
+        with pytest.raises(RuntimeError, match="did not answer"):
+            client.run({"op": "search", "query": "hero"}, socket_path=socket_path, local=server.dispatch)
+    finally:
+        thread.join(5)
+        listener.close()
+
+
+def test_run_falls_back_to_in_process(data_dir, tmp_path):
+    result = client.run({"op": "search", "query": "hero", "domain": "landing"}, socket_path=tmp_path / "missing.sock")
+    assert result == core.search("hero", "landing")
+
+
+def test_daemon_round_trip(daemon):
+    assert stat.S_IMODE(os.stat(daemon).st_mode) & 0o077 == 0
+    response = server.request({"op": "search", "query": "glassmorphism", "domain": "style", "max_results": 2}, daemon)
+    assert response["ok"]
+    assert response["result"] == core.search("glassmorphism", "style", 2)
+
+    response = server.request({"op": "generate_design_system", "query": "SaaS dashboard", "project_name": "Demo"}, daemon)
+    assert response["ok"]
+    assert "TARGET: Demo" in response["result"]
+
+
+def test_daemon_reports_errors(daemon):
+    response = server.request({"op": "search_stack", "query": "x", "stack": "cobol"}, daemon)
+    assert response["ok"]
+    assert "error" in response["result"]
+
+    response = server.request({"op": "bogus"}, daemon)
+    assert not response["ok"]
+    assert "Unknown op" in response["error"]
+
+
+def test_daemon_refuses_second_instance(daemon):
+    with pytest.raises(RuntimeError, match="already listening"):
+        server.serve(daemon)
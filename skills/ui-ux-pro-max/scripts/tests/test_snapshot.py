@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Tests for snapshot.py"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import core
+import snapshot
+from snapshot import build_snapshot, load_table, open_snapshot, SnapshotRows
+
+
+@pytest.fixture
+def snap_path(data_dir):
+    path = data_dir / core.INDEX_DIRNAME / core.SNAPSHOT_FILE
+    build_snapshot(data_dir, path)
+    yield path
+    snapshot.close_snapshot(path)
+
+
+def _dict_rows(csv_path):
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_every_csv_round_trips(data_dir, snap_path):
+    for csv_path in sorted(data_dir.rglob("*.csv")):
+        rows = load_table(snap_path, data_dir, csv_path)
+        assert rows is not None, csv_path
+        assert list(rows) == _dict_rows(csv_path)
+
+
+def test_column_reads_without_materializing_rows(data_dir, snap_path, monkeypatch):
+    rows = load_table(snap_path, data_dir, data_dir / "styles.csv")
+    expected = [row["Style Category"] for row in _dict_rows(data_dir / "styles.csv")]
+
+    def fail_getitem(self, idx):
+        raise AssertionError("column() must not decode whole rows")
+
+    monkeypatch.setattr(SnapshotRows, "__getitem__", fail_getitem)
+    assert rows.column("Style Category") == expected
+    assert rows.column("No Such Column") == [""] * len(expected)
+
+
+def test_row_indexing(data_dir, snap_path):
+    rows = load_table(snap_path, data_dir, data_dir / "stacks" / "react.csv")
+    expected = _dict_rows(data_dir / "stacks" / "react.csv")
+    assert len(rows) == len(expected)
+    assert rows[0] == expected[0]
+    assert rows[-1] == expected[-1]
+    assert rows[2:4] == expected[2:4]
+    with pytest.raises(IndexError):
+        rows[len(expected)]
+
+
+def test_strings_are_interned(data_dir, snap_path):
+    header = open_snapshot(snap_path).header
+    cells = sum(len(info["columns"]) * info["rows"] for info in header["tables"].values())
+    assert header["strings"] < cells
+
+
+def test_stale_table_falls_back_to_csv(data_dir, snap_path):
+    csv_path = data_dir / "colors.csv"
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write('999,Zorblaxian Widgets,#000000,#111111,#222222,#FFFFFF,#333333,#444444,zorblaxian palette\n')
+    assert load_table(snap_path, data_dir, csv_path) is None
+    assert load_table(snap_path, data_dir, data_dir / "styles.csv") is not None
+    assert core.search("zorblaxian", "color")["count"] == 1
+
+
+def test_search_results_identical_with_snapshot(data_dir):
+    queries = [("glassmorphism dark", "style"), ("fintech", "color"), ("focus keyboard", "a11y")]
+    before = [core.search(q, d, 5) for q, d in queries]
+    stack_before = core.search_stack("hooks state", "react", 5)
+
+    core.compile_snapshot()
+    (data_dir / core.INDEX_DIRNAME / "styles.json").unlink()
+    assert isinstance(core._load_csv(data_dir / "styles.csv"), SnapshotRows)
+    assert [core.search(q, d, 5) for q, d in queries] == before
+    assert core.search_stack("hooks state", "react", 5) == stack_before
+    assert core.audit_page("landing")["total_checks"] > 0
+    snapshot.close_snapshot(data_dir / core.INDEX_DIRNAME / core.SNAPSHOT_FILE)
+
+
+def test_rebuild_keeps_rows_already_loaded_readable(data_dir, snap_path):
+    rows = core._load_rows(data_dir / "styles.csv")
+    assert isinstance(rows, SnapshotRows)
+    expected = _dict_rows(data_dir / "styles.csv")
+    build_snapshot(data_dir, snap_path)
+    assert core._load_rows(data_dir / "styles.csv") is rows
+    assert list(rows) == expected
+    assert list(load_table(snap_path, data_dir, data_dir / "styles.csv")) == expected
+
+
+def test_corrupt_snapshot_is_ignored(data_dir):
+    path = data_dir / core.INDEX_DIRNAME / core.SNAPSHOT_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"not a snapshot at all")
+    assert open_snapshot(path) is None
+    assert core.search("hero", "landing")["count"] > 0